@@ -0,0 +1,3 @@
+"""
+Headless benchmark and regression suite for the cipher hot paths of all four labs.
+"""
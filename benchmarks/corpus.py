@@ -0,0 +1,24 @@
+"""
+Reproducible synthetic corpora and size parsing shared by the benchmarks, the lab
+benchmark scripts and the service load test.
+"""
+import random
+
+SEED = 20241018
+SIZE_UNITS = {'KB': 1 << 10, 'MB': 1 << 20, 'GB': 1 << 30}
+LETTER_POOL = b'abcdefghijklmnopqrstuvwxyz ABCDEFGHIJKLMNOPQRSTUVWXYZ ' * 5
+
+
+def parse_size(value):
+    """Parse sizes such as '512', '1KB' or '100MB' into a byte count."""
+    value = value.strip().upper()
+    for unit, factor in SIZE_UNITS.items():
+        if value.endswith(unit):
+            return int(value[:-len(unit)]) * factor
+    return int(value)
+
+
+def make_corpus(size, seed=SEED):
+    """Reproducible ASCII text of letters and spaces."""
+    table = bytes.maketrans(bytes(range(256)), LETTER_POOL[:256])
+    return random.Random(seed).randbytes(size).translate(table).decode('ascii')
@@ -0,0 +1,248 @@
+"""
+Opt-in instrumentation of the cipher hot paths.
+
+While instrumentation is off nothing is wrapped, so the labs run their plain functions
+with no overhead at all. enable() swaps the stage functions listed in STAGES for timed
+wrappers that record call counts, inclusive wall time and bytes processed; disable()
+puts the originals back. Because the patching is module-wide it is shared by every
+thread, including every session of the Streamlit app. A caller that bound a function
+with `from module import name` before enable() keeps calling the unwrapped original.
+
+    from benchmarks import instrument
+    with instrument.enabled() as recorder:
+        encrypt_message(plaintext, key)
+    print(recorder.summary())
+
+From the command line a benchmark case is run once under the instrumentation:
+    python -m benchmarks.instrument lab_3.encrypt_message --size 1MB --json summary.json --pstats run.pstats
+"""
+import argparse
+import contextlib
+import cProfile
+import functools
+import importlib
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+
+
+def size_of(value):
+    if isinstance(value, str):
+        return len(value) if value.isascii() else len(value.encode('utf-8'))
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    return 0
+
+
+def first_argument(args, result):
+    return size_of(args[0]) if args else 0
+
+
+def second_argument(args, result):
+    return size_of(args[1]) if len(args) > 1 else 0
+
+
+def pair_count(args, result):
+    return 2 * len(args[0])
+
+
+def result_size(args, result):
+    return size_of(result)
+
+
+def no_size(args, result):
+    return 0
+
+
+# (operation, stage, module, attribute path, bytes processed); the 'total' stage is the public entry point
+STAGES = [
+    ('lab_3.encrypt_message', 'total', 'lab_3.main', 'encrypt_message', first_argument),
+    ('lab_3.decrypt_message', 'total', 'lab_3.main', 'decrypt_message', first_argument),
+    ('lab_3.playfair', 'text preparation', 'lab_3.main', 'prepare_text', first_argument),
+    ('lab_3.playfair', 'letter filtering', 'lab_3.main', 'clean_text', first_argument),
+    ('lab_3.playfair', 'matrix construction', 'lab_3.main', 'create_cipher_matrix', first_argument),
+    ('lab_3.playfair', 'digraph table construction', 'lab_3.main', 'PlayfairCipher.__init__', second_argument),
+    ('lab_3.playfair', 'pair split', 'lab_3.main', 'PlayfairCipher._pairs', first_argument),
+    ('lab_3.playfair', 'pair transform and output join', 'lab_3.main', 'PlayfairCipher._lookup', pair_count),
+    ('lab_2.decode', 'ciphertext indexing', 'lab_2.decoder', 'IncrementalDecoder.__init__', second_argument),
+    ('lab_2.decode', 'substitution update', 'lab_2.decoder', 'IncrementalDecoder.update', no_size),
+    ('lab_2.decode', 'letter patch', 'lab_2.decoder', 'IncrementalDecoder._patch', no_size),
+    ('lab_2.decode', 'output assembly', 'lab_2.decoder', 'IncrementalDecoder.text', result_size),
+    ('lab_2.frequency_analysis', 'n-gram counting', 'lab_2.analysis', 'analyze', first_argument),
+    ('lab_4.create_subkeys', 'total', 'lab_4.des', 'create_subkeys', first_argument),
+    ('lab_4.create_subkeys', 'key preparation', 'lab_4.des', 'key_to_int', first_argument),
+    ('lab_4.create_subkeys', 'key schedule', 'lab_4.des', 'key_schedule', no_size),
+    ('lab_4.create_subkeys', 'bit permutation', 'lab_4.des', 'permute', no_size),
+    ('lab_4.create_subkeys', 'output formatting', 'lab_4.des', 'describe_subkeys', first_argument),
+]
+
+
+class Recorder:
+    """Call counts, inclusive seconds and bytes per (operation, stage)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stats = {}
+
+    def record(self, key, seconds, size):
+        with self._lock:
+            entry = self.stats.get(key)
+            if entry is None:
+                entry = self.stats[key] = [0, 0.0, 0]
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] += size
+
+    def summary(self):
+        """Nested dict operation -> stage -> calls, seconds, mean_us, bytes and mb_per_s."""
+        with self._lock:
+            items = sorted(self.stats.items())
+        result = {}
+        for (operation, stage), (calls, seconds, size) in items:
+            result.setdefault(operation, {})[stage] = {
+                'calls': calls,
+                'seconds': seconds,
+                'mean_us': seconds / calls * 1e6,
+                'bytes': size,
+                'mb_per_s': size / (1 << 20) / seconds if size and seconds else None,
+            }
+        return result
+
+    def rows(self):
+        """The summary flattened to one dict per stage, for tables."""
+        return [dict(operation=operation, stage=stage, **stats)
+                for operation, stages in self.summary().items() for stage, stats in stages.items()]
+
+    def dump_json(self, path):
+        with open(path, 'w') as handle:
+            json.dump(self.summary(), handle, indent=2)
+
+
+recorder = Recorder()
+_originals = []
+_enable_lock = threading.Lock()
+
+
+def timed(function, key, sizer):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        recorder.record(key, elapsed, sizer(args, result))
+        return result
+    # wraps points __wrapped__ at an lru_cache object itself; callers such as lab_4.stream use
+    # __wrapped__ to bypass the cache, so pass the uncached function through instead
+    wrapper.__wrapped__ = getattr(function, '__wrapped__', function)
+    if hasattr(function, 'cache_clear'):
+        wrapper.cache_clear = function.cache_clear  # keep lru_cache functions clearable while wrapped
+    return wrapper
+
+
+def wrap_attribute(raw, key, sizer):
+    """Wrap a function, staticmethod or property as found in a module or class __dict__."""
+    if isinstance(raw, staticmethod):
+        return staticmethod(timed(raw.__func__, key, sizer))
+    if isinstance(raw, property):
+        return property(timed(raw.fget, key, sizer), raw.fset, raw.fdel, raw.__doc__)
+    return timed(raw, key, sizer)
+
+
+def is_enabled():
+    return bool(_originals)
+
+
+def enable():
+    """Install the timed wrappers. Stages whose module cannot be imported (e.g. without NumPy) are skipped."""
+    with _enable_lock:
+        if _originals:
+            return recorder
+        for operation, stage, module_name, path, sizer in STAGES:
+            try:
+                owner = importlib.import_module(module_name)
+            except ImportError:
+                continue
+            *parents, name = path.split('.')
+            for parent in parents:
+                owner = getattr(owner, parent)
+            raw = vars(owner)[name]
+            setattr(owner, name, wrap_attribute(raw, (operation, stage), sizer))
+            _originals.append((owner, name, raw))
+    return recorder
+
+
+def disable():
+    """Restore the original functions; the recorded statistics are kept."""
+    with _enable_lock:
+        while _originals:
+            owner, name, raw = _originals.pop()
+            setattr(owner, name, raw)
+
+
+@contextlib.contextmanager
+def enabled(reset=True):
+    if reset:
+        recorder.reset()
+    enable()
+    try:
+        yield recorder
+    finally:
+        disable()
+
+
+@contextlib.contextmanager
+def profiled(path):
+    """Run the block under cProfile and write a pstats dump to path."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+
+def main(argv=None):
+    from benchmarks.corpus import make_corpus, parse_size
+    from benchmarks.suite import CASES
+
+    parser = argparse.ArgumentParser(description="Run one benchmark case under the stage instrumentation.")
+    parser.add_argument('case', choices=sorted(CASES))
+    parser.add_argument('--size', default='1MB', help="corpus size, e.g. 64KB or 10MB")
+    parser.add_argument('--json', help="write the stage summary to this JSON file")
+    parser.add_argument('--pstats', help="also profile the run with cProfile and dump the stats here")
+    args = parser.parse_args(argv)
+
+    corpus = make_corpus(parse_size(args.size))
+    with enabled() as stats:
+        run = CASES[args.case](corpus)  # set up while enabled so the case binds the wrapped functions
+        stats.reset()
+        if args.pstats:
+            with profiled(args.pstats):
+                run()
+        else:
+            run()
+
+    if args.json:
+        stats.dump_json(args.json)
+    try:
+        for row in stats.rows():
+            rate = f"{row['mb_per_s']:10.2f} MB/s" if row['mb_per_s'] else ' ' * 15
+            print(f"{row['operation']:<24} {row['stage']:<32} {row['calls']:>9} calls "
+                  f"{row['seconds'] * 1000:10.3f} ms {rate}")
+        if args.pstats:
+            pstats.Stats(args.pstats).sort_stats('cumulative').print_stats(10)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,280 @@
+"""
+Benchmark and regression suite covering the hot paths of every lab.
+
+Each case runs on fixed-seed synthetic corpora and reports throughput, per-call
+latency percentiles and peak traced memory (tracemalloc). Results are stored as JSON
+baselines, and compare flags regressions beyond a relative threshold. Only the
+headless modules are imported; Streamlit and Tk are never loaded.
+The cases only measure speed; their outputs are checked against the implementations
+they replaced in tests/test_reference.py.
+
+Run from the repository root:
+    python -m benchmarks run --profile quick --save baseline.json
+    python -m benchmarks run --profile quick --compare baseline.json --threshold 0.15
+    python -m benchmarks compare baseline.json current.json
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from benchmarks.corpus import SEED, make_corpus, parse_size
+
+PROFILES = {
+    'quick': ['1KB', '64KB', '1MB'],
+    'full': ['1KB', '1MB', '10MB', '100MB'],
+}
+
+
+# Every case factory takes a corpus and returns a zero-argument callable doing the work once
+
+def case_encrypt_default(text):
+    from lab_1.main import encrypt_default
+    return lambda: encrypt_default(text, 3)
+
+
+def case_encrypt_with_key(text):
+    from lab_1.main import encrypt_with_key
+    return lambda: encrypt_with_key(text, 'CRYPTOGRAPHY', 3)
+
+
+def playfair_setup(text):
+    from lab_3.main import clean_text, create_cipher_matrix, locate
+    letters = clean_text(text)
+    letters = letters[:len(letters) - len(letters) % 2]
+    matrix = create_cipher_matrix('PLAYFAIREXAMPLE')
+    return [letters[i:i + 2] for i in range(0, len(letters), 2)], matrix, locate(matrix)
+
+
+def case_encrypt_pair(text):
+    from lab_3.main import encrypt_pair
+    pairs, matrix, positions = playfair_setup(text)
+    return lambda: [encrypt_pair(pair, matrix, positions) for pair in pairs]
+
+
+def case_decrypt_pair(text):
+    from lab_3.main import decrypt_pair
+    pairs, matrix, positions = playfair_setup(text)
+    return lambda: [decrypt_pair(pair, matrix, positions) for pair in pairs]
+
+
+def case_encrypt_message(text):
+    from lab_3.main import encrypt_message
+    return lambda: encrypt_message(text, 'PLAYFAIREXAMPLE')
+
+
+def case_decrypt_message(text):
+    from lab_3.main import decrypt_message, encrypt_message
+    ciphertext = encrypt_message(text, 'PLAYFAIREXAMPLE')
+    return lambda: decrypt_message(ciphertext, 'PLAYFAIREXAMPLE')
+
+
+def substitution_key():
+    letters = list('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+    random.Random(SEED).shuffle(letters)
+    return dict(zip('ABCDEFGHIJKLMNOPQRSTUVWXYZ', letters))
+
+
+def case_decode(text):
+    from lab_2.decoder import IncrementalDecoder
+    substitutions = substitution_key()
+    return lambda: IncrementalDecoder(text, substitutions).text
+
+
+def case_decode_one_letter(text):
+    from lab_2.decoder import IncrementalDecoder
+    substitutions = substitution_key()
+    decoder = IncrementalDecoder(text, substitutions)
+    alternatives = [dict(substitutions, E=letter) for letter in 'XY']
+    state = {'turn': 0}
+
+    def run():
+        state['turn'] ^= 1
+        decoder.update(alternatives[state['turn']])
+        return decoder.text
+    return run
+
+
+def case_undo_redo(text):
+    from lab_2.decoder import IncrementalDecoder
+    from lab_2.edits import EditLog
+    log = EditLog(IncrementalDecoder(text))
+    substitutions = substitution_key()
+    for letter in 'ETAOIN':
+        log.record(dict(log.substitutions, **{letter: substitutions[letter]}))
+        log.text
+
+    def run():
+        (log.redo if log.can_redo else log.undo)()  # step back and forth over the last edit
+        return log.text
+    return run
+
+
+def case_frequency_analysis(text):
+    from lab_2.analysis import analyze
+    return lambda: analyze(text)
+
+
+def case_create_subkeys(text):
+    from lab_4 import des
+    data = text.encode('ascii')
+    keys = [data[i:i + 8] for i in range(0, len(data) - 7, 8)]
+
+    def run():
+        # Looked up on the module at call time, so the instrumented stages see every call;
+        # the LRU cache is cleared so the schedule is derived, not fetched
+        des.key_schedule.cache_clear()
+        return [des.create_subkeys(key) for key in keys]
+    return run
+
+
+def column_case(cipher, params):
+    def case(text):
+        from ciphers.columns import cached_cipher, transform_values
+        instance = cached_cipher(cipher, params)
+        values = text.split()  # one short record per word
+        return lambda: transform_values(instance, values, 'encrypt')
+    return case
+
+
+CASES = {
+    'lab_1.encrypt_default': case_encrypt_default,
+    'lab_1.encrypt_with_key': case_encrypt_with_key,
+    'lab_2.decode': case_decode,
+    'lab_2.decode_one_letter': case_decode_one_letter,
+    'lab_2.undo_redo': case_undo_redo,
+    'lab_2.frequency_analysis': case_frequency_analysis,
+    'lab_3.encrypt_pair': case_encrypt_pair,
+    'lab_3.decrypt_pair': case_decrypt_pair,
+    'lab_3.encrypt_message': case_encrypt_message,
+    'lab_3.decrypt_message': case_decrypt_message,
+    'lab_4.create_subkeys': case_create_subkeys,
+    'ciphers.caesar_column': column_case('keyword-caesar', (('keyword', 'CRYPTOGRAPHY'), ('shift', '3'))),
+    'ciphers.playfair_column': column_case('playfair', (('key', 'PLAYFAIREXAMPLE'),)),
+}
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def measure(run, size, min_time, max_calls):
+    """Time repeated calls until min_time has passed, then trace one call for peak memory."""
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < max_calls and (not samples or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    median = percentile(samples, 0.5)
+    return {
+        'calls': len(samples),
+        'mb_per_s': size / (1 << 20) / median if median else math.inf,
+        'p50_ms': median * 1000,
+        'p90_ms': percentile(samples, 0.9) * 1000,
+        'p99_ms': percentile(samples, 0.99) * 1000,
+        'peak_bytes': peak,
+    }
+
+
+def run_suite(sizes, cases=None, min_time=1.0, max_calls=50, log=print):
+    results = {}
+    corpora = {}
+    for name in cases or CASES:
+        results[name] = {}
+        for size in sizes:
+            if size not in corpora:
+                corpora[size] = make_corpus(size)
+            try:
+                run = CASES[name](corpora[size])
+            except ImportError as error:
+                log(f"{name:<28} skipped: {error}")
+                break
+            stats = measure(run, size, min_time, max_calls)
+            results[name][str(size)] = stats
+            log(f"{name:<28} {size:>10} B {stats['mb_per_s']:10.2f} MB/s  p50 {stats['p50_ms']:10.3f} ms  "
+                f"p99 {stats['p99_ms']:10.3f} ms  peak {stats['peak_bytes'] / (1 << 20):8.2f} MB")
+    for gui in ('streamlit', 'tkinter'):
+        if gui in sys.modules:
+            raise RuntimeError(f"{gui} was imported by a benchmark case")
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': SEED,
+        },
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold):
+    """Return regression messages: throughput drops or peak memory growth beyond the threshold."""
+    regressions = []
+    for name, sizes in current['results'].items():
+        for size, stats in sizes.items():
+            reference = baseline['results'].get(name, {}).get(size)
+            if reference is None:
+                continue
+            if stats['mb_per_s'] < reference['mb_per_s'] * (1 - threshold):
+                regressions.append(f"{name} @ {size} B: throughput {reference['mb_per_s']:.2f} -> "
+                                   f"{stats['mb_per_s']:.2f} MB/s")
+            if stats['peak_bytes'] > reference['peak_bytes'] * (1 + threshold) + 4096:
+                regressions.append(f"{name} @ {size} B: peak memory {reference['peak_bytes']:,} -> "
+                                   f"{stats['peak_bytes']:,} bytes")
+    return regressions
+
+
+def report(regressions):
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if regressions:
+        sys.exit(1)
+    print("No regressions.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Cipher hot-path benchmarks.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    run_parser = subparsers.add_parser('run', help="run the suite")
+    run_parser.add_argument('--profile', choices=sorted(PROFILES), default='quick', help="corpus sizes to use")
+    run_parser.add_argument('--sizes', help="comma separated sizes, overrides --profile")
+    run_parser.add_argument('--case', action='append', choices=sorted(CASES), help="run only these cases")
+    run_parser.add_argument('--min-time', type=float, default=1.0, help="seconds of timed calls per measurement")
+    run_parser.add_argument('--max-calls', type=int, default=50, help="upper bound on timed calls")
+    run_parser.add_argument('--save', help="write the results to this JSON file")
+    run_parser.add_argument('--compare', help="baseline JSON to check the results against")
+    run_parser.add_argument('--threshold', type=float, default=0.10, help="allowed relative slowdown")
+    compare_parser = subparsers.add_parser('compare', help="compare two result files")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.10, help="allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        with open(args.baseline) as baseline, open(args.current) as current:
+            report(compare(json.load(baseline), json.load(current), args.threshold))
+        return
+
+    sizes = [parse_size(size) for size in (args.sizes.split(',') if args.sizes else PROFILES[args.profile])]
+    results = run_suite(sizes, args.case, args.min_time, args.max_calls)
+    if args.save:
+        with open(args.save, 'w') as handle:
+            json.dump(results, handle, indent=2)
+    if args.compare:
+        with open(args.compare) as baseline:
+            report(compare(json.load(baseline), results, args.threshold))
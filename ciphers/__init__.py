@@ -0,0 +1,14 @@
+"""
+Common encrypt/decrypt interface over bytes and streams for the ciphers of all four labs.
+
+Ciphers are looked up by name in a registry and their modules are imported only when
+first requested, so using one cipher does not pay for loading the others.
+
+    from ciphers import get_cipher
+    cipher = get_cipher('caesar', shift=3)
+    cipher.encrypt(b'attack at dawn')
+"""
+from ciphers.alphabet import Alphabet, get_alphabet
+from ciphers.registry import available, get_cipher, register
+
+__all__ = ['Alphabet', 'available', 'get_alphabet', 'get_cipher', 'register']
@@ -0,0 +1,3 @@
+from ciphers.batch import main
+
+main()
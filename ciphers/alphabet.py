@@ -0,0 +1,130 @@
+"""
+Compiled alphabets shared by the Caesar and Playfair ciphers.
+
+An Alphabet is built once from its ordered letters and an optional merge map (letters
+folded onto others, like J onto I in the 6x5 Playfair matrix or the cedilla forms of Ş
+and Ţ onto the comma-below Ș and Ț). It keeps a frozenset of the characters it
+accepts and translate tables that upper-case, merge and filter a text, or turn it into
+letter indices, in a single str.translate pass. Non-ASCII input is NFC-normalized
+first, so a decomposed S + combining comma below counts as Ș.
+"""
+import string
+import unicodedata
+
+from ciphers.base import RECORD_SEPARATOR, join_records
+
+
+class _DeletingTable(dict):
+    """Translate table that deletes unknown characters and remembers them, so each costs one miss."""
+
+    def __missing__(self, code_point):
+        self[code_point] = None
+        return None
+
+
+class Alphabet:
+    def __init__(self, letters, merge=None):
+        letters = unicodedata.normalize('NFC', letters).upper()
+        merge = {unicodedata.normalize('NFC', source).upper(): target.upper() for source, target in (merge or {}).items()}
+        if len(set(letters)) != len(letters):
+            raise ValueError("Alphabet letters must be distinct.")
+        if any(source in letters or target not in letters for source, target in merge.items()):
+            raise ValueError("Merged letters must map letters outside the alphabet onto letters in it.")
+        self.letters = letters
+        self.merge = merge
+        self.index = {letter: position for position, letter in enumerate(letters)}
+
+        canonical = {}
+        for letter in letters:
+            canonical[letter] = canonical[letter.lower()] = letter
+        for source, target in merge.items():
+            canonical[source] = canonical[source.lower()] = target
+        self.canonical = canonical  # accepted character -> the letter it counts as
+        self.members = frozenset(canonical)
+        self.is_ascii = all(char.isascii() for char in self.members)
+        self._clean_table = self.table(letters.__getitem__)
+        self._clean_records_table = self.table(letters.__getitem__, keep=RECORD_SEPARATOR.decode('ascii'))
+        self._index_table = self.table(chr)
+        # code point -> letter index, -1 outside the alphabet, for array lookups
+        self.code_points = [-1] * (max(map(ord, canonical)) + 1)
+        for char, letter in canonical.items():
+            self.code_points[ord(char)] = self.index[letter]
+
+    def __len__(self):
+        return len(self.letters)
+
+    def __iter__(self):
+        return iter(self.letters)
+
+    def __contains__(self, char):
+        return char in self.members
+
+    def __eq__(self, other):
+        return isinstance(other, Alphabet) and (self.letters, self.merge) == (other.letters, other.merge)
+
+    def __hash__(self):
+        return hash((self.letters, tuple(sorted(self.merge.items()))))
+
+    def __repr__(self):
+        return f"Alphabet({self.letters!r}, merge={self.merge!r})"
+
+    def table(self, replace, keep=''):
+        """
+        str.translate table sending each accepted character to replace(letter index), deleting
+        the rest except the characters in `keep`.
+        """
+        table = _DeletingTable({ord(char): replace(self.index[letter]) for char, letter in self.canonical.items()})
+        table.update((ord(char), char) for char in keep)
+        return table
+
+    def byte_tables(self, replace, keep=b''):
+        """The same translation for ASCII alphabets as a (bytes.translate table, delete) pair."""
+        if not self.is_ascii:
+            raise ValueError("Byte tables need an ASCII alphabet.")
+        source = ''.join(self.canonical).encode('ascii')
+        target = ''.join(replace(self.index[letter]) for letter in self.canonical.values()).encode('ascii')
+        return bytes.maketrans(source, target), bytes(b for b in range(256) if b not in source and b not in keep)
+
+    def normalize(self, text):
+        return text if text.isascii() else unicodedata.normalize('NFC', text)
+
+    def clean(self, text):
+        """Upper-case and merge the letters of the text, dropping every other character."""
+        return self.normalize(text).translate(self._clean_table)
+
+    def clean_records(self, records):
+        """Clean a list of str records in one pass over their joined text."""
+        joined = join_records(records)
+        if joined is None:
+            return [self.clean(record) for record in records]
+        return self.normalize(joined).translate(self._clean_records_table).split(RECORD_SEPARATOR.decode('ascii'))
+
+    def indices(self, text):
+        """Letter indices of the text as bytes, dropping every other character."""
+        return self.normalize(text).translate(self._index_table).encode('latin-1')
+
+    def keyed_letters(self, keyword):
+        """The letters reordered to start with the distinct letters of the keyword."""
+        keyword = ''.join(dict.fromkeys(self.clean(keyword)))
+        return keyword + self.letters.translate(dict.fromkeys(map(ord, keyword)))
+
+    def keyed(self, keyword):
+        """The alphabet reordered to start with the distinct letters of the keyword."""
+        return Alphabet(self.keyed_letters(keyword), self.merge)
+
+
+ENGLISH = Alphabet(string.ascii_uppercase)
+ROMANIAN = Alphabet('AĂÂBCDEFGHIÎJKLMNOPQRSȘTȚUVWXYZ', merge={'Ş': 'Ș', 'Ţ': 'Ț'})
+# The 30 letters of the 6x5 Playfair matrix: the English alphabet without J plus the Romanian letters
+PLAYFAIR = Alphabet(string.ascii_uppercase.replace('J', '') + 'ȘȚĂÎÂ', merge={'J': 'I', 'Ş': 'Ș', 'Ţ': 'Ț'})
+
+ALPHABETS = {'english': ENGLISH, 'romanian': ROMANIAN, 'playfair': PLAYFAIR}
+
+
+def get_alphabet(alphabet):
+    """Accept an Alphabet, the name of a predefined one or a string of letters."""
+    if isinstance(alphabet, Alphabet):
+        return alphabet
+    if alphabet.lower() in ALPHABETS:
+        return ALPHABETS[alphabet.lower()]
+    return Alphabet(alphabet)
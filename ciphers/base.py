@@ -0,0 +1,59 @@
+"""
+Base class of the common cipher interface.
+"""
+import codecs
+
+
+RECORD_SEPARATOR = b'\0'
+
+
+def join_records(records):
+    """
+    Join str or bytes records with a NUL separator so a whole batch can go through one
+    translate pass; returns None when a record contains NUL itself.
+    """
+    if not records:
+        return None
+    separator = RECORD_SEPARATOR.decode('ascii') if isinstance(records[0], str) else RECORD_SEPARATOR
+    joined = separator.join(records)
+    return joined if joined.count(separator) == len(records) - 1 else None
+
+
+def decode_chunks(chunks):
+    """Decode a stream of UTF-8 bytes chunks to str chunks."""
+    # Multi-byte letters such as 'Ș' may be split across chunk boundaries
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for chunk in chunks:
+        yield decoder.decode(chunk)
+    yield decoder.decode(b'', final=True)
+
+
+class Cipher:
+    """
+    Ciphers take and return bytes. Streams are iterables of bytes chunks and yield bytes
+    chunks. Stateless ciphers override encrypt/decrypt and get per-chunk streaming for
+    free; ciphers that carry state across chunks override the stream methods instead.
+    Records are encrypted one by one unless a cipher can batch them.
+    """
+
+    def encrypt(self, data):
+        return b''.join(self.encrypt_stream([data]))
+
+    def decrypt(self, data):
+        return b''.join(self.decrypt_stream([data]))
+
+    def encrypt_stream(self, chunks):
+        for chunk in chunks:
+            yield self.encrypt(chunk)
+
+    def decrypt_stream(self, chunks):
+        for chunk in chunks:
+            yield self.decrypt(chunk)
+
+    def encrypt_records(self, records):
+        """Encrypt a list of independent bytes records, such as the values of a column."""
+        return [self.encrypt(record) for record in records]
+
+    def decrypt_records(self, records):
+        """Decrypt a list of independent bytes records."""
+        return [self.decrypt(record) for record in records]
@@ -0,0 +1,104 @@
+"""
+Batch CLI: run every file of a directory through one cipher on a process pool.
+
+Run from the repository root:
+    python -m ciphers list
+    python -m ciphers encrypt caesar -p shift=3 -i logs/ -o encrypted/ --workers 4
+    python -m ciphers decrypt des -p key=8bytekey -p mode=cbc -i encrypted/ -o plain/
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from pathlib import Path
+
+from ciphers.registry import available, get_cipher
+
+CHUNK_SIZE = 1 << 20
+
+
+@lru_cache(maxsize=None)
+def _cached_cipher(name, params):
+    # One cipher (and its key tables) per worker process, however many files it handles
+    return get_cipher(name, **dict(params))
+
+
+def iter_file_chunks(handle, chunk_size):
+    while True:
+        chunk = handle.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def process_file(name, params, operation, source, target, chunk_size=CHUNK_SIZE):
+    """Stream one file through a cipher; returns (source, bytes read, bytes written, seconds)."""
+    cipher = _cached_cipher(name, params)
+    transform = cipher.encrypt_stream if operation == 'encrypt' else cipher.decrypt_stream
+    start = time.perf_counter()
+    written = 0
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(source, 'rb') as reader, open(target, 'wb') as writer:
+        for chunk in transform(iter_file_chunks(reader, chunk_size)):
+            writer.write(chunk)
+            written += len(chunk)
+    return source, source.stat().st_size, written, time.perf_counter() - start
+
+
+def parse_params(pairs):
+    params = {}
+    for pair in pairs:
+        name, separator, value = pair.partition('=')
+        if not separator:
+            raise ValueError(f"Parameter {pair!r} must look like name=value.")
+        params[name] = value
+    return tuple(sorted(params.items()))
+
+
+def run_batch(name, params, operation, input_dir, output_dir, workers=None, chunk_size=CHUNK_SIZE):
+    """Process every file under input_dir into the same relative path under output_dir."""
+    input_dir, output_dir = Path(input_dir), Path(output_dir)
+    _cached_cipher(name, params)  # validate the parameters before starting workers
+    files = sorted(path for path in input_dir.rglob('*') if path.is_file())
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(process_file, name, params, operation, path, output_dir / path.relative_to(input_dir),
+                               chunk_size) for path in files]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m ciphers', description="Batch encryption across the lab ciphers.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('list', help="show the registered ciphers")
+    for operation in ('encrypt', 'decrypt'):
+        command = subparsers.add_parser(operation, help=f"{operation} a directory of files")
+        command.add_argument('cipher', help="registered cipher name")
+        command.add_argument('-p', '--param', action='append', default=[], help="cipher parameter as name=value")
+        command.add_argument('-i', '--input', required=True, help="input directory")
+        command.add_argument('-o', '--output', required=True, help="output directory")
+        command.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes")
+        command.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="bytes per chunk")
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        print('\n'.join(available()))
+        return
+
+    try:
+        params = parse_params(args.param)
+        start = time.perf_counter()
+        total_in = total_out = count = 0
+        for source, read, written, seconds in run_batch(args.cipher, params, args.command, args.input, args.output,
+                                                        args.workers, args.chunk_size):
+            count += 1
+            total_in += read
+            total_out += written
+            print(f"{source}: {read:,} -> {written:,} bytes in {seconds:.2f}s")
+    except (TypeError, ValueError) as error:
+        sys.exit(f"Error: {error}")
+    elapsed = time.perf_counter() - start
+    print(f"{count} files, {total_in / (1 << 20):.2f} MB in {elapsed:.2f}s "
+          f"({total_in / (1 << 20) / elapsed if elapsed else 0:.2f} MB/s)")
@@ -0,0 +1,49 @@
+"""
+Caesar and keyword Caesar ciphers from lab_1.
+"""
+from ciphers.alphabet import get_alphabet
+from ciphers.base import Cipher, decode_chunks
+from lab_1.main import get_engine
+
+
+class Caesar(Cipher):
+    def __init__(self, shift, keyword=None, alphabet='english'):
+        alphabet = get_alphabet(alphabet)
+        shift = int(shift)
+        if not 1 <= shift < len(alphabet):
+            raise ValueError(f"Shift must be between 1 and {len(alphabet) - 1}.")
+        self._engine = get_engine(keyword, shift, alphabet)
+
+    def encrypt(self, data):
+        return self._engine.encrypt(data)
+
+    def decrypt(self, data):
+        return self._engine.decrypt(data)
+
+    def encrypt_stream(self, chunks):
+        return self._stream(chunks, self._engine.encrypt)
+
+    def decrypt_stream(self, chunks):
+        return self._stream(chunks, self._engine.decrypt)
+
+    def _stream(self, chunks, translate):
+        if self._engine.model.is_ascii:
+            for chunk in chunks:
+                yield translate(chunk)
+        else:
+            # Non-ASCII letters span several bytes, so chunks are decoded incrementally
+            for text in decode_chunks(chunks):
+                yield translate(text).encode('utf-8')
+
+    def encrypt_records(self, records):
+        return self._engine.encrypt_records(records)
+
+    def decrypt_records(self, records):
+        return self._engine.decrypt_records(records)
+
+
+class KeywordCaesar(Caesar):
+    def __init__(self, shift, keyword, alphabet='english'):
+        if not (keyword.isalpha() and len(keyword) >= 7):
+            raise ValueError("Keyword must contain only letters and be at least 7 characters long.")
+        super().__init__(shift, keyword, alphabet)
@@ -0,0 +1,250 @@
+"""
+Column mode: run a cipher over every value of a pandas Series or Arrow array.
+
+Each value is an independent record, as in encrypting a column of names or IDs. The
+cipher and its key tables are built once per process, and a batch of values is encoded,
+transformed and decoded through joined buffers, so Caesar, substitution and Playfair
+handle a whole column in one translate or digraph-lookup pass instead of one Python call
+per row. Missing values stay missing. Ciphers with binary output such as DES need
+binary=True: their ciphertext is stored as base64 text.
+
+CSV and Parquet files are read and written in chunks of rows, so files larger than
+memory work; with --workers the chunks are processed on a process pool, a few at a time.
+Parquet needs pyarrow.
+
+Run from the repository root:
+    python -m ciphers.columns encrypt caesar -p shift=3 -i people.csv -o people.enc.csv --column name
+    python -m ciphers.columns encrypt des -p key=8bytekey --binary -i people.parquet -o people.enc.parquet --column id --workers 4
+"""
+import argparse
+import base64
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+from ciphers.base import RECORD_SEPARATOR, join_records
+from ciphers.batch import parse_params
+from ciphers.registry import get_cipher
+
+CHUNK_ROWS = 1 << 16
+SEPARATOR = RECORD_SEPARATOR.decode('ascii')
+
+
+@lru_cache(maxsize=None)
+def cached_cipher(name, params):
+    return get_cipher(name, **dict(params))
+
+
+def encode_values(texts):
+    joined = join_records(texts)
+    if joined is None:
+        return [text.encode('utf-8') for text in texts]
+    return joined.encode('utf-8').split(RECORD_SEPARATOR)
+
+
+def decode_values(records):
+    joined = join_records(records)
+    try:
+        if joined is None:
+            return [bytes(record).decode('utf-8') for record in records]
+        return joined.decode('utf-8').split(SEPARATOR)
+    except UnicodeDecodeError:
+        raise ValueError("The cipher output is not text; use binary mode for this cipher.") from None
+
+
+def is_missing(value):
+    return value is None or pd.api.types.is_scalar(value) and pd.isna(value)
+
+
+def transform_values(cipher, values, operation, binary=False):
+    """
+    Encrypt or decrypt a list of values with a cipher instance, returning a list of str with
+    None for the missing values (None, NaN, pd.NA). Other values that are not str, such as
+    int IDs in an object column, are transformed as their text.
+    """
+    try:
+        SEPARATOR.join(values)  # fails fast in C when a value is not a str
+        present = None
+        texts = values
+    except TypeError:
+        present = [index for index, value in enumerate(values) if not is_missing(value)]
+        texts = [value if isinstance(value, str) else str(value) for value in map(values.__getitem__, present)]
+    if binary and operation == 'decrypt':
+        records = [base64.b64decode(text, validate=True) for text in texts]
+    else:
+        records = encode_values(texts)
+    records = getattr(cipher, f'{operation}_records')(records)
+    if binary and operation == 'encrypt':
+        texts = [base64.b64encode(record).decode('ascii') for record in records]
+    else:
+        texts = decode_values(records)
+    if present is None:
+        return texts
+    result = [None] * len(values)
+    for index, text in zip(present, texts):
+        result[index] = text
+    return result
+
+
+def transform_chunk(name, params, operation, binary, columns):
+    """Pool task: transform a list of value lists with the process's cached cipher."""
+    cipher = cached_cipher(name, params)
+    return [transform_values(cipher, values, operation, binary) for values in columns]
+
+
+def ordered_map(function, tasks, workers):
+    """
+    Yield function(*task) for every task in order. With more than one worker the tasks run
+    on a process pool with at most two per worker in flight, so a lazy iterable of chunks
+    is never read far ahead of the output.
+    """
+    if workers <= 1:
+        for task in tasks:
+            yield function(*task)
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(function, *task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def transform_column(column, cipher, operation='encrypt', params=None, binary=False, workers=1,
+                     chunk_rows=CHUNK_ROWS):
+    """
+    Encrypt or decrypt every value of a pandas Series or a pyarrow Array/ChunkedArray with a
+    registered cipher, returning the same kind of column.
+    """
+    params = tuple(sorted((params or {}).items()))
+    cached_cipher(cipher, params)  # validate the parameters before starting workers
+    if isinstance(column, pd.Series):
+        if not pd.api.types.is_string_dtype(column.dtype):
+            column = column.astype('string')
+        values = column.tolist()  # an object column may still hold numbers; they are encrypted as their text
+    else:
+        values = column.cast('string').to_pylist()
+    tasks = ((cipher, params, operation, binary, [values[start:start + chunk_rows]])
+             for start in range(0, len(values), chunk_rows))
+    result = [value for (chunk,) in ordered_map(transform_chunk, tasks, workers) for value in chunk]
+    if isinstance(column, pd.Series):
+        return pd.Series(result, index=column.index, name=column.name,
+                         dtype=object if column.dtype == object else None)
+    import pyarrow as pa
+    return pa.array(result, type=pa.string())
+
+
+def iter_csv(source, chunk_rows):
+    # Every column is read as text, so the columns that are not transformed are written back unchanged
+    with pd.read_csv(source, dtype=str, keep_default_na=False, chunksize=chunk_rows) as reader:
+        yield from reader
+
+
+def transform_csv(source, target, cipher, columns, operation, params, binary, workers, chunk_rows):
+    rows = 0
+    chunks = iter_csv(source, chunk_rows)
+    frames = deque()
+
+    def tasks():
+        for frame in chunks:
+            missing = [column for column in columns if column not in frame.columns]
+            if missing:
+                raise ValueError(f"No column {missing[0]!r} in {source}.")
+            frames.append(frame)
+            yield cipher, params, operation, binary, [frame[column].tolist() for column in columns]
+
+    with open(target, 'w', newline='', encoding='utf-8') as handle:
+        for results in ordered_map(transform_chunk, tasks(), workers):
+            frame = frames.popleft()
+            for column, values in zip(columns, results):
+                frame[column] = values
+            frame.to_csv(handle, header=not rows, index=False)
+            rows += len(frame)
+    return rows
+
+
+def transform_parquet(source, target, cipher, columns, operation, params, binary, workers, chunk_rows):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet files need pyarrow (pip install pyarrow).") from None
+    reader = pq.ParquetFile(source)
+    names = reader.schema_arrow.names
+    missing = [column for column in columns if column not in names]
+    if missing:
+        raise ValueError(f"No column {missing[0]!r} in {source}.")
+    batches = deque()
+
+    def tasks():
+        for batch in reader.iter_batches(batch_size=chunk_rows):
+            batches.append(batch)
+            yield cipher, params, operation, binary, [batch.column(column).cast(pa.string()).to_pylist()
+                                                      for column in columns]
+
+    rows = 0
+    writer = None
+    try:
+        for results in ordered_map(transform_chunk, tasks(), workers):
+            table = pa.Table.from_batches([batches.popleft()])
+            for column, values in zip(columns, results):
+                position = names.index(column)
+                table = table.set_column(position, pa.field(column, pa.string()), pa.array(values, type=pa.string()))
+            if writer is None:
+                writer = pq.ParquetWriter(target, table.schema)
+            writer.write_table(table)
+            rows += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def transform_file(source, target, cipher, columns, operation='encrypt', params=None, binary=False, workers=1,
+                   chunk_rows=CHUNK_ROWS):
+    """Encrypt or decrypt the given columns of a CSV or Parquet file chunk by chunk; returns the row count."""
+    params = tuple(sorted((params or {}).items()))
+    cached_cipher(cipher, params)
+    suffix = Path(source).suffix.lower()
+    if suffix in ('.parquet', '.pq'):
+        transform = transform_parquet
+    elif suffix in ('.csv', '.txt'):
+        transform = transform_csv
+    else:
+        raise ValueError(f"Unsupported file type {suffix!r}; use .csv or .parquet.")
+    return transform(source, target, cipher, list(columns), operation, params, binary, workers, chunk_rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Encrypt or decrypt columns of a CSV or Parquet file.")
+    parser.add_argument('operation', choices=['encrypt', 'decrypt'])
+    parser.add_argument('cipher', help="registered cipher name")
+    parser.add_argument('-p', '--param', action='append', default=[], help="cipher parameter as name=value")
+    parser.add_argument('-i', '--input', required=True, help="input .csv or .parquet file")
+    parser.add_argument('-o', '--output', required=True, help="output file of the same type")
+    parser.add_argument('--column', action='append', required=True, help="column to transform (repeatable)")
+    parser.add_argument('--binary', action='store_true', help="store ciphertext as base64, needed for DES")
+    parser.add_argument('--workers', type=int, default=1, help="worker processes (default 1: in process)")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help="rows per chunk")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        rows = transform_file(args.input, args.output, args.cipher, args.column, args.operation,
+                              dict(parse_params(args.param)), args.binary, args.workers, args.chunk_rows)
+    except (OSError, TypeError, ValueError) as error:
+        sys.exit(f"Error: {error}")
+    elapsed = time.perf_counter() - start
+    print(f"{rows:,} rows, {len(args.column)} column(s) in {elapsed:.2f}s "
+          f"({rows / elapsed if elapsed else 0:,.0f} rows/s)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+DES from lab_4 in ECB, CBC or CTR mode.
+
+ECB and CBC use PKCS#7 padding. Streams are processed in whole blocks; the last
+ciphertext block is held back when decrypting so the padding can be removed.
+
+Without an explicit iv, every CBC or CTR stream (and every record) is encrypted under a
+fresh random IV or nonce, written as the first 8 bytes of the ciphertext and read back
+from there on decryption, so no two messages share a keystream. An explicit iv is used
+as given and is not written out.
+"""
+import itertools
+import os
+
+from ciphers.base import Cipher
+from lab_4.des import BLOCK_SIZE, create_subkeys, crypt_block, crypt_ctr, from_blocks, pad, to_blocks, unpad
+
+MODES = ('ecb', 'cbc', 'ctr')
+
+
+class DES(Cipher):
+    def __init__(self, key, mode='ctr', iv=None, workers=1):
+        if mode not in MODES:
+            raise ValueError(f"Mode must be one of {', '.join(MODES)}.")
+        self.key = key.encode('latin-1') if isinstance(key, str) else bytes(key)
+        if len(self.key) != BLOCK_SIZE:
+            raise ValueError("Key must be exactly 8 characters long.")
+        self.mode = mode
+        if iv is not None:
+            iv = bytes.fromhex(iv) if isinstance(iv, str) else bytes(iv)
+            if len(iv) != BLOCK_SIZE:
+                raise ValueError("IV must be 8 bytes (16 hex digits).")
+        self.iv = iv
+        self.workers = int(workers)
+        self._subkeys = create_subkeys(self.key)
+
+    def _read_iv(self, chunks):
+        """Split the IV written ahead of the ciphertext; returns it and the remaining chunks."""
+        chunks = iter(chunks)
+        head = b''
+        for chunk in chunks:
+            head += bytes(chunk)
+            if len(head) >= BLOCK_SIZE:
+                break
+        if len(head) < BLOCK_SIZE:
+            raise ValueError("Ciphertext is too short to hold its IV.")
+        return head[:BLOCK_SIZE], itertools.chain([head[BLOCK_SIZE:]], chunks)
+
+    def _blocks(self, data, subkeys, chain, decrypt):
+        """Run whole blocks through ECB or CBC, returning the output and the new chaining value."""
+        out = []
+        for block in to_blocks(data):
+            if self.mode == 'ecb':
+                out.append(crypt_block(block, subkeys))
+            elif decrypt:
+                out.append(crypt_block(block, subkeys) ^ chain)
+                chain = block
+            else:
+                chain = crypt_block(block ^ chain, subkeys)
+                out.append(chain)
+        return from_blocks(out), chain
+
+    def _ctr_stream(self, chunks, nonce):
+        counter = int.from_bytes(nonce, 'big')
+        pending = b''
+        for chunk in chunks:
+            pending += bytes(chunk)
+            whole = len(pending) - len(pending) % BLOCK_SIZE
+            if whole:
+                yield crypt_ctr(self.key, counter.to_bytes(BLOCK_SIZE, 'big'), pending[:whole], self.workers)
+                counter = (counter + whole // BLOCK_SIZE) & 0xFFFFFFFFFFFFFFFF
+                pending = pending[whole:]
+        if pending:
+            yield crypt_ctr(self.key, counter.to_bytes(BLOCK_SIZE, 'big'), pending)
+
+    def encrypt_stream(self, chunks):
+        iv = self.iv
+        if iv is None and self.mode != 'ecb':
+            iv = os.urandom(BLOCK_SIZE)
+            yield iv
+        if self.mode == 'ctr':
+            yield from self._ctr_stream(chunks, iv)
+            return
+        chain = int.from_bytes(iv or bytes(BLOCK_SIZE), 'big')
+        pending = b''
+        for chunk in chunks:
+            pending += bytes(chunk)
+            whole = len(pending) - len(pending) % BLOCK_SIZE
+            if whole:
+                out, chain = self._blocks(pending[:whole], self._subkeys, chain, False)
+                pending = pending[whole:]
+                yield out
+        yield self._blocks(pad(pending), self._subkeys, chain, False)[0]
+
+    def decrypt_stream(self, chunks):
+        iv = self.iv
+        if iv is None and self.mode != 'ecb':
+            iv, chunks = self._read_iv(chunks)
+        if self.mode == 'ctr':
+            yield from self._ctr_stream(chunks, iv)
+            return
+        subkeys = self._subkeys[::-1]
+        chain = int.from_bytes(iv or bytes(BLOCK_SIZE), 'big')
+        pending = b''
+        for chunk in chunks:
+            pending += bytes(chunk)
+            # Keep at least one block back: the final block carries the padding
+            whole = max(len(pending) - len(pending) % BLOCK_SIZE - BLOCK_SIZE, 0)
+            if whole:
+                out, chain = self._blocks(pending[:whole], subkeys, chain, True)
+                pending = pending[whole:]
+                yield out
+        if len(pending) != BLOCK_SIZE:
+            raise ValueError("Ciphertext length must be a multiple of 8 bytes.")
+        yield unpad(self._blocks(pending, subkeys, chain, True)[0])
@@ -0,0 +1,108 @@
+"""
+Local load test for the cipher HTTP service.
+
+Opens `concurrency` keep-alive connections and sends `requests` POSTs in total with a
+fixed-seed payload, then reports the latency percentiles and requests per second.
+With --spawn the service is started for the run and stopped afterwards.
+
+Run from the repository root:
+    python -m ciphers.loadtest --spawn --path '/caesar/encrypt?shift=3' --concurrency 64 --requests 5000
+    python -m ciphers.loadtest --path '/playfair/encrypt?key=PLAYFAIRKEY' --size 1MB
+"""
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+
+from benchmarks.corpus import SEED, make_corpus, parse_size
+from benchmarks.suite import percentile
+from ciphers.service import iter_body, read_head
+
+
+async def client(host, port, path, payload, count, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    request = (f'POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(payload)}\r\n\r\n'
+               .encode('latin-1') + payload)
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            writer.write(request)
+            head = await read_head(reader)
+            if head is None:  # the service closed the connection
+                errors.append('connection closed')
+                writer.close()
+                reader, writer = await asyncio.open_connection(host, port)
+                continue
+            status_line, headers = head
+            async for _ in iter_body(reader, headers):
+                pass
+            latencies.append(time.perf_counter() - start)
+            if status_line.split(' ')[1] != '200':
+                errors.append(status_line)
+    finally:
+        writer.close()
+
+
+async def wait_until_ready(host, port, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def run(host, port, path, payload, concurrency, requests):
+    await wait_until_ready(host, port)
+    latencies, errors = [], []
+    shares = [requests // concurrency + (index < requests % concurrency) for index in range(concurrency)]
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, path, payload, share, latencies, errors) for share in shares if share))
+    return latencies, errors, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the cipher HTTP service.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--path', default='/caesar/encrypt?shift=3', help="endpoint with its query string")
+    parser.add_argument('--size', default='1KB', help="payload size per request")
+    parser.add_argument('--concurrency', type=int, default=32, help="parallel keep-alive connections")
+    parser.add_argument('--requests', type=int, default=2000, help="total requests")
+    parser.add_argument('--seed', type=int, default=SEED, help="payload seed")
+    parser.add_argument('--spawn', action='store_true', help="start the service for the duration of the test")
+    parser.add_argument('--workers', type=int, help="pool processes for the spawned service")
+    args = parser.parse_args(argv)
+
+    payload = make_corpus(parse_size(args.size), args.seed).encode('ascii')
+    server = None
+    if args.spawn:
+        command = [sys.executable, '-m', 'ciphers.service', '--host', args.host, '--port', str(args.port)]
+        if args.workers is not None:
+            command += ['--workers', str(args.workers)]
+        server = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    try:
+        latencies, errors, seconds = asyncio.run(run(args.host, args.port, args.path, payload, args.concurrency,
+                                                     args.requests))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print(f"{len(latencies):,} requests of {len(payload):,} bytes over {args.concurrency} connections "
+          f"in {seconds:.2f}s: {len(latencies) / seconds:,.0f} req/s, "
+          f"{len(latencies) * len(payload) / (1 << 20) / seconds:,.2f} MB/s")
+    print(f"latency p50 {percentile(latencies, 0.50) * 1000:.2f} ms, p99 {percentile(latencies, 0.99) * 1000:.2f} ms, "
+          f"max {max(latencies) * 1000:.2f} ms")
+    if errors:
+        print(f"{len(errors):,} non-200 responses, first: {errors[0]}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+6x5 Playfair cipher from lab_3 over UTF-8 encoded bytes.
+"""
+from ciphers.base import RECORD_SEPARATOR, Cipher, decode_chunks, join_records
+from lab_3.main import get_cipher
+
+
+def decode_records(records):
+    joined = join_records(records)
+    if joined is None:
+        return [bytes(record).decode('utf-8') for record in records]
+    return joined.decode('utf-8').split(RECORD_SEPARATOR.decode('ascii'))
+
+
+def encode_records(texts):
+    joined = join_records(texts)
+    if joined is None:
+        return [text.encode('utf-8') for text in texts]
+    return joined.encode('utf-8').split(RECORD_SEPARATOR)
+
+
+class Playfair(Cipher):
+    def __init__(self, key):
+        if len(key) < 7:
+            raise ValueError("Key must be at least 7 characters long.")
+        self._cipher = get_cipher(key)
+
+    def encrypt_stream(self, chunks):
+        for text in self._cipher.encrypt_stream(decode_chunks(chunks)):
+            yield text.encode('utf-8')
+
+    def decrypt_stream(self, chunks):
+        for text in self._cipher.decrypt_stream(decode_chunks(chunks)):
+            yield text.encode('utf-8')
+
+    def encrypt_records(self, records):
+        return encode_records(self._cipher.encrypt_records(decode_records(records)))
+
+    def decrypt_records(self, records):
+        return encode_records(self._cipher.decrypt_records(decode_records(records)))
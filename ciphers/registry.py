@@ -0,0 +1,32 @@
+"""
+Name -> implementation registry with lazy imports.
+"""
+import importlib
+
+# name -> (module, class); modules are imported on first use only
+REGISTRY = {
+    'caesar': ('ciphers.caesar', 'Caesar'),
+    'keyword-caesar': ('ciphers.caesar', 'KeywordCaesar'),
+    'playfair': ('ciphers.playfair', 'Playfair'),
+    'substitution': ('ciphers.substitution', 'Substitution'),
+    'des': ('ciphers.des', 'DES'),
+    'vigenere': ('ciphers.vigenere', 'Vigenere'),
+}
+
+
+def register(name, module, attribute):
+    """Register a cipher class by module path so it is only imported when used."""
+    REGISTRY[name] = (module, attribute)
+
+
+def available():
+    return sorted(REGISTRY)
+
+
+def get_cipher(name, **params):
+    """Instantiate a registered cipher with its parameters."""
+    try:
+        module, attribute = REGISTRY[name]
+    except KeyError:
+        raise ValueError(f"Unknown cipher {name!r}; available: {', '.join(available())}.") from None
+    return getattr(importlib.import_module(module), attribute)(**params)
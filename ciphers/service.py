@@ -0,0 +1,447 @@
+"""
+Asyncio HTTP service exposing the lab ciphers to many concurrent clients.
+
+Endpoints (parameters go in the query string, payloads in the request body):
+    GET  /health
+    GET  /ciphers
+    POST /caesar/encrypt?shift=3                     (and /decrypt)
+    POST /keyword-caesar/encrypt?shift=3&keyword=CRYPTOGRAPHY
+    POST /playfair/encrypt?key=PLAYFAIRKEY
+    POST /substitution/decrypt?key=QWERTYUIOPASDFGHJKLZXCVBNM
+    POST /des/encrypt?key=8bytekey&mode=ctr
+    POST /des/key-schedule?format=hex&hex_keys=0   body: keys one per line; an invalid key
+                                                    yields "line N: reason" in its place
+    POST /batch   body: JSON list of {"cipher", "operation", "params", "data" (base64)}
+
+Small bodies are collected into micro-batches for a few milliseconds and handed to a
+process pool as one task, so the pool round trip is paid per batch instead of per
+request. Bodies above STREAM_THRESHOLD, or sent with chunked transfer encoding, are
+streamed: they are transformed chunk by chunk in a thread and returned chunked, so
+neither side ever holds the whole payload. Streams run on threads of the server process,
+not on the pool, since a stream's cipher state carries from one chunk to the next. Every worker keeps an LRU cache of built
+ciphers, and with them the keyword alphabets and Playfair matrices, per key.
+
+Run from the repository root:
+    python -m ciphers.service --port 8080 --workers 4
+"""
+import argparse
+import asyncio
+import base64
+import io
+import json
+import os
+import queue
+import signal
+import string
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from urllib.parse import parse_qsl, urlsplit
+
+from ciphers.registry import available, get_cipher
+
+CACHE_SIZE = 256
+CHUNK_SIZE = 1 << 16
+STREAM_THRESHOLD = 1 << 20
+MAX_HEAD = 1 << 16
+OPERATIONS = ('encrypt', 'decrypt')
+KEY_SCHEDULE = 'des-key-schedule'
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large'}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# HTTP/1.1 framing shared with the load tester
+
+async def read_head(reader):
+    """Read a request or status line and its headers; returns (first line, headers) or None at EOF."""
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except asyncio.IncompleteReadError as error:
+        if error.partial.strip():
+            raise HTTPError(400, "Truncated request head.")
+        return None
+    except asyncio.LimitOverrunError:
+        raise HTTPError(413, "Request head too large.")
+    first, *lines = head.decode('latin-1').split('\r\n')
+    headers = {}
+    for line in lines:
+        if line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+    return first, headers
+
+
+def is_chunked(headers):
+    return headers.get('transfer-encoding', '').lower() == 'chunked'
+
+
+def content_length(headers):
+    """The Content-Length of a message, 0 without one; anything but a decimal number is rejected."""
+    value = headers.get('content-length', '0')
+    if not (value.isascii() and value.isdigit()):
+        raise HTTPError(400, "Content-Length must be a non-negative integer.")
+    return int(value)
+
+
+async def iter_body(reader, headers, chunk_size=CHUNK_SIZE):
+    """Yield the body in chunks, for Content-Length and chunked transfer encoding alike."""
+    if is_chunked(headers):
+        while True:
+            size = (await reader.readline()).split(b';')[0].strip().decode('latin-1')
+            if not size or not all(char in string.hexdigits for char in size):
+                raise HTTPError(400, "Malformed chunk size.")
+            size = int(size, 16)
+            if size == 0:
+                while (await reader.readline()) not in (b'\r\n', b''):  # trailers
+                    pass
+                return
+            yield await reader.readexactly(size)
+            if await reader.readexactly(2) != b'\r\n':
+                raise HTTPError(400, "Malformed chunk.")
+    else:
+        remaining = content_length(headers)
+        while remaining:
+            chunk = await reader.read(min(chunk_size, remaining))
+            if not chunk:
+                raise HTTPError(400, "Body shorter than Content-Length.")
+            remaining -= len(chunk)
+            yield chunk
+
+
+async def read_body(reader, headers, limit):
+    parts = []
+    size = 0
+    async for chunk in iter_body(reader, headers):
+        size += len(chunk)
+        if size > limit:
+            raise HTTPError(413, f"Body larger than {limit} bytes.")
+        parts.append(chunk)
+    return b''.join(parts)
+
+
+def response_head(status, content_type, length=None):
+    framing = 'Transfer-Encoding: chunked' if length is None else f'Content-Length: {length}'
+    return (f'HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: {content_type}\r\n'
+            f'{framing}\r\n\r\n').encode('latin-1')
+
+
+def write_error(writer, error):
+    body = (str(error) + '\n').encode('utf-8')
+    writer.write(response_head(error.status, 'text/plain; charset=utf-8', len(body)) + body)
+
+
+def chunk_frame(data):
+    return b'%x\r\n%s\r\n' % (len(data), data)
+
+
+# Work done in the pool processes
+
+@lru_cache(maxsize=CACHE_SIZE)
+def cached_cipher(name, params):
+    # Per-key cache: each worker builds a keyword alphabet or Playfair matrix once per key
+    return get_cipher(name, **dict(params))
+
+
+def key_schedule_stream(chunks, hex_keys=False, output_format='hex'):
+    """Split a stream of key lines across chunk boundaries and yield the subkey lines.
+
+    An invalid key is answered with a "line N: reason" line in its place, numbered from the
+    start of the body, since the 200 may already be out by the time it is read.
+    """
+    from lab_4.stream import derive_lines
+
+    def derive(lines, start):
+        out = io.StringIO()
+        # writelines pulls the lines one by one, so error lines land in input order
+        out.writelines(derive_lines(lines, hex_keys, output_format, errors=out, start=start))
+        return out.getvalue().encode('latin-1')
+
+    leftover = ''
+    number = 1
+    for chunk in chunks:
+        lines = (leftover + chunk.decode('latin-1')).split('\n')
+        leftover = lines.pop()
+        if lines:
+            yield derive(lines, number)
+            number += len(lines)
+    if leftover:
+        yield derive([leftover], number)
+
+
+def make_transform(name, params, operation):
+    """Return a function from an iterable of body chunks to an iterable of output chunks."""
+    if name == KEY_SCHEDULE:
+        from lab_4.stream import FORMATS
+
+        options = dict(params)
+        output_format = options.pop('format', 'hex')
+        hex_keys = options.pop('hex_keys', '0').lower() in ('1', 'true', 'yes')
+        if output_format not in FORMATS:
+            raise ValueError(f"Format must be one of {', '.join(FORMATS)}.")
+        if options:
+            raise ValueError(f"Unknown parameters: {', '.join(options)}.")
+        return partial(key_schedule_stream, hex_keys=hex_keys, output_format=output_format)
+    if any(key == 'workers' for key, _ in params):
+        raise ValueError("The workers parameter is set by the service.")
+    cipher = cached_cipher(name, params)
+    return cipher.encrypt_stream if operation == 'encrypt' else cipher.decrypt_stream
+
+
+def run_jobs(jobs):
+    """Run a batch of (name, params, operation, data) jobs; returns (ok, output or error message) per job."""
+    results = []
+    for name, params, operation, data in jobs:
+        try:
+            results.append((True, b''.join(make_transform(name, params, operation)([data]))))
+        except (TypeError, ValueError, UnicodeError) as error:
+            results.append((False, str(error)))
+    return results
+
+
+class Batcher:
+    """Collect jobs for up to `window` seconds or `max_size` jobs, then run them as one pool task."""
+
+    def __init__(self, executor, window, max_size):
+        self.executor = executor
+        self.window = window
+        self.max_size = max_size
+        self.pending = []
+        self.timer = None
+        self.batches = 0
+
+    def submit(self, job):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((job, future))
+        if len(self.pending) >= self.max_size:
+            self.flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.window, self.flush)
+        return future
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        batch, self.pending = self.pending, []
+        if not batch:
+            return
+        self.batches += 1
+        task = asyncio.get_running_loop().run_in_executor(self.executor, run_jobs, [job for job, _ in batch])
+        task.add_done_callback(partial(self._deliver, batch))
+
+    @staticmethod
+    def _deliver(batch, task):
+        error = task.exception()
+        for index, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+                continue
+            ok, value = task.result()[index]
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(HTTPError(400, value))
+
+
+class CipherService:
+    def __init__(self, workers=None, batch_window=0.002, max_batch=64, stream_threshold=STREAM_THRESHOLD):
+        # workers=0 runs the batches on a thread, for machines where extra processes do not pay off
+        self.executor = ThreadPoolExecutor(1) if workers == 0 else ProcessPoolExecutor(workers)
+        self.streams = ThreadPoolExecutor(thread_name_prefix='cipher-stream')
+        self.batcher = Batcher(self.executor, batch_window, max_batch)
+        self.stream_threshold = stream_threshold
+        self.requests = 0
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+        self.streams.shutdown(cancel_futures=True)
+
+    def route(self, method, target):
+        """Map a request to (name, params, operation) or one of the fixed endpoints."""
+        url = urlsplit(target)
+        parts = [part for part in url.path.split('/') if part]
+        params = tuple(sorted(parse_qsl(url.query)))
+        if parts in (['health'], ['ciphers'], ['batch']):
+            expected = 'POST' if parts == ['batch'] else 'GET'
+            if method != expected:
+                raise HTTPError(405, f"Use {expected} for /{parts[0]}.")
+            return parts[0], params, None
+        if parts == ['des', 'key-schedule']:
+            name, operation = KEY_SCHEDULE, 'derive'
+        elif len(parts) == 2 and parts[0] in available() and parts[1] in OPERATIONS:
+            name, operation = parts
+        else:
+            raise HTTPError(404, f"No endpoint {url.path}.")
+        if method != 'POST':
+            raise HTTPError(405, "Use POST with the payload as the body.")
+        return name, params, operation
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                headers = {}
+                try:
+                    head = await read_head(reader)
+                    if head is None:
+                        break
+                    request_line, headers = head
+                    method, target, _ = request_line.split(' ', 2)
+                    await self.respond(method, target, headers, reader, writer)
+                except HTTPError as error:
+                    write_error(writer, error)
+                    if is_chunked(headers) or headers.get('content-length', '0') != '0':
+                        await writer.drain()
+                        break  # the body may be partly unread, so the connection cannot be reused
+                except ValueError:
+                    body = b'Malformed request.\n'
+                    writer.write(response_head(400, 'text/plain; charset=utf-8', len(body)) + body)
+                    break
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, method, target, headers, reader, writer):
+        length = content_length(headers)  # validated before anything is read
+        name, params, operation = self.route(method, target)
+        self.requests += 1
+        if name == 'health':
+            writer.write(response_head(200, 'text/plain', 3) + b'ok\n')
+        elif name == 'ciphers':
+            body = json.dumps(available() + [KEY_SCHEDULE]).encode('ascii')
+            writer.write(response_head(200, 'application/json', len(body)) + body)
+        elif is_chunked(headers) or length > self.stream_threshold:
+            if name == 'batch':
+                raise HTTPError(413, "Batch bodies must be sent with a Content-Length below the stream threshold.")
+            await self.stream(name, params, operation, headers, reader, writer)
+        else:
+            data = await read_body(reader, headers, self.stream_threshold)
+            try:  # the body is consumed, so errors from here on keep the connection open
+                if name == 'batch':
+                    body = await self.run_batch(data)
+                    writer.write(response_head(200, 'application/json', len(body)) + body)
+                else:
+                    output = await self.batcher.submit((name, params, operation, data))
+                    writer.write(response_head(200, 'application/octet-stream', len(output)) + output)
+            except HTTPError as error:
+                write_error(writer, error)
+
+    async def run_batch(self, body):
+        try:
+            items = json.loads(body)
+            jobs = [(item['cipher'], tuple(sorted((key, str(value)) for key, value in item.get('params', {}).items())),
+                     item.get('operation', 'encrypt'), base64.b64decode(item.get('data', ''), validate=True))
+                    for item in items]
+        except (ValueError, TypeError, KeyError, AttributeError) as error:
+            raise HTTPError(400, f"Batch body must be a JSON list of jobs: {error}")
+        for name, _, operation, _ in jobs:
+            if name not in available() and name != KEY_SCHEDULE or operation not in OPERATIONS + ('derive',):
+                raise HTTPError(400, f"Unknown job {name}/{operation}.")
+        results = await asyncio.gather(*(self.batcher.submit(job) for job in jobs), return_exceptions=True)
+        return json.dumps([{'error': str(result)} if isinstance(result, Exception)
+                           else {'data': base64.b64encode(result).decode('ascii')} for result in results]).encode('ascii')
+
+    async def stream(self, name, params, operation, headers, reader, writer):
+        """Transform a large body chunk by chunk on a thread, replying with chunked encoding."""
+        loop = asyncio.get_running_loop()
+        try:
+            transform = make_transform(name, params, operation)  # bad parameters fail before the 200 is sent
+        except (TypeError, ValueError) as error:
+            raise HTTPError(400, str(error))
+        # The feeder runs on the event loop and only waits on `slots`, so a stream never holds an
+        # executor thread while its worker is still queued behind other streams
+        inbox = queue.SimpleQueue()
+        slots = asyncio.Semaphore(8)
+        outbox = asyncio.Queue()
+
+        def chunks():
+            for chunk in iter(inbox.get, None):
+                loop.call_soon_threadsafe(slots.release)
+                yield chunk
+
+        def work():
+            try:
+                for piece in transform(chunks()):
+                    if piece:
+                        loop.call_soon_threadsafe(outbox.put_nowait, piece)
+            except Exception as error:
+                loop.call_soon_threadsafe(outbox.put_nowait, error)
+                for _ in chunks():  # keep draining so the feeder never blocks
+                    pass
+            finally:
+                loop.call_soon_threadsafe(outbox.put_nowait, None)
+
+        async def feed():
+            try:
+                async for chunk in iter_body(reader, headers):
+                    await slots.acquire()
+                    inbox.put(chunk)
+            finally:
+                inbox.put(None)
+
+        worker = loop.run_in_executor(self.streams, work)
+        feeder = asyncio.ensure_future(feed())
+        writer.write(response_head(200, 'application/octet-stream'))
+        try:
+            while (piece := await outbox.get()) is not None:
+                if isinstance(piece, Exception):
+                    raise piece
+                writer.write(chunk_frame(piece))
+                await writer.drain()
+            await feeder
+            await worker
+            writer.write(b'0\r\n\r\n')
+        except Exception as error:
+            # The 200 and part of the body are out, so no error response can follow: drop the
+            # connection without the final chunk, which tells the client the body is incomplete
+            raise ConnectionAbortedError(f"Stream failed: {error}") from error
+        finally:
+            if not feeder.done():
+                feeder.cancel()
+            await worker
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEAD)
+        addresses = ', '.join(str(sock.getsockname()) for sock in server.sockets)
+        print(f"Serving on {addresses}", flush=True)
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP service for the lab ciphers.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="pool processes for batched requests, 0 for a thread")
+    parser.add_argument('--batch-window', type=float, default=0.002, help="seconds to collect a micro-batch")
+    parser.add_argument('--max-batch', type=int, default=64, help="jobs per micro-batch")
+    parser.add_argument('--stream-threshold', type=int, default=STREAM_THRESHOLD,
+                        help="bodies larger than this many bytes are streamed")
+    args = parser.parse_args(argv)
+
+    service = CipherService(args.workers, args.batch_window, args.max_batch, args.stream_threshold)
+    start = time.perf_counter()
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    finally:
+        service.close()
+        seconds = time.perf_counter() - start
+        print(f"{service.requests:,} requests in {service.batcher.batches:,} batches over {seconds:.0f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+Monoalphabetic substitution cipher as solved in the lab_2 workbench.
+
+The key lists the ciphertext letter for each plaintext letter A-Z. Case is preserved
+and everything that is not an ASCII letter passes through, like lab_2's decode.
+"""
+import string
+
+from ciphers.base import RECORD_SEPARATOR, Cipher, join_records
+
+LETTERS = string.ascii_uppercase
+
+
+class Substitution(Cipher):
+    def __init__(self, key):
+        key = key.upper()
+        if sorted(key) != list(LETTERS):
+            raise ValueError("Key must be a permutation of the 26 letters A-Z.")
+        plain = (LETTERS + LETTERS.lower()).encode('ascii')
+        cipher = (key + key.lower()).encode('ascii')
+        self._encrypt_table = bytes.maketrans(plain, cipher)
+        self._decrypt_table = bytes.maketrans(cipher, plain)
+
+    def encrypt(self, data):
+        return bytes(data).translate(self._encrypt_table)
+
+    def decrypt(self, data):
+        return bytes(data).translate(self._decrypt_table)
+
+    def encrypt_records(self, records):
+        return self._translate_records(records, self._encrypt_table)
+
+    def decrypt_records(self, records):
+        return self._translate_records(records, self._decrypt_table)
+
+    @staticmethod
+    def _translate_records(records, table):
+        # NUL is not a letter, so the separators survive the translation
+        joined = join_records(records)
+        if joined is None:
+            return [bytes(record).translate(table) for record in records]
+        return joined.translate(table).split(RECORD_SEPARATOR)
@@ -0,0 +1,22 @@
+"""
+Vigenère cipher from lab_1; the key position is carried across stream chunks.
+"""
+from ciphers.base import Cipher
+from lab_1.vigenere import get_vigenere
+
+
+class Vigenere(Cipher):
+    def __init__(self, key):
+        self._cipher = get_vigenere(key)
+
+    def encrypt_stream(self, chunks):
+        return self._cipher.encrypt_stream(chunks)
+
+    def decrypt_stream(self, chunks):
+        return self._cipher.decrypt_stream(chunks)
+
+    def encrypt_records(self, records):
+        return self._cipher.encrypt_records(records)
+
+    def decrypt_records(self, records):
+        return self._cipher.decrypt_records(records)
@@ -0,0 +1,4 @@
+"""
+Present so pytest puts the repository root on sys.path: the tests import the labs the
+way the tools run them, as lab_1.main, ciphers.columns and so on.
+"""
@@ -0,0 +1,164 @@
+"""
+Dictionary attack on the keyword Caesar cipher.
+
+Every word of a wordlist is turned into a keyed alphabet with generate_alphabet,
+keywords that produce the same alphabet are tried only once, and all shifts of each
+alphabet are scored in a process pool. Each key is first scored on a short prefix of
+the ciphertext; only the best keys of every batch are decrypted in full.
+
+Run from the repository root:
+    python -m lab_1.attack -i ciphertext.txt -w words.txt --stop-at -2.95
+"""
+import argparse
+import math
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from lab_1.main import LETTERS, CaesarEngine, generate_alphabet, get_engine
+from lab_2.frequencies import letter_frequencies
+
+Match = namedtuple('Match', ['fitness', 'keyword', 'shift', 'alphabet', 'preview'])
+
+_TOTAL = sum(letter_frequencies.values())
+LOG_FREQUENCIES = [math.log(letter_frequencies[letter] / _TOTAL) for letter in LETTERS]
+
+_ciphertext = b''
+_prefix_counts = []
+
+
+def letter_counts(data):
+    """Count each uppercase letter A-Z in a bytes object of letters."""
+    return [data.count(code) for code in range(65, 91)]
+
+
+def fitness(counts):
+    """Mean English log-probability per letter for a 26-letter count vector."""
+    total = sum(counts)
+    if total == 0:
+        return -math.inf
+    return sum(count * log_p for count, log_p in zip(counts, LOG_FREQUENCIES)) / total
+
+
+def prefix_fitness(alphabet, shift):
+    """Score the decryption of the ciphertext prefix without materializing it."""
+    # Cipher letter alphabet[(i + shift) % 26] decrypts to alphabet[i]
+    score = 0.0
+    for i, plain in enumerate(alphabet):
+        cipher = ord(alphabet[(i + shift) % 26]) - 65
+        score += _prefix_counts[cipher] * LOG_FREQUENCIES[ord(plain) - 65]
+    return score
+
+
+def _init_worker(ciphertext, prefix_length):
+    global _ciphertext, _prefix_counts
+    _ciphertext = ciphertext
+    _prefix_counts = letter_counts(ciphertext[:prefix_length])
+
+
+def score_batch(batch, keep):
+    """Score all shifts of a batch of (keyword, alphabet) pairs and fully decrypt the best ones."""
+    screened = []
+    for keyword, alphabet in batch:
+        for shift in range(1, 26):
+            screened.append((prefix_fitness(alphabet, shift), keyword, shift, alphabet))
+    screened.sort(reverse=True)
+
+    matches = []
+    for _, keyword, shift, alphabet in screened[:keep]:
+        plaintext = CaesarEngine(alphabet, shift).decrypt(_ciphertext)
+        matches.append(Match(fitness(letter_counts(plaintext)), keyword, shift, alphabet,
+                             plaintext[:60].decode('ascii')))
+    return len(screened), matches
+
+
+def iter_alphabet_batches(words, batch_size, min_length):
+    """Group unique keyed alphabets from a word iterable into batches."""
+    seen = set()
+    batch = []
+    for word in words:
+        word = word.strip()
+        if len(word) < min_length or not (word.isascii() and word.isalpha()):
+            continue
+        alphabet = generate_alphabet(word)
+        if alphabet in seen:
+            continue
+        seen.add(alphabet)
+        batch.append((word.upper(), alphabet))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def dictionary_attack(ciphertext, words, workers=None, batch_size=256, keep=4, prefix_length=256,
+                      stop_at=None, top=10, progress=None):
+    """Return the best keyword Caesar keys for a ciphertext, best first."""
+    ciphertext = get_engine(None, 0).encrypt(ciphertext)  # keep letters only, uppercased
+    if isinstance(ciphertext, str):
+        ciphertext = ciphertext.encode('ascii')
+    workers = workers or os.cpu_count()
+    best = []
+    tried = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(ciphertext, prefix_length)) as pool:
+        batches = iter_alphabet_batches(words, batch_size, 7)
+        pending = set()
+        stopped = False
+        while True:
+            while not stopped and len(pending) < workers * 4:
+                batch = next(batches, None)
+                if batch is None:
+                    break
+                pending.add(pool.submit(score_batch, batch, keep))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                count, matches = future.result()
+                tried += count
+                best = sorted(best + matches, reverse=True)[:top]
+            if progress is not None:
+                progress(tried, tried / (time.perf_counter() - start), best[0] if best else None)
+            if stop_at is not None and best and best[0].fitness >= stop_at:
+                stopped = True
+                for future in pending:
+                    future.cancel()
+                pending = {future for future in pending if not future.cancelled()}
+    return best
+
+
+def print_progress(tried, rate, leader):
+    leader_text = f"best {leader.keyword} shift {leader.shift} ({leader.fitness:.3f})" if leader else ""
+    print(f"\r{tried:>12,} keys  {rate:>12,.0f} keys/s  {leader_text}", end='', file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dictionary attack on the keyword Caesar cipher.")
+    parser.add_argument('-i', '--input', required=True, help="ciphertext file")
+    parser.add_argument('-w', '--wordlist', required=True, help="candidate keywords, one per line")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--batch-size', type=int, default=256, help="alphabets per task")
+    parser.add_argument('--prefix', type=int, default=256, help="ciphertext letters used for screening")
+    parser.add_argument('--stop-at', type=float, default=None,
+                        help="stop once a key reaches this mean log-probability per letter (English text is around -2.9)")
+    parser.add_argument('--top', type=int, default=10, help="number of keys to report")
+    args = parser.parse_args(argv)
+
+    with open(args.input, 'rb') as handle:
+        ciphertext = handle.read()
+    with open(args.wordlist, encoding='utf-8', errors='ignore') as words:
+        best = dictionary_attack(ciphertext, words, args.workers, args.batch_size, prefix_length=args.prefix,
+                                 stop_at=args.stop_at, top=args.top, progress=print_progress)
+    print(file=sys.stderr)
+
+    for match in best:
+        print(f"{match.fitness:8.3f}  keyword {match.keyword:<16} shift {match.shift:2d}  {match.preview}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Throughput comparison between the original per-character Caesar loops and the
+translation-table engine in lab_1/main.py.
+
+Run from the repository root:
+    python -m lab_1.benchmark --sizes 1KB,1MB,100MB
+"""
+import argparse
+import time
+
+from benchmarks.corpus import make_corpus, parse_size
+from lab_1.main import generate_alphabet, get_engine
+
+
+def legacy_encrypt_default(text, shift):
+    """The original generator-based Caesar encryption."""
+    return ''.join(chr((ord(char) - ord('A') + shift) % 26 + ord('A')) for char in text.upper() if char.isalpha())
+
+
+def legacy_encrypt_with_key(text, keyword, shift):
+    """The original keyword Caesar encryption with an alphabet.index scan per character."""
+    alphabet = generate_alphabet(keyword)
+    return ''.join(alphabet[(alphabet.index(char) + shift) % 26] for char in text.upper() if char.isalpha())
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Caesar cipher implementations.")
+    parser.add_argument('--sizes', default='1KB,1MB,100MB', help="comma separated input sizes")
+    parser.add_argument('--skip-legacy-above', default='100MB', help="skip the per-character loops above this size")
+    args = parser.parse_args()
+
+    keyword, shift = 'CRYPTOGRAPHY', 3
+    legacy_limit = parse_size(args.skip_legacy_above)
+    print(f"{'size':>10} {'cipher':>10} {'legacy MB/s':>12} {'table MB/s':>12} {'speedup':>9}")
+    for size in (parse_size(s) for s in args.sizes.split(',')):
+        text = make_corpus(size)
+        data = text.encode('ascii')
+        megabytes = size / (1 << 20)
+        cases = [
+            ('default', lambda: legacy_encrypt_default(text, shift), get_engine(None, shift).encrypt),
+            ('keyword', lambda: legacy_encrypt_with_key(text, keyword, shift), get_engine(keyword, shift).encrypt),
+        ]
+        for name, legacy, engine_encrypt in cases:
+            table_time = measure(engine_encrypt, text)
+            bytes_time = measure(engine_encrypt, data)
+            if size <= legacy_limit:
+                legacy_time = measure(legacy)
+                legacy_rate = f"{megabytes / legacy_time:12.1f}"
+                speedup = f"{legacy_time / table_time:8.1f}x"
+            else:
+                legacy_rate, speedup = f"{'skipped':>12}", f"{'-':>9}"
+            print(f"{size:>10} {name:>10} {legacy_rate} {megabytes / table_time:12.1f} {speedup}"
+                  f"  (bytes path {megabytes / bytes_time:.1f} MB/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Brute-force key recovery for the default Caesar cipher.
+
+A single letter histogram of the ciphertext is built in one streaming pass and all
+25 shifts are scored against the English letter frequencies at once, instead of
+decrypting the text 25 times.
+
+Run from the repository root:
+    python -m lab_1.crack -i ciphertext.txt --top 5
+"""
+import argparse
+import itertools
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from lab_1.main import CHUNK_SIZE, LETTERS, get_engine
+from lab_1.stream import iter_chunks
+from lab_2.frequencies import letter_frequencies
+
+Candidate = namedtuple('Candidate', ['shift', 'log_likelihood', 'confidence'])
+
+ENGLISH = np.array([letter_frequencies[letter] for letter in LETTERS])
+ENGLISH = ENGLISH / ENGLISH.sum()
+LOG_ENGLISH = np.log(ENGLISH)
+SHIFTS = np.arange(1, 26)
+ALL_SHIFTS = np.arange(26)  # a Vigenère key letter A is a shift of 0
+
+
+def shift_index(shifts):
+    """Row k maps every plaintext letter to its ciphertext letter under shift shifts[k]."""
+    return (np.arange(26)[None, :] + shifts[:, None]) % 26
+
+
+SHIFT_INDEX = shift_index(SHIFTS)
+
+
+def letter_histogram(chunks):
+    """Count A-Z (case-insensitive) over an iterable of bytes-like chunks."""
+    counts = np.zeros(256, dtype=np.int64)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('ascii', 'ignore')
+        counts += np.bincount(np.frombuffer(chunk, dtype=np.uint8), minlength=256)
+    return counts[65:91] + counts[97:123]
+
+
+def score_shifts(histogram, shifts=SHIFTS):
+    """Score every shift (1-25 by default) for a 26-letter ciphertext histogram, best candidate first."""
+    total = histogram.sum()
+    if total == 0:
+        raise ValueError("Ciphertext contains no letters.")
+
+    observed = histogram[SHIFT_INDEX if shifts is SHIFTS else shift_index(shifts)]
+
+    # Multinomial log-likelihood of each decryption, normalized into a posterior over shifts;
+    # candidates are ranked by the same likelihood, so confidence falls down the list
+    log_likelihood = observed @ LOG_ENGLISH
+    confidence = np.exp(log_likelihood - log_likelihood.max())
+    confidence /= confidence.sum()
+
+    order = np.argsort(-log_likelihood, kind='stable')
+    return [Candidate(int(shifts[k]), float(log_likelihood[k]), float(confidence[k])) for k in order]
+
+
+def crack_caesar(ciphertext):
+    """Rank the candidate shifts for a str or bytes-like ciphertext."""
+    if isinstance(ciphertext, str):
+        ciphertext = ciphertext.encode('ascii', 'ignore')
+    view = memoryview(ciphertext).cast('B')
+    chunks = (view[start:start + CHUNK_SIZE] for start in range(0, len(view), CHUNK_SIZE))
+    return score_shifts(letter_histogram(chunks))
+
+
+def crack_stream(stream, chunk_size=CHUNK_SIZE):
+    """Rank the candidate shifts for a binary stream, reading it once in fixed-size chunks."""
+    return score_shifts(letter_histogram(iter_chunks(stream, chunk_size)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recover the shift of a Caesar ciphertext.")
+    parser.add_argument('-i', '--input', default='-', help="ciphertext file, '-' for stdin (default)")
+    parser.add_argument('--top', type=int, default=5, help="number of candidates to show")
+    parser.add_argument('--preview', type=int, default=60, help="letters of decrypted preview per candidate")
+    args = parser.parse_args(argv)
+
+    if args.input == '-':
+        # stdin cannot be reread, so the preview comes from the first chunk
+        chunks = iter_chunks(sys.stdin.buffer)
+        first = next(chunks, b'')
+        preview = first[:args.preview * 4]
+        candidates = score_shifts(letter_histogram(itertools.chain([first], chunks)))
+    else:
+        with open(args.input, 'rb') as handle:
+            candidates = crack_stream(handle)
+            handle.seek(0)
+            preview = handle.read(args.preview * 4)
+
+    for candidate in candidates[:args.top]:
+        text = get_engine(None, candidate.shift).decrypt(preview)[:args.preview].decode('ascii')
+        print(f"shift {candidate.shift:2d}  confidence {candidate.confidence:7.2%}  {text}")
+
+
+if __name__ == '__main__':
+    main()
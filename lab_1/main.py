@@ -5,10 +5,107 @@ Implement the Caesar algorithm for the English alphabet in one of the programmin
 Task 1.2
 Implement the Caesar algorithm with 2 keys, preserving the conditions expressed in Task 1.1. In addition, key 2 must contain only letters of the Latin alphabet, and have a length of not less than 7.
 """
+import os
+import sys
+from functools import lru_cache
+
+if not __package__:
+    # Run as a script (python lab_1/main.py): make the repository root importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ciphers.alphabet import ENGLISH, get_alphabet
+from ciphers.base import RECORD_SEPARATOR, join_records
+
+LETTERS = ENGLISH.letters
+CHUNK_SIZE = 1 << 20
+
+
+class CaesarEngine:
+    """Caesar cipher over a fixed alphabet and shift, backed by precomputed translation tables."""
+
+    def __init__(self, alphabet, shift):
+        self.model = get_alphabet(alphabet)
+        self.alphabet = self.model.letters
+        size = len(self.alphabet)
+        self.shift = shift % size
+        encrypt = lambda index: self.alphabet[(index + self.shift) % size]
+        decrypt = lambda index: self.alphabet[(index - self.shift) % size]
+        if self.model.is_ascii:
+            self._encrypt_table, self._delete = self.model.byte_tables(encrypt)
+            self._decrypt_table, _ = self.model.byte_tables(decrypt)
+            self._records_delete = self._delete.replace(RECORD_SEPARATOR, b'')
+            self._records_tables = {'encrypt': self._encrypt_table, 'decrypt': self._decrypt_table}
+        else:
+            # Letters such as Ă or Ș are not bytes, so bytes input goes through UTF-8 and str tables
+            self._encrypt_table = self.model.table(encrypt)
+            self._decrypt_table = self.model.table(decrypt)
+            keep = RECORD_SEPARATOR.decode('ascii')
+            self._records_tables = {'encrypt': self.model.table(encrypt, keep),
+                                    'decrypt': self.model.table(decrypt, keep)}
+
+    def encrypt(self, data):
+        """
+        Encrypt a str, bytes, bytearray or memoryview, dropping every non-letter. The result
+        has the input's type, except that a memoryview is translated chunk by chunk into a
+        bytearray, which is returned as is rather than copied once more into bytes.
+        """
+        return self._translate(data, self._encrypt_table)
+
+    def decrypt(self, data):
+        """Decrypt like encrypt."""
+        return self._translate(data, self._decrypt_table)
+
+    def encrypt_records(self, records):
+        """Encrypt a list of bytes records in one translate pass over their joined bytes."""
+        return self._translate_records(records, 'encrypt')
+
+    def decrypt_records(self, records):
+        """Decrypt a list of bytes records in one translate pass over their joined bytes."""
+        return self._translate_records(records, 'decrypt')
+
+    def _translate_records(self, records, operation):
+        joined = join_records(records)
+        if joined is None:
+            return [getattr(self, operation)(record) for record in records]
+        table = self._records_tables[operation]
+        if self.model.is_ascii:
+            return joined.translate(table, self._records_delete).split(RECORD_SEPARATOR)
+        text = self.model.normalize(joined.decode('utf-8')).translate(table)
+        return text.encode('utf-8').split(RECORD_SEPARATOR)
+
+    def _translate(self, data, table):
+        if not self.model.is_ascii:
+            if isinstance(data, str):
+                return self.model.normalize(data).translate(table)
+            return self.model.normalize(bytes(data).decode('utf-8')).translate(table).encode('utf-8')
+        if isinstance(data, str):
+            return data.encode('ascii', 'ignore').translate(table, self._delete).decode('ascii')
+        if isinstance(data, memoryview):
+            # translate needs bytes, so each chunk of the input is copied once; the output goes
+            # into one buffer sized for the whole input, trimmed in place and returned as a
+            # bytearray, since converting it to bytes would copy the whole output again
+            data = data.cast('B')
+            out = bytearray(len(data))
+            end = 0
+            for start in range(0, len(data), CHUNK_SIZE):
+                piece = data[start:start + CHUNK_SIZE].tobytes().translate(table, self._delete)
+                out[end:end + len(piece)] = piece
+                end += len(piece)
+            del out[end:]
+            return out
+        return data.translate(table, self._delete)
+
+
+@lru_cache(maxsize=128)
+def get_engine(keyword=None, shift=0, alphabet=ENGLISH):
+    """Return the cached engine for a (keyword, shift) pair; no keyword means the plain alphabet."""
+    alphabet = get_alphabet(alphabet)
+    return CaesarEngine(alphabet.keyed(keyword) if keyword else alphabet, shift)
+
 
 def encrypt_default(text, shift):
     """Encrypt the text using the default Caesar cipher."""
-    return ''.join(chr((ord(char) - ord('A') + shift) % 26 + ord('A')) for char in text.upper() if char.isalpha())
+    return get_engine(None, shift % 26).encrypt(text)
 
 
 def decrypt_default(text, shift):    
@@ -49,24 +146,19 @@ def get_valid_text():
             print("Text must contain only letters and spaces.")
 
 
-def generate_alphabet(keyword):
+def generate_alphabet(keyword, alphabet=ENGLISH):
     """Generate a new alphabet based on the keyword."""
-    keyword = ''.join(dict.fromkeys(keyword.upper()))  # Remove duplicates
-    remaining_letters = [chr(i) for i in range(ord('A'), ord('Z')+1) if chr(i) not in keyword]
-    return keyword + ''.join(remaining_letters)
+    return get_alphabet(alphabet).keyed_letters(keyword)
 
 
 def encrypt_with_key(text, keyword, shift):
     """Encrypt the text using the Caesar cipher with a keyword."""
-    alphabet = generate_alphabet(keyword)
-    print(f"The generated alphabet is: {alphabet}")
-    return ''.join(alphabet[(alphabet.index(char) + shift) % 26] for char in text.upper() if char.isalpha())
+    return get_engine(keyword, shift % 26).encrypt(text)
 
 
 def decrypt_with_key(text, keyword, shift):
     """Decrypt the text using the Caesar cipher with a keyword."""
-    alphabet = generate_alphabet(keyword)
-    return ''.join(alphabet[(alphabet.index(char) - shift) % 26] for char in text.upper() if char.isalpha())
+    return get_engine(keyword, shift % 26).decrypt(text)
 
 
 def task_1():
@@ -100,6 +192,7 @@ def task_2():
     text = get_valid_text()
     shift = get_valid_shift()
 
+    print(f"The generated alphabet is: {generate_alphabet(keyword)}")
     if choice == '1':
         encrypted_text = encrypt_with_key(text, keyword, shift)
         print(f"Encrypted text: {encrypted_text}")
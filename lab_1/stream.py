@@ -0,0 +1,102 @@
+"""
+Non-interactive streaming mode for the Caesar and keyword Caesar ciphers.
+
+Input is read in fixed-size chunks (regular files are memory-mapped) and pushed
+through the same cached engines used by encrypt_default/encrypt_with_key, so
+memory use stays constant regardless of the input size.
+
+Run from the repository root:
+    python -m lab_1.stream encrypt --shift 3 -i access.log -o access.enc
+    cat dump.txt | python -m lab_1.stream decrypt --shift 3 --keyword CRYPTOGRAPHY
+"""
+import argparse
+import mmap
+import os
+import stat
+import sys
+
+from lab_1.main import CHUNK_SIZE, get_engine
+
+
+def iter_chunks(stream, chunk_size=CHUNK_SIZE):
+    """Yield fixed-size byte chunks from a binary stream until it is exhausted."""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def transform_stream(stream, sink, transform, chunk_size=CHUNK_SIZE):
+    """Apply transform to a binary stream chunk by chunk and write the result to sink."""
+    for chunk in iter_chunks(stream, chunk_size):
+        sink.write(transform(chunk))
+
+
+def transform_mapped_file(path, sink, transform, chunk_size=CHUNK_SIZE):
+    """Apply transform to a memory-mapped regular file without reading it into Python objects."""
+    with open(path, 'rb') as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, 'madvise'):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            view = memoryview(mapped)
+            try:
+                for start in range(0, len(view), chunk_size):
+                    sink.write(transform(view[start:start + chunk_size]))
+            finally:
+                view.release()
+
+
+def is_regular_file(path):
+    return path not in (None, '-') and stat.S_ISREG(os.stat(path).st_mode)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Stream files or stdin through the Caesar cipher.")
+    parser.add_argument('operation', choices=['encrypt', 'decrypt'])
+    parser.add_argument('--shift', type=int, required=True, help="shift value (1-25)")
+    parser.add_argument('--keyword', help="keyword of at least 7 letters for the keyword Caesar cipher")
+    parser.add_argument('-i', '--input', default='-', help="input file, '-' for stdin (default)")
+    parser.add_argument('-o', '--output', default='-', help="output file, '-' for stdout (default)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="bytes per chunk")
+    parser.add_argument('--no-mmap', action='store_true', help="read regular files with plain reads")
+    args = parser.parse_args(argv)
+
+    if not 1 <= args.shift <= 25:
+        parser.error("Shift must be between 1 and 25.")
+    if args.keyword is not None and not (args.keyword.isascii() and args.keyword.isalpha() and len(args.keyword) >= 7):
+        parser.error("Keyword must contain only letters and be at least 7 characters long.")
+    if args.chunk_size <= 0:
+        parser.error("Chunk size must be positive.")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    engine = get_engine(args.keyword, args.shift)
+    transform = engine.encrypt if args.operation == 'encrypt' else engine.decrypt
+
+    sink = sys.stdout.buffer if args.output == '-' else open(args.output, 'wb')
+    try:
+        if is_regular_file(args.input) and not args.no_mmap:
+            transform_mapped_file(args.input, sink, transform, args.chunk_size)
+        elif args.input == '-':
+            transform_stream(sys.stdin.buffer, sink, transform, args.chunk_size)
+        else:
+            with open(args.input, 'rb') as source:
+                transform_stream(source, sink, transform, args.chunk_size)
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head); stop quietly like other filters
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return
+    finally:
+        if sink is not sys.stdout.buffer:
+            sink.close()
+        else:
+            sink.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Vigenère cipher built from the Caesar engines of lab_1.
+
+Every key letter is a Caesar shift: the letters at the key positions of that letter are
+sliced out with a single extended slice, run through the same cached engine that
+encrypt_default uses for that shift, and written back, so each pass is a C-level
+translate over 1/period of the text. As with the Caesar cipher, non-letters are dropped
+and the output is upper case.
+
+Run from the repository root:
+    python -m lab_1.vigenere encrypt --key LEMON -i message.txt -o message.enc
+    python -m lab_1.vigenere decrypt --key LEMON -i message.enc
+"""
+import argparse
+import os
+import sys
+from functools import lru_cache
+from itertools import accumulate
+
+from lab_1.main import CHUNK_SIZE, LETTERS, get_engine
+from lab_1.stream import is_regular_file, transform_mapped_file, transform_stream
+
+
+class VigenereCipher:
+    def __init__(self, key):
+        if not (key.isascii() and key.isalpha()):
+            raise ValueError("Key must contain only letters A-Z.")
+        self.key = key.upper()
+        self.engines = [get_engine(None, LETTERS.index(letter)) for letter in self.key]
+        self._letters = get_engine(None, 0)  # shift 0 only filters out the non-letters
+
+    def encrypt(self, data, position=0):
+        """Encrypt a str or bytes-like object whose first letter sits at `position` in the key stream."""
+        return self._apply(data, position, 'encrypt')
+
+    def decrypt(self, data, position=0):
+        """Decrypt a str or bytes-like object whose first letter sits at `position` in the key stream."""
+        return self._apply(data, position, 'decrypt')
+
+    def encrypt_stream(self, chunks):
+        return self._stream(chunks, 'encrypt')
+
+    def decrypt_stream(self, chunks):
+        return self._stream(chunks, 'decrypt')
+
+    def encrypt_records(self, records):
+        """Encrypt a list of independent bytes records, each starting at the beginning of the key."""
+        return self._apply_records(records, 'encrypt')
+
+    def decrypt_records(self, records):
+        """Decrypt a list of independent bytes records, each starting at the beginning of the key."""
+        return self._apply_records(records, 'decrypt')
+
+    def _apply_records(self, records, operation):
+        # Padding every record to whole key periods keeps each one aligned with the key in one joined pass
+        period = len(self.engines)
+        letters = self._letters.encrypt_records(records)
+        out = self._apply(b''.join(text + b'A' * (-len(text) % period) for text in letters), 0, operation)
+        starts = accumulate((len(text) + -len(text) % period for text in letters), initial=0)
+        return [out[start:start + len(text)] for start, text in zip(starts, letters)]
+
+    def stream_transform(self, operation):
+        """Return a one-argument chunk transform that carries the key position from call to call."""
+        position = 0
+
+        def transform(chunk):
+            nonlocal position
+            out = self._apply(chunk, position, operation)
+            position += len(out)
+            return out
+        return transform
+
+    def _stream(self, chunks, operation):
+        transform = self.stream_transform(operation)
+        for chunk in chunks:
+            yield transform(chunk)
+
+    def _apply(self, data, position, operation):
+        is_text = isinstance(data, str)
+        letters = self._letters.encrypt(data.encode('ascii', 'ignore') if is_text else data)
+        period = len(self.engines)
+        out = bytearray(len(letters))
+        for column, engine in enumerate(self.engines):
+            start = (column - position) % period
+            out[start::period] = getattr(engine, operation)(letters[start::period])
+        return out.decode('ascii') if is_text else bytes(out)
+
+
+@lru_cache(maxsize=128)
+def get_vigenere(key):
+    """Return the cached VigenereCipher for the given key."""
+    return VigenereCipher(key)
+
+
+def encrypt_vigenere(text, key):
+    """Encrypt the text using the Vigenère cipher."""
+    return get_vigenere(key).encrypt(text)
+
+
+def decrypt_vigenere(text, key):
+    """Decrypt the text using the Vigenère cipher."""
+    return get_vigenere(key).decrypt(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream files or stdin through the Vigenère cipher.")
+    parser.add_argument('operation', choices=['encrypt', 'decrypt'])
+    parser.add_argument('--key', required=True, help="key of letters A-Z")
+    parser.add_argument('-i', '--input', default='-', help="input file, '-' for stdin (default)")
+    parser.add_argument('-o', '--output', default='-', help="output file, '-' for stdout (default)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="bytes per chunk")
+    args = parser.parse_args(argv)
+
+    try:
+        transform = get_vigenere(args.key).stream_transform(args.operation)
+    except ValueError as error:
+        parser.error(str(error))
+    sink = sys.stdout.buffer if args.output == '-' else open(args.output, 'wb')
+    try:
+        if is_regular_file(args.input):
+            transform_mapped_file(args.input, sink, transform, args.chunk_size)
+        elif args.input == '-':
+            transform_stream(sys.stdin.buffer, sink, transform, args.chunk_size)
+        else:
+            with open(args.input, 'rb') as source:
+                transform_stream(source, sink, transform, args.chunk_size)
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return
+    finally:
+        if sink is not sys.stdout.buffer:
+            sink.close()
+        else:
+            sink.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""
+Key recovery for the Vigenère cipher.
+
+The key length is estimated on a bounded sample of the ciphertext: the index of
+coincidence of every candidate period comes out of one bincount over (period, column,
+letter) bins, and Kasiski distances come from a sorted index of base-26 trigram codes.
+Periods are ranked by the significance of their coincidence excess, plus a share of
+their Kasiski score, so multiples of the key length do not win on short texts.
+The columns are then counted over the whole text in a single pass, and each column's
+shift is the best of all 26 shifts from the Caesar cracker's scorer. Apart from that one
+linear pass, the cost depends on the sample size and the number of periods only.
+
+Run from the repository root:
+    python -m lab_1.vigenere_crack -i ciphertext.txt --max-period 40
+"""
+import argparse
+import mmap
+import os
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from lab_1.crack import ALL_SHIFTS, score_shifts
+from lab_1.main import LETTERS, get_engine
+from lab_1.vigenere import decrypt_vigenere
+
+MAX_PERIOD = 40
+SAMPLE_SIZE = 1 << 18  # letters used to estimate the key length
+KASISKI_BLOCK = 1 << 16
+KASISKI_WEIGHT = 0.25  # share of the Kasiski score in the key length ranking
+
+KeyLength = namedtuple('KeyLength', ['period', 'ioc', 'kasiski'])
+Solution = namedtuple('Solution', ['key', 'period', 'key_lengths'])
+
+
+def letter_codes(data):
+    """Map the letters of a str or bytes-like object to an array of codes 0-25, dropping everything else."""
+    if isinstance(data, str):
+        data = data.encode('ascii', 'ignore')
+    letters = get_engine(None, 0).encrypt(data)  # shift 0 drops non-letters and upper-cases
+    return np.frombuffer(letters, dtype=np.uint8) - ord('A')
+
+
+def period_ioc(codes, max_period):
+    """
+    Index of coincidence of every period 1..max_period in one bincount, with the number of
+    letter pairs behind it. Each column's IoC is normalized by n(n-1), so it is unbiased at
+    any length, and the columns are averaged weighted by their size.
+    """
+    periods = np.arange(1, max_period + 1, dtype=np.int32)
+    bases = np.concatenate(([0], np.cumsum(periods * 26)[:-1])).astype(np.int32)
+    positions = np.arange(len(codes), dtype=np.int32)
+    bins = bases[:, None] + (positions[None, :] % periods[:, None]) * 26 + codes[None, :]
+    counts = np.bincount(bins.ravel(), minlength=int(bases[-1]) + max_period * 26).astype(np.float64)
+
+    ioc = np.zeros(max_period)
+    pairs = np.zeros(max_period)
+    for index, (period, base) in enumerate(zip(periods.tolist(), bases.tolist())):
+        table = counts[base:base + period * 26].reshape(period, 26)
+        totals = table.sum(axis=1)
+        used = totals > 1
+        if used.any():
+            columns = (table[used] * (table[used] - 1)).sum(axis=1) / (totals[used] * (totals[used] - 1))
+            ioc[index] = (columns * totals[used]).sum() / totals[used].sum()
+            pairs[index] = (totals * (totals - 1)).sum() / 2
+    return ioc, pairs
+
+
+def kasiski(codes, max_period):
+    """
+    For every period, how far the share of repeated-trigram distances it divides exceeds the
+    1/period expected by chance, in standard errors. The key length and its divisors score high.
+    """
+    scores = np.zeros(max_period)
+    if len(codes) < 4:
+        return scores
+    wide = codes.astype(np.int32)
+    trigrams = wide[:-2] * 676 + wide[1:-1] * 26 + wide[2:]
+    order = np.argsort(trigrams, kind='stable')  # equal trigrams stay in position order
+    repeated = trigrams[order[1:]] == trigrams[order[:-1]]
+    distances = (order[1:] - order[:-1])[repeated]
+    if not len(distances):
+        return scores
+    periods = np.arange(1, max_period + 1)
+    for start in range(0, len(distances), KASISKI_BLOCK):
+        block = distances[start:start + KASISKI_BLOCK, None]
+        scores += (block % periods == 0).sum(axis=0)
+    scores[0] = 0.0  # every distance is a multiple of 1
+    expected = 1 / periods[1:]
+    scores[1:] = (scores[1:] / len(distances) - expected) / np.sqrt(expected * (1 - expected) / len(distances))
+    return scores
+
+
+def rank_key_lengths(codes, max_period=MAX_PERIOD, sample_size=SAMPLE_SIZE):
+    """Return a KeyLength per candidate period, most likely first."""
+    sample = codes[:sample_size]
+    max_period = max(1, min(max_period, len(sample) // 2))
+    ioc, pairs = period_ioc(sample, max_period)
+    repeats = kasiski(sample, max_period)
+    # Rank by how significant the excess over random text is, not by the raw IoC: multiples
+    # of the key length have the same IoC on fewer pairs, so on short texts their noise
+    # beats the key length, while the significance falls with the pair count
+    chance = 1 / 26
+    significance = (ioc - chance) * np.sqrt(pairs / (chance * (1 - chance)))
+    score = significance + KASISKI_WEIGHT * repeats
+    order = np.argsort(-score, kind='stable')
+    return [KeyLength(k + 1, float(ioc[k]), float(repeats[k])) for k in order.tolist()]
+
+
+def column_histograms(codes, period):
+    """Letter counts of every key column over the whole text, one strided pass per column."""
+    usable = len(codes) - len(codes) % period
+    grid = codes[:usable].reshape(-1, period)
+    histograms = np.zeros((period, 26), dtype=np.int64)
+    for column in range(period):
+        histograms[column] = np.bincount(grid[:, column], minlength=26)
+    for column, code in enumerate(codes[usable:].tolist()):
+        histograms[column, code] += 1
+    return histograms
+
+
+def solve_key(codes, period):
+    """Best key of the given length: each column is a Caesar cipher scored over all 26 shifts."""
+    histograms = column_histograms(codes, period)
+    return ''.join(LETTERS[score_shifts(histogram, ALL_SHIFTS)[0].shift] if histogram.sum() else 'A'
+                   for histogram in histograms)
+
+
+def crack_vigenere(ciphertext, max_period=MAX_PERIOD, sample_size=SAMPLE_SIZE):
+    """Recover the key of a str or bytes-like Vigenère ciphertext."""
+    codes = letter_codes(ciphertext)
+    if not len(codes):
+        raise ValueError("Ciphertext contains no letters.")
+    key_lengths = rank_key_lengths(codes, max_period, sample_size)
+    period = key_lengths[0].period
+    return Solution(solve_key(codes, period), period, key_lengths)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recover the key of a Vigenère ciphertext.")
+    parser.add_argument('-i', '--input', default='-', help="ciphertext file, '-' for stdin (default)")
+    parser.add_argument('--max-period', type=int, default=MAX_PERIOD, help="longest key length to consider")
+    parser.add_argument('--sample', type=int, default=SAMPLE_SIZE, help="letters used to find the key length")
+    parser.add_argument('--top', type=int, default=5, help="number of key lengths to show")
+    parser.add_argument('--preview', type=int, default=60, help="letters of decrypted preview")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.input == '-':
+            ciphertext = sys.stdin.buffer.read()
+            solution = crack_vigenere(ciphertext, args.max_period, args.sample)
+        else:
+            with open(args.input, 'rb') as handle:
+                if os.fstat(handle.fileno()).st_size == 0:
+                    raise ValueError("Ciphertext contains no letters.")
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        solution = crack_vigenere(view, args.max_period, args.sample)
+                        ciphertext = view[:args.preview * 4].tobytes()
+                    finally:
+                        view.release()
+    except ValueError as error:
+        sys.exit(f"Error: {error}")
+
+    for key_length in solution.key_lengths[:args.top]:
+        print(f"period {key_length.period:3d}  ioc {key_length.ioc:.4f}  kasiski {key_length.kasiski:5.2f}")
+    preview = decrypt_vigenere(get_engine(None, 0).encrypt(ciphertext[:args.preview * 4]).decode('ascii'),
+                               solution.key)
+    print(f"key {solution.key}  {preview[:args.preview]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Frequency and n-gram statistics for the substitution workbench.
+
+Unigram, bigram and trigram counts and the index of coincidence are computed in one
+vectorized pass over the text's code points. N-gram codes are counted with np.bincount
+while the table is small and with np.unique beyond that, so texts with thousands of
+distinct letters (CJK, mixed scripts) never allocate a dense size**3 table. Results are memoized
+by a content hash in a bounded LRU cache, so re-pasting or reloading a ciphertext is
+instant.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+CACHE_SIZE = 32
+TOP_NGRAMS = 20
+DENSE_LIMIT = 1 << 20  # largest n-gram table counted densely
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def content_hash(text):
+    return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+
+def count_codes(codes, space):
+    """Distinct n-gram codes in ascending order and their counts."""
+    if space <= DENSE_LIMIT:
+        counts = np.bincount(codes, minlength=space)
+        present = np.flatnonzero(counts)
+        return present, counts[present]
+    return np.unique(codes, return_counts=True)
+
+
+def top_ngrams(codes, counts, letters, order, limit=TOP_NGRAMS):
+    """Most frequent n-grams as (ngram, count, percent) rows from base-K codes and their counts."""
+    total = counts.sum()
+    size = len(letters)
+    best = np.argsort(counts, kind='stable')[::-1][:limit]
+    rows = []
+    for code, count in zip(codes[best].tolist(), counts[best].tolist()):
+        digits = []
+        for _ in range(order):
+            code, digit = divmod(code, size)
+            digits.append(letters[digit])
+        rows.append((''.join(reversed(digits)), count, count / total * 100))
+    return rows
+
+
+def analyze(text):
+    """Compute unigram frequencies, top bigrams and trigrams and the index of coincidence."""
+    points = np.frombuffer(text.upper().encode('utf-32-le'), dtype=np.uint32)
+    point_counts = np.bincount(points) if len(points) else np.zeros(0, dtype=np.int64)
+    letter_points = [point for point in np.flatnonzero(point_counts).tolist() if chr(point).isalpha()]
+    letters = [chr(point) for point in letter_points]
+    size = len(letters)
+
+    unigram_counts = point_counts[letter_points] if size else np.zeros(0, dtype=np.int64)
+    total = int(unigram_counts.sum())
+    result = {
+        'unigrams': {letter: int(count) / total * 100 for letter, count in zip(letters, unigram_counts)},
+        'bigrams': [],
+        'trigrams': [],
+        'ioc': 0.0,
+        'letters': total,
+    }
+    if total == 0:
+        return result
+    if total > 1:
+        result['ioc'] = float((unigram_counts * (unigram_counts - 1)).sum() / (total * (total - 1)))
+
+    # Letter index of every position, -1 for anything that is not a letter; n-grams never span non-letters
+    lookup = np.full(len(point_counts), -1, dtype=np.int32)
+    lookup[letter_points] = np.arange(size, dtype=np.int32)
+    indices = lookup[points].astype(np.int64)
+
+    first, second = indices[:-1], indices[1:]
+    valid = (first >= 0) & (second >= 0)
+    result['bigrams'] = top_ngrams(*count_codes(first[valid] * size + second[valid], size ** 2), letters, 2)
+
+    first, second, third = indices[:-2], indices[1:-1], indices[2:]
+    valid = (first >= 0) & (second >= 0) & (third >= 0)
+    codes = (first[valid] * size + second[valid]) * size + third[valid]
+    result['trigrams'] = top_ngrams(*count_codes(codes, size ** 3), letters, 3)
+    return result
+
+
+def cached_analysis(text):
+    """Return analyze(text), memoized by content hash with LRU eviction."""
+    key = content_hash(text)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    result = analyze(text)
+    with _cache_lock:
+        _cache[key] = result
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
@@ -0,0 +1,65 @@
+"""
+Incremental decoder for the substitution workbench.
+
+The ciphertext is indexed once: for every distinct character we keep the positions
+where it occurs. The decoded text lives in a mutable array of code points, and a
+substitution change only rewrites the positions of the letters whose mapping changed.
+"""
+import numpy as np
+
+
+class IncrementalDecoder:
+    def __init__(self, ciphertext, substitutions=None):
+        self.ciphertext = ciphertext
+        original = np.frombuffer(ciphertext.encode('utf-32-le'), dtype=np.uint32)
+        self._buffer = original.copy()
+        self._text = ciphertext
+        self.substitutions = {}
+
+        # Group positions by character with a single stable sort; every group is a view into `order`
+        order = np.argsort(original, kind='stable').astype(np.int32 if len(original) < 2 ** 31 else np.int64)
+        sorted_points = original[order]
+        code_points, starts = np.unique(sorted_points, return_index=True)
+        ends = np.append(starts[1:], len(order))
+
+        # letter -> [(positions, original character), ...] for every character whose uppercase is letter
+        self._positions = {}
+        for code_point, start, end in zip(code_points.tolist(), starts.tolist(), ends.tolist()):
+            char = chr(code_point)
+            self._positions.setdefault(char.upper(), []).append((order[start:end], char))
+
+        if substitutions:
+            self.update(substitutions)
+
+    @property
+    def text(self):
+        """The decoded text, materialized only after it has changed."""
+        if self._text is None:
+            self._text = self._buffer.tobytes().decode('utf-32-le')
+        return self._text
+
+    def update(self, substitutions, text=None):
+        """
+        Switch to a new substitution mapping and return the set of letters that had to be patched.
+        `text` is the decoded text of the new mapping when the caller already has it cached,
+        which saves materializing it again.
+        """
+        changed = {letter for letter in self.substitutions.keys() | substitutions.keys()
+                   if self.substitutions.get(letter) != substitutions.get(letter)}
+        for letter in changed:
+            self._patch(letter, substitutions.get(letter))
+        self.substitutions = dict(substitutions)
+        if text is not None:
+            self._text = text
+        elif changed:
+            self._text = None
+        return changed
+
+    def _patch(self, letter, substitution):
+        for positions, char in self._positions.get(letter, ()):
+            replacement = char
+            if substitution:
+                replacement = substitution.lower() if char.islower() else substitution.upper()
+                if len(replacement) != 1:
+                    replacement = char
+            self._buffer[positions] = ord(replacement)
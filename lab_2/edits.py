@@ -0,0 +1,147 @@
+"""
+Undo/redo log of substitution edits for the workbench.
+
+Every change is stored as a delta: only the letters whose substitution changed, with
+their old and new values, so undo and redo apply one small delta whatever the length
+of the history. The log drives an IncrementalDecoder, which rewrites only the positions
+of the changed letters, and the decoded text of recently visited checkpoints is cached
+up to CACHE_CHARS characters in total, so stepping back and forth does not rebuild the
+text either.
+
+The history exports as a delta stream: a JSON header line with the starting mapping and
+the current position, then one JSON line per edit with just the letters it set
+(null for a removed substitution).
+"""
+import json
+from collections import OrderedDict
+
+FORMAT = 'substitution-edits'
+VERSION = 1
+CACHE_CHARS = 1 << 24  # total characters of the decoded checkpoints kept
+
+
+class EditLog:
+    def __init__(self, decoder, cache_chars=CACHE_CHARS):
+        self.decoder = decoder
+        self.initial = dict(decoder.substitutions)
+        self.substitutions = dict(decoder.substitutions)
+        self.edits = []  # each edit is a tuple of (letter, old, new), None meaning unmapped
+        self.position = 0  # number of edits applied
+        self.cache_chars = cache_chars
+        self._texts = OrderedDict()  # position -> decoded text
+        self._cached_chars = 0
+
+    @property
+    def can_undo(self):
+        return self.position > 0
+
+    @property
+    def can_redo(self):
+        return self.position < len(self.edits)
+
+    @property
+    def text(self):
+        """Decoded text of the current checkpoint."""
+        text = self._texts.get(self.position)
+        if text is None:
+            text = self.decoder.text
+            self._texts[self.position] = text
+            self._cached_chars += len(text)
+            # The current checkpoint always stays: the decoder holds that text anyway
+            while self._cached_chars > self.cache_chars and len(self._texts) > 1:
+                self._cached_chars -= len(self._texts.popitem(last=False)[1])
+        else:
+            self._texts.move_to_end(self.position)
+        return text
+
+    def record(self, substitutions):
+        """
+        Make `substitutions` the current mapping as one new edit, dropping the redo branch.
+        Returns False when nothing changed.
+        """
+        delta = tuple((letter, self.substitutions.get(letter), substitutions.get(letter))
+                      for letter in sorted(self.substitutions.keys() | substitutions.keys())
+                      if self.substitutions.get(letter) != substitutions.get(letter))
+        if not delta:
+            return False
+        del self.edits[self.position:]
+        for position in [position for position in self._texts if position > self.position]:
+            self._cached_chars -= len(self._texts.pop(position))
+        self.edits.append(delta)
+        self._move(self.position + 1)
+        return True
+
+    def undo(self):
+        if self.can_undo:
+            self._move(self.position - 1)
+        return self.substitutions
+
+    def redo(self):
+        if self.can_redo:
+            self._move(self.position + 1)
+        return self.substitutions
+
+    def goto(self, position):
+        """Jump to any checkpoint, 0 being the starting mapping."""
+        if not 0 <= position <= len(self.edits):
+            raise IndexError(position)
+        self._move(position)
+        return self.substitutions
+
+    def _move(self, position):
+        while self.position < position:
+            self._apply(self.edits[self.position], 2)
+            self.position += 1
+        while self.position > position:
+            self.position -= 1
+            self._apply(self.edits[self.position], 1)
+        self.decoder.update(self.substitutions, self._texts.get(position))
+
+    def _apply(self, delta, side):
+        for edit in delta:
+            if edit[side] is None:
+                self.substitutions.pop(edit[0], None)
+            else:
+                self.substitutions[edit[0]] = edit[side]
+
+    def export(self):
+        """The history as a delta stream."""
+        header = {'format': FORMAT, 'version': VERSION, 'position': self.position, 'initial': self.initial}
+        lines = [json.dumps(header, ensure_ascii=False)]
+        lines += [json.dumps({letter: new for letter, _, new in delta}, ensure_ascii=False) for delta in self.edits]
+        return '\n'.join(lines) + '\n'
+
+    @classmethod
+    def load(cls, stream, decoder):
+        """Rebuild a log over `decoder` from an exported delta stream, at its saved position."""
+        lines = [line for line in stream.splitlines() if line.strip()]
+        try:
+            header = json.loads(lines[0]) if lines else None
+            edits = [json.loads(line) for line in lines[1:]]
+        except json.JSONDecodeError as error:
+            raise ValueError(f"Malformed substitution edit stream: {error}") from None
+        if not isinstance(header, dict) or header.get('format') != FORMAT or header.get('version') != VERSION:
+            raise ValueError("Not a substitution edit stream.")
+        # The whole stream is checked before the decoder is touched, so a failed import changes nothing
+        position = header.get('position', len(edits))
+        if not is_mapping(header.get('initial')):
+            raise ValueError("Malformed substitution edit stream: the initial mapping is not a letter mapping.")
+        for number, edit in enumerate(edits, 1):
+            if not is_mapping(edit, removals=True):
+                raise ValueError(f"Malformed substitution edit stream: edit {number} is not a letter mapping.")
+        if type(position) is not int:
+            raise ValueError("Malformed substitution edit stream: the position is not an integer.")
+        decoder.update(header['initial'])
+        log = cls(decoder)
+        for edit in edits:
+            log.record(dict(log.substitutions, **edit))
+        log._move(min(max(position, 0), len(log.edits)))
+        return log
+
+
+def is_mapping(value, removals=False):
+    """Whether a decoded JSON value maps letters to single letters (or null, for removals)."""
+    return isinstance(value, dict) and all(
+        len(letter) == 1 and (isinstance(substitution, str) and len(substitution) == 1
+                              or removals and substitution is None)
+        for letter, substitution in value.items())
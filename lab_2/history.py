@@ -0,0 +1,91 @@
+"""
+Persistent attempt history for the substitution workbench.
+
+Ciphertexts are stored once in SQLite, keyed by their content hash, and every
+attempt only records its substitution mapping as a 26-byte record (the substitute
+for each of A-Z, or 0 when the letter is unmapped). Decoded text is never stored; it
+is rebuilt from the ciphertext and the mapping when an attempt is loaded.
+"""
+import sqlite3
+import string
+import threading
+from datetime import datetime
+
+from lab_2.analysis import content_hash
+
+LETTERS = string.ascii_uppercase
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ciphertexts (
+    hash TEXT PRIMARY KEY,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cipher_hash TEXT NOT NULL REFERENCES ciphertexts(hash),
+    timestamp TEXT NOT NULL,
+    mapping BLOB NOT NULL
+);
+"""
+
+
+def pack_mapping(substitutions):
+    """Pack an A-Z substitution dict into 26 bytes; other keys and non A-Z values are dropped."""
+    record = bytearray(26)
+    for index, letter in enumerate(LETTERS):
+        substitute = substitutions.get(letter, '')
+        if len(substitute) == 1 and substitute.upper() in LETTERS:
+            record[index] = ord(substitute.upper())
+    return bytes(record)
+
+
+def unpack_mapping(record):
+    """Inverse of pack_mapping."""
+    return {letter: chr(code) for letter, code in zip(LETTERS, record) if code}
+
+
+class HistoryStore:
+    def __init__(self, path):
+        self.path = path
+        # Streamlit reruns scripts on different threads, so one connection is shared behind a lock
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.executescript(SCHEMA)
+
+    def save(self, ciphertext, substitutions):
+        """Record an attempt and return its id."""
+        digest = content_hash(ciphertext)
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR IGNORE INTO ciphertexts (hash, text) VALUES (?, ?)",
+                                     (digest, ciphertext))
+            cursor = self._connection.execute(
+                "INSERT INTO attempts (cipher_hash, timestamp, mapping) VALUES (?, ?, ?)",
+                (digest, timestamp, pack_mapping(substitutions)))
+            return cursor.lastrowid
+
+    def count(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM attempts").fetchone()[0]
+
+    def page(self, offset, limit):
+        """Return (id, timestamp) rows, newest first."""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT id, timestamp FROM attempts ORDER BY id DESC LIMIT ? OFFSET ?",
+                (limit, offset)).fetchall()
+
+    def load(self, attempt_id):
+        """Return (ciphertext, substitutions) for an attempt."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT ciphertexts.text, attempts.mapping FROM attempts "
+                "JOIN ciphertexts ON ciphertexts.hash = attempts.cipher_hash WHERE attempts.id = ?",
+                (attempt_id,)).fetchone()
+        if row is None:
+            raise KeyError(attempt_id)
+        return row[0], unpack_mapping(row[1])
+
+    def close(self):
+        self._connection.close()
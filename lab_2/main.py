@@ -1,9 +1,22 @@
 import streamlit as st
-from collections import Counter
 import json
-from datetime import datetime
+import os
+import sys
 import pandas as pd
 
+if not __package__:
+    # Run as a script (streamlit run lab_2/main.py): make the repository root importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import instrument
+from lab_2.analysis import cached_analysis
+from lab_2.decoder import IncrementalDecoder
+from lab_2.edits import EditLog
+from lab_2.frequencies import letter_frequencies
+from lab_2.history import HistoryStore
+from lab_2.solver import SubstitutionSolver
+from lab_3.quadgrams import QuadgramTable
+
 # Set page configuration to wide mode
 st.set_page_config(
     page_title="Cipher Decoder",
@@ -30,50 +43,89 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Initialize session state variables
-if 'history' not in st.session_state:
-    st.session_state.history = []
+if 'history_page' not in st.session_state:
+    st.session_state.history_page = 0
 if 'current_substitutions' not in st.session_state:
     st.session_state.current_substitutions = {}
 if 'temp_substitutions' not in st.session_state:
     st.session_state.temp_substitutions = {}
 if 'frequencies' not in st.session_state:
     st.session_state.frequencies = {}
+if 'analysis' not in st.session_state:
+    st.session_state.analysis = cached_analysis("")
 if 'decoded_text' not in st.session_state:
     st.session_state.decoded_text = ""
 if 'ciphertext' not in st.session_state:
     st.session_state.ciphertext = ""
-if 'current_attempt_index' not in st.session_state:
-    st.session_state.current_attempt_index = None
-
-letter_frequencies = {
-    "A": 8.17, "B": 1.49, "C": 2.78, "D": 4.25, "E": 12.70, "F": 2.23, "G": 2.01, "H": 6.09, "I": 6.97, "J": 0.15,
-    "K": 0.77, "L": 4.03, "M": 2.41, "N": 6.75, "O": 7.51, "P": 1.93, "Q": 0.09, "R": 5.99, "S": 6.33, "T": 9.06,
-    "U": 2.76, "V": 0.98, "W": 2.36, "X": 0.15, "Y": 1.97, "Z": 0.07
-}
-
-def frequency_analysis(text):
-    text = text.upper()
-    counter = Counter(char for char in text if char.isalpha())
-    total = sum(counter.values())
-    frequency = {char: (count / total) * 100 for char, count in counter.items()}
-    return frequency
-
-def decode(ciphertext, substitution_dict):
-    decoded_text = ""
-    for char in ciphertext:
-        if char.upper() in substitution_dict:
-            decoded_char = substitution_dict[char.upper()]
-            decoded_text += decoded_char.lower() if char.islower() else decoded_char.upper()
-        else:
-            decoded_text += char
-    return decoded_text
+if 'decoder' not in st.session_state:
+    st.session_state.decoder = IncrementalDecoder("")
+if 'edits' not in st.session_state:
+    st.session_state.edits = EditLog(st.session_state.decoder)
+if 'current_attempt_id' not in st.session_state:
+    st.session_state.current_attempt_id = None
+if 'solver' not in st.session_state:
+    st.session_state.solver = None
+if 'solver_version' not in st.session_state:
+    st.session_state.solver_version = 0
 
-def update_decoded_text():
+def update_analysis():
+    # Cached by content hash, so reloading a known ciphertext does not recount it
+    st.session_state.analysis = cached_analysis(st.session_state.ciphertext)
+    st.session_state.frequencies = st.session_state.analysis['unigrams']
+
+def reset_decoder():
+    st.session_state.decoder = IncrementalDecoder(st.session_state.ciphertext)
+    st.session_state.edits = EditLog(st.session_state.decoder)
+
+def show_decoded_text():
     if st.session_state.ciphertext and st.session_state.current_substitutions:
-        st.session_state.decoded_text = decode(
-            st.session_state.ciphertext,
-            st.session_state.current_substitutions
-        )
+        st.session_state.decoded_text = st.session_state.edits.text
+    else:
+        st.session_state.decoded_text = ""
+
+def update_decoded_text():
+    # Every change is logged as an undoable delta; only the letters it touches are rewritten
+    if st.session_state.decoder.ciphertext != st.session_state.ciphertext:
+        reset_decoder()
+    st.session_state.edits.record(st.session_state.current_substitutions)
+    show_decoded_text()
+
+def show_logged_substitutions():
+    substitutions = st.session_state.edits.substitutions
+    st.session_state.current_substitutions = dict(substitutions)
+    st.session_state.temp_substitutions = dict(substitutions)
+    # The substitution inputs keep their own widget state; dropping it makes them show the new mapping
+    for key in [key for key in st.session_state if key.startswith('sub_')]:
+        del st.session_state[key]
+    show_decoded_text()
+
+def step_edits(step):
+    # Undo or redo one logged edit; the decoded text of recent checkpoints is cached
+    stop_solver()
+    getattr(st.session_state.edits, step)()
+    show_logged_substitutions()
+
+def import_file():
+    uploaded_file = st.session_state.import_file
+    if uploaded_file is None:
+        return
+    try:
+        content = uploaded_file.getvalue().decode('utf-8')
+        if uploaded_file.name.endswith('.jsonl'):
+            # An exported edit history brings its undo/redo steps back
+            stop_solver()
+            st.session_state.edits = EditLog.load(content, st.session_state.decoder)
+        else:
+            imported_subs = json.loads(content)
+            if not isinstance(imported_subs, dict):
+                raise ValueError("expected a JSON object of letter substitutions")
+            st.session_state.current_substitutions = imported_subs
+            update_decoded_text()
+    except ValueError as error:
+        st.error(f"Cannot import {uploaded_file.name}: {error}")
+        return
+    show_logged_substitutions()
+    st.success("Substitutions imported successfully!")
 
 def apply_substitutions():
     # Update current_substitutions with valid entries from temp_substitutions
@@ -84,30 +136,49 @@ def apply_substitutions():
             st.session_state.current_substitutions.pop(letter, None)
     update_decoded_text()
 
+HISTORY_PAGE_SIZE = 10
+
+@st.cache_resource
+def get_history_store(path):
+    return HistoryStore(path)
+
+history = get_history_store(os.environ.get("CIPHER_HISTORY_DB", "cipher_history.sqlite3"))
+
 def save_attempt():
-    attempt = {
-        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        'ciphertext': st.session_state.ciphertext,
-        'substitutions': st.session_state.current_substitutions.copy(),
-        'decoded_text': st.session_state.decoded_text,
-        'frequencies': st.session_state.frequencies
-    }
-    st.session_state.history.append(attempt)
-    st.session_state.current_attempt_index = len(st.session_state.history) - 1
-
-def load_attempt(idx):
-    attempt = st.session_state.history[idx]
-    st.session_state.ciphertext = attempt['ciphertext']
-    st.session_state.current_substitutions = attempt['substitutions'].copy()
-    st.session_state.temp_substitutions = attempt['substitutions'].copy()
-    st.session_state.frequencies = attempt['frequencies']
-    st.session_state.current_attempt_index = idx
+    st.session_state.current_attempt_id = history.save(
+        st.session_state.ciphertext,
+        st.session_state.current_substitutions
+    )
+    st.session_state.history_page = 0
+
+def load_attempt(attempt_id):
+    stop_solver()
+    ciphertext, substitutions = history.load(attempt_id)
+    st.session_state.ciphertext = ciphertext
+    st.session_state.current_substitutions = substitutions
+    st.session_state.temp_substitutions = substitutions.copy()
+    update_analysis()
+    st.session_state.current_attempt_id = attempt_id
     update_decoded_text()
 
+def toggle_instrumentation():
+    # Patches the decoder and analysis functions for every session until switched off again
+    if st.session_state.instrumentation:
+        instrument.enable()
+    else:
+        instrument.disable()
+
+def stop_solver():
+    if st.session_state.solver is not None:
+        st.session_state.solver.stop()
+        st.session_state.solver = None
+
 def on_text_change():
     if st.session_state.text_input != st.session_state.ciphertext:
+        stop_solver()
         st.session_state.ciphertext = st.session_state.text_input
-        st.session_state.frequencies = frequency_analysis(st.session_state.ciphertext)
+        reset_decoder()
+        update_analysis()
         st.session_state.current_substitutions = {}
         st.session_state.temp_substitutions = {}
         update_decoded_text()
@@ -128,8 +199,47 @@ def auto_substitute():
     
     apply_substitutions()
 
+@st.cache_resource
+def load_quadgrams(path):
+    return QuadgramTable.load(path)
+
+def start_auto_solve():
+    stop_solver()
+    try:
+        table = load_quadgrams(st.session_state.quadgram_path)
+        st.session_state.solver = SubstitutionSolver(st.session_state.ciphertext, table)
+    except (OSError, ValueError) as error:
+        st.error(f"Cannot start the solver: {error}")
+        return
+    st.session_state.solver_version = 0
+    st.session_state.solver.start()
+
+def sync_solver():
+    # Copy the solver's best key into the substitutions whenever it has improved
+    version, substitutions, _ = st.session_state.solver.snapshot()
+    if version != st.session_state.solver_version:
+        st.session_state.solver_version = version
+        st.session_state.current_substitutions = substitutions
+        st.session_state.temp_substitutions = substitutions.copy()
+        update_decoded_text()
+        return True
+    return False
+
+@st.fragment(run_every=1.0)
+def solver_progress():
+    solver = st.session_state.solver
+    st.caption(f"Auto-solve: {solver.iterations:,} swaps tried, best score {solver.best_score:,.1f}")
+    if sync_solver() or not solver.running:
+        st.rerun()
+
 st.title("Monoalphabetic Cipher - Frequency Analysis")
 
+if st.session_state.solver is not None:
+    if st.session_state.solver.running:
+        solver_progress()
+    else:
+        sync_solver()
+
 # Create three columns for main layout
 col1, col2, col3 = st.columns([2, 1, 2])
 
@@ -147,15 +257,32 @@ with col2:
     # Frequency Analysis Section
     if st.session_state.frequencies:
         st.subheader("Letter Frequencies")
-        freq_df = pd.DataFrame([st.session_state.frequencies]).T
-        freq_df.columns = ['Frequency (%)']
-        st.dataframe(freq_df, height=300)
+        tab_letters, tab_bigrams, tab_trigrams = st.tabs(["Letters", "Bigrams", "Trigrams"])
+        with tab_letters:
+            freq_df = pd.DataFrame([st.session_state.frequencies]).T
+            freq_df.columns = ['Frequency (%)']
+            st.dataframe(freq_df, height=300)
+        with tab_bigrams:
+            bigram_df = pd.DataFrame(st.session_state.analysis['bigrams'], columns=['Bigram', 'Count', 'Frequency (%)'])
+            st.dataframe(bigram_df.set_index('Bigram'), height=300)
+        with tab_trigrams:
+            trigram_df = pd.DataFrame(st.session_state.analysis['trigrams'], columns=['Trigram', 'Count', 'Frequency (%)'])
+            st.dataframe(trigram_df.set_index('Trigram'), height=300)
+        st.caption(f"Index of coincidence: {st.session_state.analysis['ioc']:.4f} (English ≈ 0.0667, random ≈ 0.0385)")
 
-        col_auto, col_clear = st.columns(2)
+        col_auto, col_solve, col_clear = st.columns(3)
         with col_auto:
             if st.button("Auto-substitute", use_container_width=True):
                 auto_substitute()
-        
+
+        with col_solve:
+            solver = st.session_state.solver
+            if solver is not None and solver.running:
+                if st.button("Stop solver", use_container_width=True):
+                    solver.stop()
+            elif st.button("Auto-solve", use_container_width=True):
+                start_auto_solve()
+
         with col_clear:
             if st.button("Clear All", use_container_width=True):
                 st.session_state.current_substitutions = {}
@@ -220,7 +347,7 @@ if st.session_state.frequencies:
                         st.session_state.temp_substitutions[letter] = new_value
 
     # Apply substitutions button
-    col_apply, col_revert = st.columns(2)
+    col_apply, col_revert, col_undo, col_redo = st.columns(4)
     with col_apply:
         if st.button("Apply Substitutions", use_container_width=True):
             apply_substitutions()
@@ -230,8 +357,16 @@ if st.session_state.frequencies:
             st.session_state.temp_substitutions = st.session_state.current_substitutions.copy()
             update_decoded_text()
 
+    with col_undo:
+        st.button("Undo", disabled=not st.session_state.edits.can_undo, on_click=step_edits, args=("undo",),
+                  use_container_width=True)
+
+    with col_redo:
+        st.button("Redo", disabled=not st.session_state.edits.can_redo, on_click=step_edits, args=("redo",),
+                  use_container_width=True)
+
 # Action buttons in a row
-col_save, col_export, col_import = st.columns([1, 1, 1])
+col_save, col_export, col_history, col_import = st.columns([1, 1, 1, 1])
 
 with col_save:
     if st.button("Save Current Attempt", use_container_width=True):
@@ -248,21 +383,70 @@ with col_export:
             use_container_width=True
         )
 
+with col_history:
+    st.download_button(
+        "Export Edit History",
+        data=st.session_state.edits.export(),
+        file_name="substitution_edits.jsonl",
+        mime="application/jsonl",
+        disabled=not st.session_state.edits.edits,
+        use_container_width=True,
+        help="Every applied change as a delta; import the file to get undo/redo back"
+    )
+
 with col_import:
-    uploaded_file = st.file_uploader("Import Substitutions", type="json")
-    if uploaded_file is not None:
-        imported_subs = json.load(uploaded_file)
-        st.session_state.current_substitutions = imported_subs
-        st.session_state.temp_substitutions = imported_subs.copy()
-        update_decoded_text()
-        st.success("Substitutions imported successfully!")
+    # Imported once per upload; the uploader keeps its file across reruns
+    st.file_uploader("Import Substitutions or Edit History", type=["json", "jsonl"], key="import_file",
+                     on_change=import_file)
 
 # Sidebar for history
 with st.sidebar:
+    st.text_input(
+        "Quadgram table for Auto-solve",
+        value=os.environ.get("QUADGRAM_TABLE", "english_quadgrams.npz"),
+        key="quadgram_path",
+        help="Build one with: python -m lab_3.quadgrams corpus.txt -o english_quadgrams.npz --letters ABCDEFGHIJKLMNOPQRSTUVWXYZ, "
+             "or use an English store from: python -m lab_3.ngrams build corpus.txt -o english.ngrams"
+    )
     st.header("Decoding History")
-    if st.session_state.history:
-        for idx, attempt in enumerate(st.session_state.history):
-            is_current = idx == st.session_state.current_attempt_index
-            button_label = f"{'▶ ' if is_current else ''}Attempt {idx + 1} - {attempt['timestamp']}"
-            if st.button(button_label, key=f"history_{idx}", use_container_width=True):
-                load_attempt(idx)
\ No newline at end of file
+    total_attempts = history.count()
+    page_count = max((total_attempts + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE, 1)
+    page = min(st.session_state.history_page, page_count - 1)
+    for attempt_id, timestamp in history.page(page * HISTORY_PAGE_SIZE, HISTORY_PAGE_SIZE):
+        is_current = attempt_id == st.session_state.current_attempt_id
+        button_label = f"{'▶ ' if is_current else ''}Attempt {attempt_id} - {timestamp}"
+        if st.button(button_label, key=f"history_{attempt_id}", use_container_width=True):
+            load_attempt(attempt_id)
+    if page_count > 1:
+        col_newer, col_page, col_older = st.columns([1, 1, 1])
+        with col_newer:
+            if st.button("Newer", disabled=page == 0, use_container_width=True):
+                st.session_state.history_page = page - 1
+                st.rerun()
+        with col_page:
+            st.caption(f"Page {page + 1} of {page_count}")
+        with col_older:
+            if st.button("Older", disabled=page == page_count - 1, use_container_width=True):
+                st.session_state.history_page = page + 1
+                st.rerun()
+
+    st.header("Instrumentation")
+    st.toggle(
+        "Record stage timings",
+        value=instrument.is_enabled(),
+        key="instrumentation",
+        on_change=toggle_instrumentation,
+        help="Times decoding and frequency analysis per stage; off means the plain functions run unwrapped"
+    )
+    stage_rows = instrument.recorder.rows()
+    if stage_rows:
+        st.dataframe(pd.DataFrame(stage_rows), hide_index=True, use_container_width=True)
+        st.download_button(
+            "Download stage summary",
+            json.dumps(instrument.recorder.summary(), indent=2),
+            file_name="stage_timings.json",
+            mime="application/json"
+        )
+        if st.button("Reset timings"):
+            instrument.recorder.reset()
+            st.rerun()
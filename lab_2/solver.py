@@ -0,0 +1,129 @@
+"""
+Automatic solver for monoalphabetic substitution ciphers.
+
+Keys are 26-letter permutations (cipher letter index -> plaintext letter index)
+scored with a quadgram table from lab_3.quadgrams. The ciphertext is reduced once to
+its distinct quadgrams and their counts. When two key letters are swapped, only the
+quadgrams containing those cipher letters are rescored, so the full text is never
+re-decoded. The search is a hill climb with random restarts. It runs in a
+background thread and publishes every improvement for the UI to pick up.
+"""
+import random
+import string
+import threading
+
+import numpy as np
+
+from lab_2.frequencies import letter_frequencies
+
+LETTERS = string.ascii_uppercase
+
+
+class SubstitutionSolver:
+    def __init__(self, ciphertext, table, seed=None):
+        if table.letters != LETTERS:
+            raise ValueError("The quadgram table must use the 26-letter English alphabet.")
+        self.table = table
+        self._rng = random.Random(seed)
+
+        indices = table.encode(ciphertext)
+        self.present = sorted(set(indices.tolist()))
+        codes, self._counts = np.unique(table.codes(indices), return_counts=True)
+        # Distinct ciphertext quadgrams as rows of four cipher letter indices
+        self._quadgrams = np.stack([codes // 26 ** 3, codes // 26 ** 2 % 26, codes // 26 % 26, codes % 26], axis=1)
+        self._containing = [np.flatnonzero((self._quadgrams == letter).any(axis=1)) for letter in range(26)]
+        letter_counts = np.bincount(indices, minlength=26)
+        self._initial_key = self.frequency_key(letter_counts)
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.best_key = self._initial_key
+        self.best_score = self.score(self.best_key) if len(codes) else float('-inf')
+        self.iterations = 0
+        self.version = 0
+
+    @staticmethod
+    def frequency_key(letter_counts):
+        """The greedy starting key: cipher letters matched to English letters by frequency rank."""
+        english = sorted(LETTERS, key=letter_frequencies.get, reverse=True)
+        cipher = np.argsort(-letter_counts, kind='stable')
+        key = np.empty(26, dtype=np.intp)
+        key[cipher] = [LETTERS.index(letter) for letter in english]
+        return key
+
+    def _log_probs(self, key, rows):
+        plain = key[self._quadgrams[rows]]
+        codes = ((plain[:, 0] * 26 + plain[:, 1]) * 26 + plain[:, 2]) * 26 + plain[:, 3]
+        return self.table.log_probs[codes]
+
+    def score(self, key):
+        """Quadgram log10 score of the whole ciphertext under a key."""
+        return float((self._log_probs(key, slice(None)) * self._counts).sum())
+
+    def swap_delta(self, key, a, b):
+        """Score change from swapping the plaintext letters of cipher letters a and b."""
+        rows = np.union1d(self._containing[a], self._containing[b])
+        if len(rows) == 0:
+            return 0.0
+        swapped = key.copy()
+        swapped[a], swapped[b] = key[b], key[a]
+        counts = self._counts[rows]
+        return float(((self._log_probs(swapped, rows) - self._log_probs(key, rows)) * counts).sum())
+
+    def climb(self, key, patience):
+        """Hill climb from a key until `patience` consecutive swaps fail to improve it."""
+        score = self.score(key)
+        failures = 0
+        while failures < patience and not self._stop.is_set():
+            if not self.present:
+                return key, score
+            # b ranges over every key slot, so plaintext letters held by absent cipher letters come back into play
+            a, b = self._rng.choice(self.present), self._rng.randrange(25)
+            b += b >= a
+            delta = self.swap_delta(key, a, b)
+            self.iterations += 1
+            if delta > 0:
+                key = key.copy()
+                key[a], key[b] = key[b], key[a]
+                score += delta
+                failures = 0
+                self._publish(key, score)
+            else:
+                failures += 1
+        return key, score
+
+    def _publish(self, key, score):
+        with self._lock:
+            if score > self.best_score:
+                self.best_key, self.best_score = key, score
+                self.version += 1
+
+    def run(self, restarts=20, patience=2000):
+        """Climb from the frequency key, then from shuffled keys, keeping the global best."""
+        key = self._initial_key
+        for _ in range(restarts):
+            if self._stop.is_set():
+                break
+            self.climb(key, patience)
+            key = np.array(self._rng.sample(range(26), 26), dtype=np.intp)
+
+    def start(self, restarts=20, patience=2000):
+        """Run the solver in a daemon thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, args=(restarts, patience), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def snapshot(self):
+        """Return (version, substitutions, score) for the best key found so far."""
+        with self._lock:
+            key, score, version = self.best_key, self.best_score, self.version
+        substitutions = {LETTERS[cipher]: LETTERS[key[cipher]] for cipher in self.present}
+        return version, substitutions, score
@@ -0,0 +1,68 @@
+"""
+Throughput comparison between the original matrix-scanning Playfair functions and
+the precomputed digraph tables of PlayfairCipher.
+
+Run from the repository root:
+    python -m lab_3.benchmark --sizes 1KB,100KB,1MB
+"""
+import argparse
+import random
+import time
+
+from benchmarks.corpus import SEED, parse_size
+from lab_3.main import PlayfairCipher, create_cipher_matrix, prepare_text
+
+KEY = 'PLAYFAIREXAMPLE'
+PLAIN_LETTERS = 'ABCDEFGHIKLMNOPQRSTUVWXYZ'
+
+
+def legacy_encrypt_pair(pair, matrix):
+    """The original pair encryption that scans the matrix for each letter."""
+    row1, col1 = next((i, j) for i in range(6) for j in range(5) if matrix[i][j] == pair[0])
+    row2, col2 = next((i, j) for i in range(6) for j in range(5) if matrix[i][j] == pair[1])
+
+    if row1 == row2:
+        return matrix[row1][(col1 + 1) % 5] + matrix[row2][(col2 + 1) % 5]
+    elif col1 == col2:
+        return matrix[(row1 + 1) % 6][col1] + matrix[(row2 + 1) % 6][col2]
+    else:
+        return matrix[row1][col2] + matrix[row2][col1]
+
+
+def legacy_encrypt_message(plaintext, key):
+    """The original message encryption that rebuilds the matrix on every call."""
+    matrix = create_cipher_matrix(key)
+    return ''.join(legacy_encrypt_pair(pair, matrix) for pair in prepare_text(plaintext))
+
+
+def make_text(size, seed=SEED):
+    """Build a reproducible plaintext without the letter J."""
+    rng = random.Random(seed)
+    return ''.join(rng.choices(PLAIN_LETTERS + ' ', k=size))
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Playfair cipher implementations.")
+    parser.add_argument('--sizes', default='1KB,100KB,1MB', help="comma separated input sizes")
+    args = parser.parse_args()
+
+    print(f"{'size':>10} {'legacy MB/s':>12} {'table MB/s':>12} {'speedup':>9} {'table build ms':>15}")
+    for size in (parse_size(s) for s in args.sizes.split(',')):
+        text = make_text(size)
+        megabytes = size / (1 << 20)
+        build_time = measure(PlayfairCipher, KEY)
+        cipher = PlayfairCipher(KEY)
+        table_time = measure(cipher.encrypt, text)
+        legacy_time = measure(legacy_encrypt_message, text, KEY)
+        print(f"{size:>10} {megabytes / legacy_time:12.2f} {megabytes / table_time:12.2f} "
+              f"{legacy_time / table_time:8.1f}x {build_time * 1000:15.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,76 +1,182 @@
-import string
+import os
+import sys
+from functools import lru_cache
+from itertools import accumulate
 
-def prepare_text(text):
+if not __package__:
+    # Run as a script (python lab_3/main.py): make the repository root importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ciphers.alphabet import PLAYFAIR
+
+# The 30 letters of the 6x5 matrix: the English alphabet without J plus the Romanian letters
+MATRIX_LETTERS = PLAYFAIR.letters
+COLUMNS = 5
+
+def clean_text(text, alphabet=PLAYFAIR):
+    """
+    Convert the text to uppercase, fold merged letters (J into I) and remove every character that is not a supported letter.
+    """
+    return alphabet.clean(text)
+
+def prepare_text(text, alphabet=PLAYFAIR):
     """
     Prepare the plaintext for encryption by converting it to uppercase, removing non-alphabetic characters,
     and splitting it into pairs of letters.
     """
-    text = ''.join(c for c in text.upper() if c in string.ascii_letters + 'ȘȚĂÎÂ')
+    text = clean_text(text, alphabet)
     text = [text[i:i+2] for i in range(0, len(text), 2)]
-    if len(text[-1]) == 1:
+    if text and len(text[-1]) == 1:
         text[-1] += 'X'
     return text
 
-def create_cipher_matrix(key):
+def create_cipher_matrix(key, alphabet=PLAYFAIR):
     """
-    Construct the 6x5 cipher matrix from the given key.
+    Construct the cipher matrix (6x5 for the default alphabet) from the given key.
     """
-    key = ''.join(c for c in key.upper() if c in string.ascii_letters + 'ȘȚĂÎÂ')
-    key = ''.join(dict.fromkeys(key))  # Remove duplicate letters
-    alphabet = [c for c in string.ascii_uppercase + 'ȘȚĂÎÂ' if c != 'J']
-    matrix = []
-    for char in key + ''.join(alphabet):
-        if char not in matrix:
-            matrix.append(char)
-    return [matrix[i:i+5] for i in range(0, len(matrix), 5)]
+    if len(alphabet) % COLUMNS:
+        raise ValueError(f"The alphabet must have a multiple of {COLUMNS} letters.")
+    letters = alphabet.keyed_letters(key)
+    return [list(letters[i:i+COLUMNS]) for i in range(0, len(letters), COLUMNS)]
 
-def encrypt_pair(pair, matrix):
+def locate(matrix):
     """
-    Encrypt a pair of letters using the Playfair cipher algorithm.
+    Map every letter of the cipher matrix to its (row, column) coordinates.
+    """
+    return {char: (row, col) for row, line in enumerate(matrix) for col, char in enumerate(line)}
+
+def transform_pair(pair, matrix, positions, step):
+    """
+    Apply the Playfair rules to a pair of letters, moving right/down for step 1 and left/up for step -1.
     """
-    row1, col1 = next((i, j) for i in range(6) for j in range(5) if matrix[i][j] == pair[0])
-    row2, col2 = next((i, j) for i in range(6) for j in range(5) if matrix[i][j] == pair[1])
+    row1, col1 = positions[pair[0]]
+    row2, col2 = positions[pair[1]]
+    rows, columns = len(matrix), len(matrix[0])
 
     if row1 == row2:
-        return matrix[row1][(col1 + 1) % 5] + matrix[row2][(col2 + 1) % 5]
+        return matrix[row1][(col1 + step) % columns] + matrix[row2][(col2 + step) % columns]
     elif col1 == col2:
-        return matrix[(row1 + 1) % 6][col1] + matrix[(row2 + 1) % 6][col2]
+        return matrix[(row1 + step) % rows][col1] + matrix[(row2 + step) % rows][col2]
     else:
         return matrix[row1][col2] + matrix[row2][col1]
 
-def encrypt_message(plaintext, key):
+def encrypt_pair(pair, matrix, positions=None):
     """
-    Encrypt the plaintext using the Playfair cipher algorithm with the given key.
+    Encrypt a pair of letters using the Playfair cipher algorithm.
     """
-    matrix = create_cipher_matrix(key)
-    ciphertext = []
-    for pair in prepare_text(plaintext):
-        ciphertext.append(encrypt_pair(pair, matrix))
-    return ''.join(ciphertext)
+    return transform_pair(pair, matrix, positions or locate(matrix), 1)
 
-def decrypt_pair(pair, matrix):
+def decrypt_pair(pair, matrix, positions=None):
     """
     Decrypt a pair of letters using the Playfair cipher algorithm.
     """
-    row1, col1 = next((i, j) for i in range(6) for j in range(5) if matrix[i][j] == pair[0])
-    row2, col2 = next((i, j) for i in range(6) for j in range(5) if matrix[i][j] == pair[1])
+    return transform_pair(pair, matrix, positions or locate(matrix), -1)
 
-    if row1 == row2:
-        return matrix[row1][(col1 - 1) % 5] + matrix[row2][(col2 - 1) % 5]
-    elif col1 == col2:
-        return matrix[(row1 - 1) % 6][col1] + matrix[(row2 - 1) % 6][col2]
-    else:
-        return matrix[row1][col2] + matrix[row2][col1]
+class PlayfairCipher:
+    """
+    Playfair cipher for a fixed key with every digraph precomputed in both directions.
+    """
+
+    def __init__(self, key, alphabet=PLAYFAIR):
+        self.alphabet = alphabet
+        self.matrix = create_cipher_matrix(key, alphabet)
+        self.positions = locate(self.matrix)
+        letters = list(self.positions)
+        self.encrypt_table = {a + b: encrypt_pair(a + b, self.matrix, self.positions) for a in letters for b in letters}
+        self.decrypt_table = {a + b: decrypt_pair(a + b, self.matrix, self.positions) for a in letters for b in letters}
+
+    def encrypt(self, plaintext):
+        """
+        Encrypt the whole plaintext in a single digraph-lookup pass.
+        """
+        return self._lookup(prepare_text(plaintext, self.alphabet), self.encrypt_table)
+
+    def decrypt(self, ciphertext):
+        """
+        Decrypt the whole ciphertext in a single digraph-lookup pass.
+        """
+        return self._lookup(self._pairs(ciphertext), self.decrypt_table).replace('X', '')
+
+    def encrypt_stream(self, chunks):
+        """
+        Encrypt an iterable of plaintext chunks, yielding ciphertext chunks.
+        An odd letter left at the end of a chunk is carried into the next one, so the joined output
+        equals encrypt() on the joined input.
+        """
+        leftover = ''
+        for chunk in chunks:
+            letters = leftover + clean_text(chunk, self.alphabet)
+            cut = len(letters) - len(letters) % 2
+            leftover = letters[cut:]
+            if cut:
+                yield self._lookup(self._pairs(letters[:cut]), self.encrypt_table)
+        if leftover:
+            yield self.encrypt_table[leftover + 'X']
+
+    def decrypt_stream(self, chunks):
+        """
+        Decrypt an iterable of ciphertext chunks, yielding plaintext chunks. Whitespace is ignored.
+        """
+        leftover = ''
+        for chunk in chunks:
+            letters = leftover + ''.join(chunk.split())
+            cut = len(letters) - len(letters) % 2
+            leftover = letters[cut:]
+            if cut:
+                yield self._lookup(self._pairs(letters[:cut]), self.decrypt_table).replace('X', '')
+        if leftover:
+            raise ValueError("Ciphertext must contain an even number of letters.")
+
+    def encrypt_records(self, records):
+        """
+        Encrypt a list of independent str records, each padded on its own, with one
+        cleaning pass and one digraph-lookup pass over the whole batch.
+        """
+        padded = [text + 'X' if len(text) % 2 else text for text in self.alphabet.clean_records(records)]
+        ciphertext = self._lookup(self._pairs(''.join(padded)), self.encrypt_table)
+        return self._split(ciphertext, map(len, padded))
+
+    def decrypt_records(self, records):
+        """Decrypt a list of independent str records in one digraph-lookup pass."""
+        if any(len(record) % 2 for record in records):
+            raise ValueError("Ciphertext must contain an even number of letters.")
+        plaintext = self._lookup(self._pairs(''.join(records)), self.decrypt_table)
+        return [text.replace('X', '') for text in self._split(plaintext, map(len, records))]
+
+    @staticmethod
+    def _split(text, lengths):
+        bounds = list(accumulate(lengths, initial=0))
+        return [text[start:end] for start, end in zip(bounds, bounds[1:])]
+
+    @staticmethod
+    def _pairs(letters):
+        return [letters[i:i+2] for i in range(0, len(letters), 2)]
+
+    @staticmethod
+    def _lookup(pairs, table):
+        try:
+            return ''.join(map(table.__getitem__, pairs))
+        except KeyError as error:
+            raise ValueError(f"Pair {error.args[0]!r} cannot be formed from the cipher matrix.") from None
+
+@lru_cache(maxsize=64)
+def get_cipher(key, alphabet=PLAYFAIR):
+    """
+    Return the cached PlayfairCipher for the given key and alphabet.
+    """
+    return PlayfairCipher(key, alphabet)
+
+def encrypt_message(plaintext, key):
+    """
+    Encrypt the plaintext using the Playfair cipher algorithm with the given key.
+    """
+    return get_cipher(key).encrypt(plaintext)
 
 def decrypt_message(ciphertext, key):
     """
     Decrypt the ciphertext using the Playfair cipher algorithm with the given key.
     """
-    matrix = create_cipher_matrix(key)
-    plaintext = []
-    for pair in [ciphertext[i:i+2] for i in range(0, len(ciphertext), 2)]:
-        plaintext.append(decrypt_pair(pair, matrix))
-    return ''.join(plaintext).replace('X', '')
+    return get_cipher(key).decrypt(ciphertext)
 
 if __name__ == "__main__":
     print("Welcome to the Playfair Cipher!")
@@ -0,0 +1,170 @@
+"""
+Memory-mapped n-gram language-model store.
+
+A store holds log10-probability tables for n = 1..4 over one alphabet in a single
+binary file. Each table is a flat little-endian float32 array of N**n entries indexed
+by the base-N code of the n-gram (N = 26 for English, 31 for Romanian), aligned so it
+can be opened with numpy.memmap: loading reads only the JSON header, the pages are
+shared by every process that maps the same file, and scoring a text is one gather-and-sum
+over its n-gram codes. Stores pickle as their path, so pool workers map the file
+instead of receiving a copy of the tables.
+
+Corpora are counted in chunks, so they need not fit in memory. Letters are folded
+through the store's Alphabet (J onto I for the Playfair alphabet, Ş onto Ș, ...).
+
+Run from the repository root:
+    python -m lab_3.ngrams build english.txt -o english.ngrams --alphabet english
+    python -m lab_3.ngrams build romanian.txt -o romanian.ngrams --alphabet romanian
+    python -m lab_3.ngrams info english.ngrams
+"""
+import argparse
+import json
+import struct
+
+import numpy as np
+
+from ciphers.alphabet import ALPHABETS, Alphabet
+
+MAGIC = b'NGRAMS1\n'
+ALIGNMENT = 64
+ORDERS = (1, 2, 3, 4)
+CHUNK_SIZE = 1 << 22  # characters of corpus counted at a time
+
+
+def ngram_codes(indices, n, size):
+    """Base-N codes of every overlapping n-gram of a letter index array."""
+    codes = indices[:len(indices) - n + 1].astype(np.intp)
+    for offset in range(1, n):
+        codes = codes * size + indices[offset:len(indices) - n + 1 + offset]
+    return codes
+
+
+class NgramStore:
+    """
+    Read-only n-gram tables over one alphabet, usually memory-mapped from a file.
+    """
+
+    def __init__(self, tables, alphabet, path=None):
+        self.alphabet = alphabet
+        self.letters = alphabet.letters
+        self.size = len(alphabet)
+        self.tables = tables  # n -> float32 array of size**n log10 probabilities
+        self.path = path
+
+    @property
+    def orders(self):
+        return sorted(self.tables)
+
+    def __reduce__(self):
+        if self.path is not None:
+            return NgramStore.load, (self.path,)
+        return NgramStore, (self.tables, self.alphabet)
+
+    @classmethod
+    def build(cls, texts, alphabet, orders=ORDERS, floor=0.01):
+        """
+        Count the n-grams of an iterable of text chunks; unseen n-grams get a count of `floor`.
+        N-grams spanning two chunks are counted as if the text were continuous.
+        """
+        size = len(alphabet)
+        counts = {n: np.zeros(size ** n, dtype=np.int64) for n in orders}
+        keep = max(orders) - 1
+        carry = np.zeros(0, dtype=np.intp)
+        for text in texts:
+            indices = np.concatenate((carry, np.frombuffer(alphabet.indices(text), dtype=np.uint8)))
+            for n in orders:
+                # Skip the n-grams that lie entirely inside the carried letters, already counted
+                start = max(len(carry) - n + 1, 0)
+                counts[n] += np.bincount(ngram_codes(indices[start:], n, size), minlength=size ** n)
+            carry = indices[max(len(indices) - keep, 0):]
+        tables = {}
+        for n, table in counts.items():
+            total = max(table.sum(), 1)
+            tables[n] = np.log10(np.maximum(table, floor) / total).astype('<f4')
+        return cls(tables, alphabet)
+
+    def save(self, path):
+        header = {'letters': self.letters, 'merge': self.alphabet.merge, 'tables': {}}
+        offset = 0
+        for n in self.orders:
+            header['tables'][str(n)] = offset
+            offset += -(-self.tables[n].nbytes // ALIGNMENT) * ALIGNMENT
+        encoded = json.dumps(header, ensure_ascii=False).encode('utf-8')
+        start = -(-(len(MAGIC) + 4 + len(encoded)) // ALIGNMENT) * ALIGNMENT
+        with open(path, 'wb') as handle:
+            handle.write(MAGIC + struct.pack('<I', len(encoded)) + encoded)
+            for n in self.orders:
+                handle.seek(start + header['tables'][str(n)])
+                handle.write(np.ascontiguousarray(self.tables[n], dtype='<f4').tobytes())
+            handle.truncate(start + offset)
+
+    @classmethod
+    def load(cls, path):
+        """Open a store file; the tables are memory-mapped read-only, not read."""
+        with open(path, 'rb') as handle:
+            if handle.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not an n-gram store.")
+            (length,) = struct.unpack('<I', handle.read(4))
+            header = json.loads(handle.read(length).decode('utf-8'))
+        start = -(-(len(MAGIC) + 4 + length) // ALIGNMENT) * ALIGNMENT
+        alphabet = Alphabet(header['letters'], header['merge'])
+        size = len(alphabet)
+        tables = {int(n): np.memmap(path, dtype='<f4', mode='r', offset=start + offset, shape=(size ** int(n),))
+                  for n, offset in header['tables'].items()}
+        return cls(tables, alphabet, path)
+
+    def encode(self, text):
+        """Letter indices of a text as an intp array, dropping everything outside the alphabet."""
+        return np.frombuffer(self.alphabet.indices(text), dtype=np.uint8).astype(np.intp)
+
+    def codes(self, indices, n=4):
+        return ngram_codes(indices, n, self.size)
+
+    def score_indices(self, indices, n=4):
+        """Total log10 probability of a letter index array under the order-n table."""
+        return float(self.tables[n][self.codes(indices, n)].sum())
+
+    def score(self, text, n=4):
+        """Total log10 probability of a text under the order-n table."""
+        return self.score_indices(self.encode(text), n)
+
+
+def iter_corpus(paths, chunk_size=CHUNK_SIZE):
+    for path in paths:
+        with open(path, encoding='utf-8', errors='ignore') as handle:
+            while True:
+                chunk = handle.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        yield ' '  # keep files apart, as joining them with a space did
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect a memory-mapped n-gram store.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help="count the n-grams of local corpora")
+    build.add_argument('corpus', nargs='+', help="UTF-8 corpus files")
+    build.add_argument('-o', '--output', required=True, help="output store file")
+    build.add_argument('--alphabet', choices=sorted(ALPHABETS), default='english', help="alphabet of the tables")
+    build.add_argument('--orders', default='1,2,3,4', help="comma-separated n-gram lengths")
+    info = subparsers.add_parser('info', help="describe a store file")
+    info.add_argument('store')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        orders = sorted({int(n) for n in args.orders.split(',')})
+        if not orders or orders[0] < 1 or orders[-1] > 4:
+            parser.error("Orders must be between 1 and 4.")
+        store = NgramStore.build(iter_corpus(args.corpus), ALPHABETS[args.alphabet], orders)
+        store.save(args.output)
+        print(f"Saved {store.size}-letter n-gram store (n = {', '.join(map(str, orders))}) to {args.output}")
+    else:
+        store = NgramStore.load(args.store)
+        print(f"alphabet {store.letters} ({store.size} letters)")
+        for n in store.orders:
+            print(f"n={n}  {store.tables[n].size:>10,} entries  floor {store.tables[n].min():.2f}")
+
+
+if __name__ == '__main__':
+    main()
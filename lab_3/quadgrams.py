@@ -0,0 +1,122 @@
+"""
+Quadgram log-probability tables used to score candidate plaintexts.
+
+A table for an alphabet of N letters is a flat float32 NumPy array of N**4 log10
+probabilities, indexed by the base-N code of the quadgram, so scoring a text is a
+single gather-and-sum over its quadgram codes. Tables load from .npz files or, memory-mapped
+and shared between processes, from the n-gram stores of lab_3.ngrams.
+
+Build a table from a local corpus (run from the repository root):
+    python -m lab_3.quadgrams english.txt -o english.npz
+    python -m lab_3.quadgrams romanian.txt -o romanian.npz
+"""
+import argparse
+
+import numpy as np
+
+from ciphers.alphabet import ALPHABETS, Alphabet
+from lab_3.main import MATRIX_LETTERS
+from lab_3.ngrams import MAGIC, NgramStore, ngram_codes
+
+# Letters folded onto others when the table's alphabet has the target but not the source
+FOLDING = {'J': 'I', 'Ş': 'Ș', 'Ţ': 'Ț'}
+
+
+def fold_alphabet(letters):
+    for alphabet in ALPHABETS.values():
+        if alphabet.letters == letters:
+            return alphabet
+    return Alphabet(letters, {source: target for source, target in FOLDING.items()
+                              if target in letters and source not in letters})
+
+
+class QuadgramTable:
+    """
+    Flat quadgram log10-probability table over a fixed alphabet.
+    """
+
+    def __init__(self, log_probs, letters=MATRIX_LETTERS, path=None):
+        self.alphabet = fold_alphabet(letters)
+        self.letters = self.alphabet.letters
+        self.size = len(self.letters)
+        if log_probs.shape != (self.size ** 4,):
+            raise ValueError(f"Expected {self.size ** 4} quadgram entries, got {log_probs.shape}.")
+        self.log_probs = log_probs
+        self.path = path  # n-gram store the table is mapped from, if any
+
+    def __reduce__(self):
+        # A mapped table travels to pool workers as its path, so they share the file's pages
+        if self.path is not None:
+            return QuadgramTable.load, (self.path,)
+        return QuadgramTable, (self.log_probs, self.letters)
+
+    @classmethod
+    def from_text(cls, text, letters=MATRIX_LETTERS, floor=0.01):
+        """
+        Count the quadgrams of a corpus; unseen quadgrams get a count of `floor`.
+        """
+        store = NgramStore.build([text], fold_alphabet(letters), orders=(4,), floor=floor)
+        return cls(store.tables[4], letters)
+
+    @classmethod
+    def from_store(cls, store):
+        if 4 not in store.tables:
+            raise ValueError("The n-gram store has no quadgram table.")
+        return cls(store.tables[4], store.letters, store.path)
+
+    @classmethod
+    def load(cls, path):
+        """Load a .npz table, or memory-map the quadgrams of an n-gram store."""
+        with open(path, 'rb') as handle:
+            is_store = handle.read(len(MAGIC)) == MAGIC
+        if is_store:
+            return cls.from_store(NgramStore.load(path))
+        with np.load(path) as data:
+            return cls(data['log_probs'], ''.join(data['letters']))
+
+    def save(self, path):
+        np.savez(path, log_probs=self.log_probs, letters=np.array(list(self.letters)))
+
+    def encode(self, text):
+        """
+        Convert text into an array of letter indices, dropping everything outside the alphabet.
+        """
+        return np.frombuffer(self.alphabet.indices(text), dtype=np.uint8).astype(np.intp)
+
+    def codes(self, indices):
+        """
+        Base-N codes of every overlapping quadgram of an index array.
+        """
+        return ngram_codes(indices, 4, self.size)
+
+    def score_indices(self, indices):
+        """
+        Total log10 probability of an index array.
+        """
+        return float(self.log_probs[self.codes(indices)].sum())
+
+    def score(self, text):
+        """
+        Total log10 probability of a text.
+        """
+        return self.score_indices(self.encode(text))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a quadgram table from a text corpus.")
+    parser.add_argument('corpus', nargs='+', help="UTF-8 corpus files")
+    parser.add_argument('-o', '--output', required=True, help="output .npz file")
+    parser.add_argument('--letters', default=MATRIX_LETTERS, help="alphabet of the table")
+    args = parser.parse_args(argv)
+
+    text = []
+    for path in args.corpus:
+        with open(path, encoding='utf-8', errors='ignore') as handle:
+            text.append(handle.read())
+    table = QuadgramTable.from_text(' '.join(text), args.letters)
+    table.save(args.output)
+    print(f"Saved {table.size}-letter quadgram table to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
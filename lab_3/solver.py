@@ -0,0 +1,173 @@
+"""
+Ciphertext-only key recovery for the 6x5 Playfair cipher by simulated annealing.
+
+Candidate matrices are scored by decrypting the whole ciphertext with NumPy and
+summing quadgram log-probabilities from a QuadgramTable. Independent restarts run
+in parallel across cores.
+
+Run from the repository root:
+    python -m lab_3.solver -i ciphertext.txt --table english.npz --restarts 8
+"""
+import argparse
+import math
+import os
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from lab_3.main import MATRIX_LETTERS, clean_text, decrypt_message
+from lab_3.quadgrams import QuadgramTable
+
+Result = namedtuple('Result', ['score', 'key', 'iterations', 'seconds', 'history'])
+
+ROWS, COLS = 6, 5
+
+_table = None
+
+
+def decrypt_cells(positions, first, second):
+    """
+    Decrypt digraphs given as letter index arrays and return the plaintext cell arrays.
+    `positions` maps each letter index to its cell in the candidate matrix.
+    """
+    row1, col1 = np.divmod(positions[first], COLS)
+    row2, col2 = np.divmod(positions[second], COLS)
+    same_row = row1 == row2
+    same_col = (col1 == col2) & ~same_row
+    out1 = np.where(same_row, row1 * COLS + (col1 - 1) % COLS,
+                    np.where(same_col, (row1 - 1) % ROWS * COLS + col1, row1 * COLS + col2))
+    out2 = np.where(same_row, row2 * COLS + (col2 - 1) % COLS,
+                    np.where(same_col, (row2 - 1) % ROWS * COLS + col2, row2 * COLS + col1))
+    return out1, out2
+
+
+def score_grid(grid, table, first, second):
+    """
+    Quadgram score of the ciphertext decrypted with a matrix given as a cell -> letter index array.
+    """
+    positions = np.empty_like(grid)
+    positions[grid] = np.arange(len(grid))
+    out1, out2 = decrypt_cells(positions, first, second)
+    plain = np.empty(2 * len(first), dtype=np.intp)
+    plain[0::2] = grid[out1]
+    plain[1::2] = grid[out2]
+    return table.score_indices(plain)
+
+
+def mutate(grid, rng):
+    """
+    Return a neighbouring matrix: mostly a swap of two letters, sometimes a row/column
+    swap or a flip of the whole matrix.
+    """
+    child = grid.copy()
+    matrix = child.reshape(ROWS, COLS)
+    move = rng.random()
+    if move < 0.90:
+        a, b = rng.sample(range(len(child)), 2)
+        child[a], child[b] = child[b], child[a]
+    elif move < 0.94:
+        a, b = rng.sample(range(ROWS), 2)
+        matrix[[a, b]] = matrix[[b, a]]
+    elif move < 0.98:
+        a, b = rng.sample(range(COLS), 2)
+        matrix[:, [a, b]] = matrix[:, [b, a]]
+    elif move < 0.99:
+        matrix[:] = matrix[::-1].copy()
+    else:
+        matrix[:] = matrix[:, ::-1].copy()
+    return child
+
+
+def anneal(table, first, second, iterations, temperature, seed):
+    """
+    One simulated-annealing run with a linear cooling schedule.
+    """
+    rng = random.Random(seed)
+    current = np.array(rng.sample(range(len(table.letters)), len(table.letters)), dtype=np.intp)
+    current_score = score_grid(current, table, first, second)
+    best, best_score = current, current_score
+    history = [(0, 0.0, best_score)]
+    start = time.perf_counter()
+
+    for iteration in range(1, iterations + 1):
+        heat = temperature * (1 - iteration / iterations)
+        candidate = mutate(current, rng)
+        candidate_score = score_grid(candidate, table, first, second)
+        delta = candidate_score - current_score
+        if delta >= 0 or (heat > 0 and rng.random() < math.exp(delta / heat)):
+            current, current_score = candidate, candidate_score
+            if current_score > best_score:
+                best, best_score = current, current_score
+                history.append((iteration, time.perf_counter() - start, best_score))
+
+    key = ''.join(table.letters[i] for i in best)
+    return Result(best_score, key, iterations, time.perf_counter() - start, history)
+
+
+def _init_worker(table):
+    global _table
+    _table = table
+
+
+def _run_restart(first, second, iterations, temperature, seed):
+    return anneal(_table, first, second, iterations, temperature, seed)
+
+
+def solve(ciphertext, table, restarts=None, iterations=100_000, temperature=None, workers=None, seed=0):
+    """
+    Run independent annealing restarts in parallel and yield their results as they finish.
+    """
+    if table.letters != MATRIX_LETTERS:
+        raise ValueError("The quadgram table must use the Playfair matrix alphabet.")
+    letters = clean_text(ciphertext)
+    indices = table.encode(letters)
+    if len(indices) != len(letters) or len(indices) % 2:
+        raise ValueError("Ciphertext must be an even number of matrix letters.")
+    first, second = indices[0::2], indices[1::2]
+    if temperature is None:
+        # Empirical starting temperature for log10 quadgram scores, scaled with text length
+        temperature = 10 + 0.087 * max(len(indices) - 84, 0)
+    workers = workers or os.cpu_count()
+    restarts = restarts or workers
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(table,)) as pool:
+        futures = [pool.submit(_run_restart, first, second, iterations, temperature, seed + restart)
+                   for restart in range(restarts)]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recover a Playfair key from ciphertext alone.")
+    parser.add_argument('-i', '--input', required=True, help="ciphertext file")
+    parser.add_argument('--table', required=True, help="quadgram table from lab_3.quadgrams or n-gram store from lab_3.ngrams")
+    parser.add_argument('--restarts', type=int, default=None, help="independent runs (default: one per worker)")
+    parser.add_argument('--iterations', type=int, default=100_000, help="iterations per run")
+    parser.add_argument('--temperature', type=float, default=None, help="starting temperature")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--history', action='store_true', help="print best score over time for every run")
+    args = parser.parse_args(argv)
+
+    with open(args.input, encoding='utf-8') as handle:
+        ciphertext = handle.read()
+    table = QuadgramTable.load(args.table)
+
+    best = None
+    for result in solve(ciphertext, table, args.restarts, args.iterations, args.temperature, args.workers, args.seed):
+        print(f"score {result.score:12.2f}  {result.iterations / result.seconds:10,.0f} it/s  key {result.key}")
+        if args.history:
+            for iteration, seconds, score in result.history:
+                print(f"    {iteration:>10} {seconds:8.2f}s {score:12.2f}")
+        if best is None or result.score > best.score:
+            best = result
+
+    print(f"\nBest key: {best.key}")
+    print(f"Plaintext: {decrypt_message(clean_text(ciphertext), best.key)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Non-interactive streaming mode for the Playfair cipher.
+
+Text is read from a file or stdin in fixed-size chunks and encrypted with
+PlayfairCipher.encrypt_stream/decrypt_stream, so memory use stays constant and the
+output matches encrypt_message/decrypt_message on the whole input.
+
+Run from the repository root:
+    python -m lab_3.stream encrypt --key SECRETKEY -i message.txt -o message.enc
+    python -m lab_3.stream decrypt --key SECRETKEY < message.enc
+"""
+import argparse
+import io
+import os
+import sys
+
+from lab_3.main import get_cipher
+
+CHUNK_SIZE = 1 << 16
+
+
+def iter_text_chunks(stream, chunk_size=CHUNK_SIZE):
+    """Yield fixed-size text chunks from a text stream until it is exhausted."""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Stream files or stdin through the Playfair cipher.")
+    parser.add_argument('operation', choices=['encrypt', 'decrypt'])
+    parser.add_argument('--key', required=True, help="key of at least 7 characters")
+    parser.add_argument('-i', '--input', default='-', help="input file, '-' for stdin (default)")
+    parser.add_argument('-o', '--output', default='-', help="output file, '-' for stdout (default)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="characters per chunk")
+    args = parser.parse_args(argv)
+
+    if len(args.key) < 7:
+        parser.error("Key must be at least 7 characters long.")
+    if args.chunk_size <= 0:
+        parser.error("Chunk size must be positive.")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cipher = get_cipher(args.key)
+    transform = cipher.encrypt_stream if args.operation == 'encrypt' else cipher.decrypt_stream
+
+    if args.input == '-':
+        source = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
+    else:
+        source = open(args.input, encoding='utf-8')
+    if args.output == '-':
+        sink = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    else:
+        sink = open(args.output, 'w', encoding='utf-8')
+
+    try:
+        for chunk in transform(iter_text_chunks(source, args.chunk_size)):
+            sink.write(chunk)
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    except ValueError as error:
+        sys.exit(f"Error: {error}")
+    finally:
+        source.close()
+        sink.close()
+
+
+if __name__ == '__main__':
+    main()
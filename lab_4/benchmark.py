@@ -0,0 +1,89 @@
+"""
+DES benchmarks: key schedules per second for the original string-based permute
+versus the byte-indexed lookup tables in lab_4/des.py, and MB/s of the ECB, CBC
+and CTR modes on one core and on a process pool.
+
+Run from the repository root:
+    python -m lab_4.benchmark --keys 20000 --megabytes 1
+"""
+import argparse
+import os
+import random
+import time
+
+from lab_4.des import (PC1, PC2, SHIFTS, crypt_ctr, decrypt_ecb, encrypt_cbc, encrypt_ecb, key_schedule,
+                       self_test)
+
+
+def legacy_permute(key, permutation_table):
+    """The original permute over a string of '0'/'1' characters."""
+    return [key[permutation_table[i] - 1] for i in range(len(permutation_table))]
+
+
+def legacy_key_schedule(original_key):
+    """The original hex -> binary string -> PC-1 pipeline, extended with string shifts and PC-2."""
+    key_hex = ''.join([hex(ord(c))[2:].zfill(2) for c in original_key])
+    key_bin = bin(int(key_hex, 16))[2:].zfill(64)
+    permuted_key = ''.join(legacy_permute(key_bin, PC1))
+    c, d = permuted_key[:28], permuted_key[28:]
+    subkeys = []
+    for count in SHIFTS:
+        c, d = c[count:] + c[:count], d[count:] + d[:count]
+        subkeys.append(''.join(legacy_permute(c + d, PC2)))
+    return subkeys
+
+
+def benchmark_key_schedules(count):
+    rng = random.Random(1234)
+    keys = [''.join(chr(rng.randrange(32, 127)) for _ in range(8)) for _ in range(count)]
+    int_keys = [int.from_bytes(key.encode('latin-1'), 'big') for key in keys]
+    schedule = key_schedule.__wrapped__  # bypass the cache so every key is really derived
+
+    for legacy, fast in zip(keys[:100], int_keys[:100]):
+        assert [int(subkey, 2) for subkey in legacy_key_schedule(legacy)] == list(schedule(fast))
+
+    start = time.perf_counter()
+    for key in keys:
+        legacy_key_schedule(key)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in int_keys:
+        schedule(key)
+    table_time = time.perf_counter() - start
+
+    print(f"string permute: {count / legacy_time:12,.0f} key schedules/s")
+    print(f"lookup tables:  {count / table_time:12,.0f} key schedules/s  ({legacy_time / table_time:.1f}x)")
+
+
+def benchmark_modes(megabytes, workers):
+    data = random.Random(1234).randbytes(int(megabytes * (1 << 20)))
+    key, iv = b'8bytekey', bytes(8)
+    cases = [
+        ('ECB encrypt', lambda: encrypt_ecb(key, data)),
+        (f'ECB encrypt x{workers}', lambda: encrypt_ecb(key, data, workers)),
+        ('CBC encrypt', lambda: encrypt_cbc(key, iv, data)),
+        ('CTR', lambda: crypt_ctr(key, iv, data)),
+        (f'CTR x{workers}', lambda: crypt_ctr(key, iv, data, workers)),
+    ]
+    for name, run in cases:
+        start = time.perf_counter()
+        run()
+        print(f"{name:<16} {megabytes / (time.perf_counter() - start):8.3f} MB/s")
+    assert decrypt_ecb(key, encrypt_ecb(key, data, workers), workers) == data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the DES key schedule and block modes.")
+    parser.add_argument('--keys', type=int, default=20000, help="number of random keys")
+    parser.add_argument('--megabytes', type=float, default=1.0, help="buffer size for the mode benchmark")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="processes for the parallel modes")
+    args = parser.parse_args()
+
+    self_test()
+    benchmark_key_schedules(args.keys)
+    benchmark_modes(args.megabytes, args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+"""
+Bitsliced DES over NumPy uint64 arrays for bulk key search.
+
+Every one of the 64 state bits (and every key bit) is a "plane": an array of
+uint64 words where bit j of word w belongs to instance 64 * w + j. One pass of
+bitwise NumPy operations therefore encrypts 64 * len(plane) instances at once.
+Permutations, the expansion and the whole key schedule become plane re-indexing.
+Each S-box output bit is compiled into a multiplexer tree over its six input planes.
+
+Brute-force demo for 8-character keys with a known prefix (run from the repository root):
+    python -m lab_4.bitslice --prefix secre --plaintext 0123456789ABCDEF --workers 4
+"""
+import argparse
+import os
+import string
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from lab_4.des import E, FP, IP, P, PC1, PC2, S_BOXES, SHIFTS, create_subkeys, crypt_block, key_to_int
+
+ZERO, ONE = '0', '1'
+BIT_SHIFTS = np.arange(63, -1, -1, dtype=np.uint64)
+
+
+def compile_sbox(box):
+    """
+    Compile an S-box into a straight-line multiplexer program.
+    Returns (program, outputs): program steps are (select input, low, high) where low/high
+    are ZERO, ONE or the index of an earlier step; outputs are the steps of the 4 output bits.
+    """
+    program = []
+    memo = {}
+
+    def build(table, depth):
+        if not any(table):
+            return ZERO
+        if all(table):
+            return ONE
+        if table not in memo:
+            half = len(table) // 2
+            low, high = build(table[:half], depth + 1), build(table[half:], depth + 1)
+            if low == high:
+                memo[table] = low
+            else:
+                program.append((depth, low, high))
+                memo[table] = len(program) - 1
+        return memo[table]
+
+    outputs = []
+    for bit in range(4):
+        table = tuple(box[(v >> 4 & 2) | (v & 1)][v >> 1 & 15] >> (3 - bit) & 1 for v in range(64))
+        outputs.append(build(table, 0))
+    return program, outputs
+
+
+SBOX_PROGRAMS = [compile_sbox(box) for box in S_BOXES]
+
+
+def run_sbox(compiled, inputs, ones):
+    """Evaluate a compiled S-box on six input planes."""
+    program, outputs = compiled
+    steps = []
+    for select, low, high in program:
+        s = inputs[select]
+        if low == ZERO:
+            value = s if high == ONE else steps[high] & s
+        elif low == ONE:
+            value = s ^ ones if high == ZERO else steps[high] | (s ^ ones)
+        elif high == ZERO:
+            value = steps[low] & (s ^ ones)
+        elif high == ONE:
+            value = steps[low] | s
+        else:
+            a = steps[low]
+            value = a ^ ((a ^ steps[high]) & s)
+        steps.append(value)
+    return [steps[output] for output in outputs]
+
+
+def subkey_bit_indices():
+    """For each round, the key bit (0-indexed, MSB first) that feeds each of the 48 subkey bits."""
+    positions = [source - 1 for source in PC1]
+    c, d = positions[:28], positions[28:]
+    rounds = []
+    for count in SHIFTS:
+        c, d = c[count:] + c[:count], d[count:] + d[:count]
+        rounds.append([(c + d)[source - 1] for source in PC2])
+    return rounds
+
+
+SUBKEY_BITS = subkey_bit_indices()
+
+
+def encrypt_planes(key_planes, block_planes, ones):
+    """
+    DES on bitsliced planes. Works for any plane type with bitwise operators
+    (NumPy arrays or Python ints); `ones` is the all-ones plane.
+    """
+    state = [block_planes[source - 1] for source in IP]
+    left, right = state[:32], state[32:]
+    for round_bits in SUBKEY_BITS:
+        expanded = [right[source - 1] ^ key_planes[bit] for source, bit in zip(E, round_bits)]
+        substituted = []
+        for box in range(8):
+            substituted += run_sbox(SBOX_PROGRAMS[box], expanded[6 * box:6 * box + 6], ones)
+        left, right = right, [l ^ substituted[source - 1] for l, source in zip(left, P)]
+    preoutput = right + left
+    return [preoutput[source - 1] for source in FP]
+
+
+def bitslice(values):
+    """Transpose N 64-bit values into 64 planes of ceil(N / 64) uint64 words."""
+    values = np.asarray(values, dtype=np.uint64)
+    padded = -(-len(values) // 64) * 64
+    values = np.concatenate([values, np.zeros(padded - len(values), dtype=np.uint64)])
+    bits = ((values[:, None] >> BIT_SHIFTS) & np.uint64(1)).astype(np.uint8)
+    return list(np.ascontiguousarray(np.packbits(bits.T, axis=1, bitorder='little')).view('<u8'))
+
+
+def unbitslice(planes, count):
+    """Inverse of bitslice: 64 planes back into `count` 64-bit values."""
+    stacked = np.ascontiguousarray(np.stack(planes).astype('<u8')).view(np.uint8)
+    bits = np.unpackbits(stacked, axis=1, bitorder='little')[:, :count]
+    return np.packbits(np.ascontiguousarray(bits.T), axis=1).view('>u8').ravel().astype(np.uint64)
+
+
+def block_planes(block, words):
+    """Planes of a single block repeated across every lane."""
+    zeros, ones = np.zeros(words, dtype=np.uint64), np.full(words, np.uint64(0xFFFFFFFFFFFFFFFF))
+    return [ones if block >> (63 - bit) & 1 else zeros for bit in range(64)], ones
+
+
+def encrypt_many(keys, block):
+    """Encrypt one 64-bit block under every key of a uint64 array; returns the ciphertexts."""
+    key_planes = bitslice(keys)
+    plaintext, ones = block_planes(block, len(key_planes[0]))
+    return unbitslice(encrypt_planes(key_planes, plaintext, ones), len(keys))
+
+
+def search(keys, block, target):
+    """Return the keys of a uint64 array that encrypt `block` to `target`."""
+    key_planes = bitslice(keys)
+    plaintext, ones = block_planes(block, len(key_planes[0]))
+    match = ones
+    for bit, plane in enumerate(encrypt_planes(key_planes, plaintext, ones)):
+        match = match & (plane if target >> (63 - bit) & 1 else plane ^ ones)
+    lanes = np.flatnonzero(np.unpackbits(match.astype('<u8').view(np.uint8), bitorder='little')[:len(keys)])
+    return keys[lanes]
+
+
+def candidate_keys(prefix, charset, start, stop):
+    """Keys prefix + suffix for suffix numbers start..stop-1 written in base len(charset)."""
+    unknown = 8 - len(prefix)
+    base = len(charset)
+    digits = np.arange(start, stop, dtype=np.uint64)
+    keys = np.full(len(digits), np.uint64(int.from_bytes(prefix + bytes(unknown), 'big')))
+    symbols = np.frombuffer(charset, dtype=np.uint8).astype(np.uint64)
+    for position in range(unknown):
+        digits, digit = np.divmod(digits, np.uint64(base))
+        keys |= symbols[digit.astype(np.intp)] << np.uint64(8 * position)
+    return keys
+
+
+def _search_range(prefix, charset, block, target, start, stop, batch):
+    found = []
+    for offset in range(start, stop, batch):
+        keys = candidate_keys(prefix, charset, offset, min(offset + batch, stop))
+        found.extend(int(key) for key in search(keys, block, target))
+    return found
+
+
+def brute_force(prefix, charset, block, target, workers=1, batch=1 << 16):
+    """Search every key prefix + suffix over charset; returns (matching keys, keys tried, seconds)."""
+    total = len(charset) ** (8 - len(prefix))
+    start_time = time.perf_counter()
+    if workers <= 1:
+        found = _search_range(prefix, charset, block, target, 0, total, batch)
+    else:
+        step = -(-total // workers)
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(_search_range, prefix, charset, block, target, start, min(start + step, total), batch)
+                       for start in range(0, total, step)]
+            found = [key for future in futures for key in future.result()]
+    return found, total, time.perf_counter() - start_time
+
+
+def printable_charset():
+    """Printable ASCII without characters that only differ in the DES parity bit (which is ignored)."""
+    seen = {}
+    for char in string.printable.strip().encode('ascii'):
+        seen.setdefault(char & 0xFE, char)
+    return bytes(sorted(seen.values()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bitsliced DES brute force over 8-character keys with a known prefix.")
+    parser.add_argument('--prefix', required=True, help="known start of the 8-character key")
+    parser.add_argument('--key', help="full key used to produce the demo ciphertext (default: prefix padded with '~')")
+    parser.add_argument('--plaintext', default='0123456789ABCDEF', help="known plaintext block in hex")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="processes for the largest run")
+    parser.add_argument('--scaling', action='store_true', help="measure 1, 2, 4, ... workers up to --workers")
+    args = parser.parse_args(argv)
+
+    prefix = args.prefix.encode('latin-1')
+    key = (args.key or args.prefix.ljust(8, '~')).encode('latin-1')
+    block = int(args.plaintext, 16)
+    target = crypt_block(block, create_subkeys(key))
+    charset = printable_charset()
+
+    sample = np.array([key_to_int(key)], dtype=np.uint64)
+    assert int(encrypt_many(sample, block)[0]) == target, "bitsliced DES disagrees with lab_4.des"
+
+    counts = [args.workers]
+    if args.scaling:
+        counts = sorted({1 << i for i in range(args.workers.bit_length()) if 1 << i <= args.workers} | {args.workers})
+    baseline = None
+    for workers in counts:
+        found, total, seconds = brute_force(prefix, charset, block, target, workers)
+        rate = total / seconds
+        baseline = baseline or rate
+        print(f"{workers:>3} workers: {total:,} keys in {seconds:.2f}s  {rate:,.0f} keys/s  "
+              f"{rate / workers:,.0f} keys/s/core  scaling {rate / baseline:.2f}x")
+    for match in found:
+        print(f"Key found: {match.to_bytes(8, 'big')!r} (parity-equivalent keys also decrypt)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,369 @@
+"""
+Table-driven DES: key schedule, block cipher and ECB/CBC/CTR modes.
+
+Keys and intermediate values are plain integers. Every bit permutation is compiled
+into byte-indexed lookup tables: for each input byte position, a 256-entry table holds
+the output bits contributed by that byte. A permutation of an n-byte value is
+therefore n lookups OR-ed together instead of one string index per bit. The round
+function uses combined S-box/P-box tables (SP-boxes).
+
+Check the block cipher against the known-answer vectors from the repository root:
+    python -m lab_4.des
+"""
+import os
+import struct
+from functools import lru_cache
+
+# Permuted Choice 1 (PC-1): 64-bit key -> 56 bits (C0 || D0)
+PC1 = [
+    57, 49, 41, 33, 25, 17, 9,
+    1, 58, 50, 42, 34, 26, 18,
+    10, 2, 59, 51, 43, 35, 27,
+    19, 11, 3, 60, 52, 44, 36,
+    63, 55, 47, 39, 31, 23, 15,
+    7, 62, 54, 46, 38, 30, 22,
+    14, 6, 61, 53, 45, 37, 29,
+    21, 13, 5, 28, 20, 12, 4
+]
+
+# Permuted Choice 2 (PC-2): 56 bits (Cn || Dn) -> 48-bit round subkey
+PC2 = [
+    14, 17, 11, 24, 1, 5,
+    3, 28, 15, 6, 21, 10,
+    23, 19, 12, 4, 26, 8,
+    16, 7, 27, 20, 13, 2,
+    41, 52, 31, 37, 47, 55,
+    30, 40, 51, 45, 33, 48,
+    44, 49, 39, 56, 34, 53,
+    46, 42, 50, 36, 29, 32
+]
+
+# Left rotations applied to C and D before each of the 16 rounds
+SHIFTS = [1, 1, 2, 2, 2, 2, 2, 2, 1, 2, 2, 2, 2, 2, 2, 1]
+
+HALF_MASK = (1 << 28) - 1
+
+
+def compile_permutation(table, width):
+    """
+    Build byte-indexed lookup tables for a 1-indexed, MSB-first DES permutation table
+    applied to a `width`-bit value. Returns (shift, lookup) pairs, one per input byte.
+    """
+    size = len(table)
+    compiled = []
+    for byte in range(width // 8):
+        # Output bits set by each of the 8 input bits of this byte (bit 0 = least significant)
+        contributions = [0] * 8
+        for position, source in enumerate(table):
+            if (source - 1) // 8 == byte:
+                contributions[7 - (source - 1) % 8] |= 1 << (size - 1 - position)
+        lookup = [0] * 256
+        for value in range(1, 256):
+            lowest = value & -value
+            lookup[value] = lookup[value ^ lowest] | contributions[lowest.bit_length() - 1]
+        compiled.append((width - 8 * (byte + 1), lookup))
+    return compiled
+
+
+def permute(value, compiled):
+    """Apply a permutation compiled with compile_permutation to an integer."""
+    out = 0
+    for shift, lookup in compiled:
+        out |= lookup[value >> shift & 0xFF]
+    return out
+
+
+PC1_COMPILED = compile_permutation(PC1, 64)
+PC2_COMPILED = compile_permutation(PC2, 56)
+
+
+def key_to_int(key):
+    """Convert an 8-character (Latin-1) string, 8 bytes or an integer into a 64-bit key."""
+    if isinstance(key, int):
+        return key
+    if isinstance(key, str):
+        key = key.encode('latin-1')
+    if len(key) != 8:
+        raise ValueError("Key must be exactly 8 bytes long.")
+    return int.from_bytes(key, 'big')
+
+
+def rotate_left(half, count):
+    return (half << count | half >> (28 - count)) & HALF_MASK
+
+
+def iter_halves(permuted_key):
+    """Yield (Cn, Dn) for n = 1..16 from the 56-bit PC-1 output."""
+    c, d = permuted_key >> 28, permuted_key & HALF_MASK
+    for count in SHIFTS:
+        c, d = rotate_left(c, count), rotate_left(d, count)
+        yield c, d
+
+
+@lru_cache(maxsize=1024)
+def key_schedule(key):
+    """The 16 48-bit round subkeys K1..K16 of a 64-bit integer key."""
+    return tuple(permute(c << 28 | d, PC2_COMPILED) for c, d in iter_halves(permute(key, PC1_COMPILED)))
+
+
+def create_subkeys(original_key):
+    """Derive the 16 round subkeys of an 8-character key as integers."""
+    return key_schedule(key_to_int(original_key))
+
+
+def describe_subkeys(original_key):
+    """Debug view of the key schedule with every intermediate value as a hex or binary string."""
+    key = key_to_int(original_key)
+    permuted_key = permute(key, PC1_COMPILED)
+    halves = [(permuted_key >> 28, permuted_key & HALF_MASK)] + list(iter_halves(permuted_key))
+    return {
+        'key_hex': format(key, '016x'),
+        'key_bin': format(key, '064b'),
+        'permuted_key': format(permuted_key, '056b'),
+        'halves': [(format(c, '028b'), format(d, '028b')) for c, d in halves],
+        'subkeys': [format(subkey, '048b') for subkey in key_schedule(key)],
+    }
+
+
+# Initial permutation (IP) and its inverse (FP)
+IP = [
+    58, 50, 42, 34, 26, 18, 10, 2,
+    60, 52, 44, 36, 28, 20, 12, 4,
+    62, 54, 46, 38, 30, 22, 14, 6,
+    64, 56, 48, 40, 32, 24, 16, 8,
+    57, 49, 41, 33, 25, 17, 9, 1,
+    59, 51, 43, 35, 27, 19, 11, 3,
+    61, 53, 45, 37, 29, 21, 13, 5,
+    63, 55, 47, 39, 31, 23, 15, 7
+]
+
+FP = [
+    40, 8, 48, 16, 56, 24, 64, 32,
+    39, 7, 47, 15, 55, 23, 63, 31,
+    38, 6, 46, 14, 54, 22, 62, 30,
+    37, 5, 45, 13, 53, 21, 61, 29,
+    36, 4, 44, 12, 52, 20, 60, 28,
+    35, 3, 43, 11, 51, 19, 59, 27,
+    34, 2, 42, 10, 50, 18, 58, 26,
+    33, 1, 41, 9, 49, 17, 57, 25
+]
+
+# Expansion (E): 32-bit half block -> 48 bits
+E = [
+    32, 1, 2, 3, 4, 5,
+    4, 5, 6, 7, 8, 9,
+    8, 9, 10, 11, 12, 13,
+    12, 13, 14, 15, 16, 17,
+    16, 17, 18, 19, 20, 21,
+    20, 21, 22, 23, 24, 25,
+    24, 25, 26, 27, 28, 29,
+    28, 29, 30, 31, 32, 1
+]
+
+# Permutation (P) applied to the S-box outputs
+P = [
+    16, 7, 20, 21, 29, 12, 28, 17,
+    1, 15, 23, 26, 5, 18, 31, 10,
+    2, 8, 24, 14, 32, 27, 3, 9,
+    19, 13, 30, 6, 22, 11, 4, 25
+]
+
+S_BOXES = [
+    [[14, 4, 13, 1, 2, 15, 11, 8, 3, 10, 6, 12, 5, 9, 0, 7],
+     [0, 15, 7, 4, 14, 2, 13, 1, 10, 6, 12, 11, 9, 5, 3, 8],
+     [4, 1, 14, 8, 13, 6, 2, 11, 15, 12, 9, 7, 3, 10, 5, 0],
+     [15, 12, 8, 2, 4, 9, 1, 7, 5, 11, 3, 14, 10, 0, 6, 13]],
+    [[15, 1, 8, 14, 6, 11, 3, 4, 9, 7, 2, 13, 12, 0, 5, 10],
+     [3, 13, 4, 7, 15, 2, 8, 14, 12, 0, 1, 10, 6, 9, 11, 5],
+     [0, 14, 7, 11, 10, 4, 13, 1, 5, 8, 12, 6, 9, 3, 2, 15],
+     [13, 8, 10, 1, 3, 15, 4, 2, 11, 6, 7, 12, 0, 5, 14, 9]],
+    [[10, 0, 9, 14, 6, 3, 15, 5, 1, 13, 12, 7, 11, 4, 2, 8],
+     [13, 7, 0, 9, 3, 4, 6, 10, 2, 8, 5, 14, 12, 11, 15, 1],
+     [13, 6, 4, 9, 8, 15, 3, 0, 11, 1, 2, 12, 5, 10, 14, 7],
+     [1, 10, 13, 0, 6, 9, 8, 7, 4, 15, 14, 3, 11, 5, 2, 12]],
+    [[7, 13, 14, 3, 0, 6, 9, 10, 1, 2, 8, 5, 11, 12, 4, 15],
+     [13, 8, 11, 5, 6, 15, 0, 3, 4, 7, 2, 12, 1, 10, 14, 9],
+     [10, 6, 9, 0, 12, 11, 7, 13, 15, 1, 3, 14, 5, 2, 8, 4],
+     [3, 15, 0, 6, 10, 1, 13, 8, 9, 4, 5, 11, 12, 7, 2, 14]],
+    [[2, 12, 4, 1, 7, 10, 11, 6, 8, 5, 3, 15, 13, 0, 14, 9],
+     [14, 11, 2, 12, 4, 7, 13, 1, 5, 0, 15, 10, 3, 9, 8, 6],
+     [4, 2, 1, 11, 10, 13, 7, 8, 15, 9, 12, 5, 6, 3, 0, 14],
+     [11, 8, 12, 7, 1, 14, 2, 13, 6, 15, 0, 9, 10, 4, 5, 3]],
+    [[12, 1, 10, 15, 9, 2, 6, 8, 0, 13, 3, 4, 14, 7, 5, 11],
+     [10, 15, 4, 2, 7, 12, 9, 5, 6, 1, 13, 14, 0, 11, 3, 8],
+     [9, 14, 15, 5, 2, 8, 12, 3, 7, 0, 4, 10, 1, 13, 11, 6],
+     [4, 3, 2, 12, 9, 5, 15, 10, 11, 14, 1, 7, 6, 0, 8, 13]],
+    [[4, 11, 2, 14, 15, 0, 8, 13, 3, 12, 9, 7, 5, 10, 6, 1],
+     [13, 0, 11, 7, 4, 9, 1, 10, 14, 3, 5, 12, 2, 15, 8, 6],
+     [1, 4, 11, 13, 12, 3, 7, 14, 10, 15, 6, 8, 0, 5, 9, 2],
+     [6, 11, 13, 8, 1, 4, 10, 7, 9, 5, 0, 15, 14, 2, 3, 12]],
+    [[13, 2, 8, 4, 6, 15, 11, 1, 10, 9, 3, 14, 5, 0, 12, 7],
+     [1, 15, 13, 8, 10, 3, 7, 4, 12, 5, 6, 11, 0, 14, 9, 2],
+     [7, 11, 4, 1, 9, 12, 14, 2, 0, 6, 10, 13, 15, 3, 5, 8],
+     [2, 1, 14, 7, 4, 10, 8, 13, 15, 12, 9, 0, 3, 5, 6, 11]]
+]
+
+
+def compile_sp_boxes():
+    """
+    Combine every S-box with the P permutation: SP[i][v] is P applied to the 4-bit
+    output of S-box i for the 6-bit input v, already placed in its 32-bit position.
+    """
+    p_compiled = compile_permutation(P, 32)
+    sp_boxes = []
+    for index, box in enumerate(S_BOXES):
+        table = []
+        for value in range(64):
+            row = (value >> 4 & 2) | (value & 1)
+            column = value >> 1 & 15
+            table.append(permute(box[row][column] << (28 - 4 * index), p_compiled))
+        sp_boxes.append(table)
+    return sp_boxes
+
+
+IP_COMPILED = compile_permutation(IP, 64)
+FP_COMPILED = compile_permutation(FP, 64)
+E_COMPILED = compile_permutation(E, 32)
+SP_BOXES = compile_sp_boxes()
+
+BLOCK_SIZE = 8
+PARALLEL_THRESHOLD = 1 << 16  # blocks; smaller buffers are not worth the process start-up
+
+
+def crypt_block(block, subkeys):
+    """Run the 16 Feistel rounds on a 64-bit integer block; pass reversed subkeys to decrypt."""
+    sp0, sp1, sp2, sp3, sp4, sp5, sp6, sp7 = SP_BOXES
+    block = permute(block, IP_COMPILED)
+    left, right = block >> 32, block & 0xFFFFFFFF
+    for subkey in subkeys:
+        e = permute(right, E_COMPILED) ^ subkey
+        f = (sp0[e >> 42] | sp1[e >> 36 & 63] | sp2[e >> 30 & 63] | sp3[e >> 24 & 63] |
+             sp4[e >> 18 & 63] | sp5[e >> 12 & 63] | sp6[e >> 6 & 63] | sp7[e & 63])
+        left, right = right, left ^ f
+    return permute(right << 32 | left, FP_COMPILED)
+
+
+def encrypt_block(block, key):
+    """Encrypt one 64-bit integer block with a key accepted by key_to_int."""
+    return crypt_block(block, create_subkeys(key))
+
+
+def decrypt_block(block, key):
+    """Decrypt one 64-bit integer block with a key accepted by key_to_int."""
+    return crypt_block(block, create_subkeys(key)[::-1])
+
+
+def pad(data):
+    """PKCS#7 padding to a multiple of the block size."""
+    count = BLOCK_SIZE - len(data) % BLOCK_SIZE
+    return bytes(data) + bytes([count]) * count
+
+
+def unpad(data):
+    count = data[-1] if data else 0
+    if not 1 <= count <= BLOCK_SIZE or data[-count:] != bytes([count]) * count:
+        raise ValueError("Invalid padding.")
+    return data[:-count]
+
+
+def to_blocks(data):
+    return struct.unpack(f'>{len(data) // BLOCK_SIZE}Q', data)
+
+
+def from_blocks(blocks):
+    return struct.pack(f'>{len(blocks)}Q', *blocks)
+
+
+def _ecb_segment(data, subkeys):
+    return from_blocks([crypt_block(block, subkeys) for block in to_blocks(data)])
+
+
+def _ctr_segment(data, subkeys, counter):
+    blocks = len(data) // BLOCK_SIZE + (len(data) % BLOCK_SIZE > 0)
+    keystream = from_blocks([crypt_block((counter + i) & 0xFFFFFFFFFFFFFFFF, subkeys) for i in range(blocks)])
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(keystream[:len(data)], 'big')).to_bytes(len(data), 'big')
+
+
+def _run_segments(function, data, subkeys, workers, with_counter=None):
+    """Split block-aligned data into one segment per worker and run them in a process pool."""
+    blocks = -(-len(data) // BLOCK_SIZE)
+    workers = workers or os.cpu_count()
+    if workers <= 1 or blocks < PARALLEL_THRESHOLD:
+        args = (data, subkeys) if with_counter is None else (data, subkeys, with_counter)
+        return function(*args)
+
+    from concurrent.futures import ProcessPoolExecutor  # deferred: only large parallel jobs need it
+
+    per_segment = -(-blocks // workers) * BLOCK_SIZE
+    starts = range(0, len(data), per_segment)
+    segments = [data[start:start + per_segment] for start in starts]
+    extra = [] if with_counter is None else [[with_counter + start // BLOCK_SIZE for start in starts]]
+    with ProcessPoolExecutor(workers) as pool:
+        return b''.join(pool.map(function, segments, [subkeys] * len(segments), *extra))
+
+
+def encrypt_ecb(key, data, workers=1):
+    """ECB encryption with PKCS#7 padding; workers > 1 (or None for all cores) splits large buffers."""
+    return _run_segments(_ecb_segment, pad(data), create_subkeys(key), workers)
+
+
+def decrypt_ecb(key, data, workers=1):
+    if len(data) % BLOCK_SIZE:
+        raise ValueError("Ciphertext length must be a multiple of 8 bytes.")
+    return unpad(_run_segments(_ecb_segment, bytes(data), create_subkeys(key)[::-1], workers))
+
+
+def encrypt_cbc(key, iv, data):
+    """CBC encryption with PKCS#7 padding and an 8-byte IV."""
+    subkeys = create_subkeys(key)
+    previous = int.from_bytes(iv, 'big')
+    out = []
+    for block in to_blocks(pad(data)):
+        previous = crypt_block(block ^ previous, subkeys)
+        out.append(previous)
+    return from_blocks(out)
+
+
+def decrypt_cbc(key, iv, data):
+    if len(data) % BLOCK_SIZE:
+        raise ValueError("Ciphertext length must be a multiple of 8 bytes.")
+    subkeys = create_subkeys(key)[::-1]
+    previous = int.from_bytes(iv, 'big')
+    out = []
+    for block in to_blocks(bytes(data)):
+        out.append(crypt_block(block, subkeys) ^ previous)
+        previous = block
+    return unpad(from_blocks(out))
+
+
+def crypt_ctr(key, nonce, data, workers=1):
+    """CTR mode (encryption and decryption are the same); the 8-byte nonce is the first counter block."""
+    return _run_segments(_ctr_segment, bytes(data), create_subkeys(key), workers, int.from_bytes(nonce, 'big'))
+
+
+# Standard known-answer tests: (key, plaintext, ciphertext) as hex strings
+KNOWN_ANSWERS = [
+    ('133457799BBCDFF1', '0123456789ABCDEF', '85E813540F0AB405'),
+    ('0123456789ABCDEF', '4E6F772069732074', '3FA40E8A984D4815'),
+    ('0E329232EA6D0D73', '8787878787878787', '0000000000000000'),
+    ('0101010101010101', '8000000000000000', '95F8A5E5DD31D900'),
+    ('0101010101010101', '4000000000000000', 'DD7F121CA5015619'),
+    ('0101010101010101', '2000000000000000', '2E8653104F3834EA'),
+    ('8001010101010101', '0000000000000000', '95A8D72813DAA94D'),
+    ('4001010101010101', '0000000000000000', '0EEC1487DD8C26D5'),
+]
+
+
+def self_test():
+    """Check the block cipher against KNOWN_ANSWERS; raises RuntimeError on a mismatch."""
+    for key, plaintext, ciphertext in KNOWN_ANSWERS:
+        key, plaintext, ciphertext = int(key, 16), int(plaintext, 16), int(ciphertext, 16)
+        if encrypt_block(plaintext, key) != ciphertext:
+            raise RuntimeError(f"DES self-test failed: encrypt with key {key:016X}")
+        if decrypt_block(ciphertext, key) != plaintext:
+            raise RuntimeError(f"DES self-test failed: decrypt with key {key:016X}")
+
+
+if __name__ == '__main__':
+    self_test()
+    print(f"{len(KNOWN_ANSWERS)} known-answer vectors passed")
@@ -0,0 +1,88 @@
+"""
+Headless DES key schedule CLI.
+
+Reads keys one per line from a file or stdin (8-character strings, or 16 hex digits
+with --hex-keys) and streams the 16 round subkeys of each key. Only lab_4.des is
+imported, so no GUI toolkit is loaded.
+
+Run from the repository root:
+    python -m lab_4.stream -i keys.txt --format hex --stats > subkeys.txt
+"""
+import time
+
+_import_start = time.perf_counter()
+
+import argparse
+import os
+import string
+import sys
+
+from lab_4.des import key_schedule, key_to_int
+
+IMPORT_SECONDS = time.perf_counter() - _import_start
+BATCH_SIZE = 10000
+FORMATS = {'hex': '012x', 'bin': '048b'}
+
+
+def derive_lines(lines, hex_keys=False, output_format='hex', errors=None, start=1):
+    """Yield one output line per input key: the key followed by its 16 subkeys.
+
+    Invalid keys are skipped and reported to errors as "line N: reason", counting lines from start.
+    """
+    spec = FORMATS[output_format]
+    schedule = key_schedule.__wrapped__  # millions of distinct keys would only churn the LRU cache
+    for number, line in enumerate(lines, start=start):
+        key = line.rstrip('\r\n')
+        if not key:
+            continue
+        try:
+            if hex_keys and not (len(key) == 16 and all(char in string.hexdigits for char in key)):
+                # int(key, 16) alone would also take 0x, signs, whitespace and underscores
+                raise ValueError(f"Hex keys must be exactly 16 hex digits: {key!r}")
+            value = int(key, 16) if hex_keys else key_to_int(key)
+        except (ValueError, UnicodeEncodeError) as error:
+            if errors is not None:
+                errors.write(f"line {number}: {error}\n")
+            continue
+        yield key + ' ' + ' '.join([format(subkey, spec) for subkey in schedule(value)]) + '\n'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream DES round subkeys for keys read one per line.")
+    parser.add_argument('-i', '--input', default='-', help="key file, '-' for stdin (default)")
+    parser.add_argument('-o', '--output', default='-', help="output file, '-' for stdout (default)")
+    parser.add_argument('--format', choices=sorted(FORMATS), default='hex', help="subkey format")
+    parser.add_argument('--hex-keys', action='store_true', help="keys are 16 hex digits instead of 8 characters")
+    parser.add_argument('--stats', action='store_true', help="report import time and keys/second on stderr")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='latin-1')
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w')
+    start = time.perf_counter()
+    count = 0
+    try:
+        batch = []
+        for line in derive_lines(source, args.hex_keys, args.format, sys.stderr):
+            batch.append(line)
+            if len(batch) == BATCH_SIZE:
+                sink.writelines(batch)
+                count += len(batch)
+                batch = []
+        sink.writelines(batch)
+        count += len(batch)
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    if args.stats:
+        seconds = time.perf_counter() - start
+        print(f"import lab_4.des: {IMPORT_SECONDS * 1000:.1f} ms", file=sys.stderr)
+        print(f"{count:,} keys in {seconds:.2f}s: {count / seconds if seconds else 0:,.0f} keys/s", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from ciphers.columns import transform_column, transform_values
+from ciphers.registry import get_cipher
+
+
+def test_object_column_keeps_numbers_and_missing_values():
+    column = pd.Series(['alice', 12, None, np.nan, pd.NA, 3.5], dtype=object)
+    encrypted = transform_column(column, 'des', 'encrypt', {'key': '8bytekey'}, binary=True)
+    assert [value is None for value in encrypted] == [False, False, True, True, True, False]
+    decrypted = transform_column(encrypted, 'des', 'decrypt', {'key': '8bytekey'}, binary=True)
+    assert decrypted.tolist() == ['alice', '12', None, None, None, '3.5']
+
+
+def test_numeric_column_is_encrypted_as_text():
+    encrypted = transform_column(pd.Series([12, 345]), 'des', 'encrypt', {'key': '8bytekey'}, binary=True)
+    decrypted = transform_column(encrypted, 'des', 'decrypt', {'key': '8bytekey'}, binary=True)
+    assert decrypted.tolist() == ['12', '345']
+
+
+def test_values_match_one_call_per_value():
+    cipher = get_cipher('playfair', key='PLAYFAIREXAMPLE')
+    values = ['hide the gold', None, 'Știință', '', 'tree']
+    expected = [None if value is None else cipher.encrypt(value.encode('utf-8')).decode('utf-8') for value in values]
+    assert transform_values(cipher, values, 'encrypt') == expected
@@ -0,0 +1,101 @@
+import os
+
+import numpy as np
+import pytest
+
+from ciphers.des import MODES
+from ciphers.registry import get_cipher
+from lab_4 import bitslice, des
+
+KEY = b'8bytekey'
+IV = bytes.fromhex('0011223344556677')
+# Lengths around the block size, including empty input and one full block
+LENGTHS = [0, 1, 7, 8, 9, 63, 64, 1000]
+
+
+@pytest.mark.parametrize('key, plaintext, ciphertext', des.KNOWN_ANSWERS)
+def test_known_answers(key, plaintext, ciphertext):
+    key, plaintext, ciphertext = int(key, 16), int(plaintext, 16), int(ciphertext, 16)
+    assert des.encrypt_block(plaintext, key) == ciphertext
+    assert des.decrypt_block(ciphertext, key) == plaintext
+
+
+def test_self_test_passes():
+    des.self_test()
+
+
+@pytest.mark.parametrize('length', LENGTHS)
+def test_ecb_round_trip(length):
+    data = os.urandom(length)
+    encrypted = des.encrypt_ecb(KEY, data)
+    assert len(encrypted) == (length // 8 + 1) * 8
+    assert des.decrypt_ecb(KEY, encrypted) == data
+
+
+@pytest.mark.parametrize('length', LENGTHS)
+def test_cbc_round_trip(length):
+    data = os.urandom(length)
+    encrypted = des.encrypt_cbc(KEY, IV, data)
+    assert des.decrypt_cbc(KEY, IV, encrypted) == data
+
+
+@pytest.mark.parametrize('length', LENGTHS)
+def test_ctr_round_trip(length):
+    data = os.urandom(length)
+    encrypted = des.crypt_ctr(KEY, IV, data)
+    assert len(encrypted) == length
+    assert des.crypt_ctr(KEY, IV, encrypted) == data
+
+
+def test_cbc_matches_block_function():
+    data = bytes(range(16))
+    first = des.encrypt_block(int.from_bytes(data[:8], 'big') ^ int.from_bytes(IV, 'big'), KEY)
+    second = des.encrypt_block(int.from_bytes(data[8:], 'big') ^ first, KEY)
+    assert des.encrypt_cbc(KEY, IV, data)[:16] == des.from_blocks([first, second])
+
+
+@pytest.mark.parametrize('mode, iv', [(mode, None) for mode in MODES] + [('cbc', IV.hex()), ('ctr', IV.hex())])
+def test_cipher_streams_round_trip(mode, iv):
+    cipher = get_cipher('des', key=KEY, mode=mode, iv=iv)
+    data = os.urandom(1000)
+    chunks = [data[start:start + 37] for start in range(0, len(data), 37)]
+    encrypted = b''.join(cipher.encrypt_stream(chunks))
+    assert b''.join(cipher.decrypt_stream([encrypted])) == data
+    assert b''.join(cipher.decrypt_stream([encrypted[:5], encrypted[5:]])) == data
+
+
+def test_streams_match_whole_buffer_functions():
+    data = os.urandom(1000)
+    ecb = get_cipher('des', key=KEY, mode='ecb')
+    cbc = get_cipher('des', key=KEY, mode='cbc', iv=IV.hex())
+    ctr = get_cipher('des', key=KEY, mode='ctr', iv=IV.hex())
+    chunks = [data[:100], data[100:]]
+    assert b''.join(ecb.encrypt_stream(chunks)) == des.encrypt_ecb(KEY, data)
+    assert b''.join(cbc.encrypt_stream(chunks)) == des.encrypt_cbc(KEY, IV, data)
+    assert b''.join(ctr.encrypt_stream(chunks)) == des.crypt_ctr(KEY, IV, data)
+
+
+def test_random_iv_differs_per_stream():
+    cipher = get_cipher('des', key=KEY, mode='ctr')
+    assert b''.join(cipher.encrypt_stream([b'attack at dawn'])) != b''.join(cipher.encrypt_stream([b'attack at dawn']))
+
+
+@pytest.mark.parametrize('workers', [2, 3])
+def test_parallel_matches_serial(monkeypatch, workers):
+    data = os.urandom(8 * 100 + 5)
+    serial_ecb = des.encrypt_ecb(KEY, data)
+    serial_ctr = des.crypt_ctr(KEY, IV, data)
+    # Lower the threshold so a small buffer is really split across processes
+    monkeypatch.setattr(des, 'PARALLEL_THRESHOLD', 8)
+    assert des.encrypt_ecb(KEY, data, workers) == serial_ecb
+    assert des.decrypt_ecb(KEY, serial_ecb, workers) == data
+    assert des.crypt_ctr(KEY, IV, data, workers) == serial_ctr
+
+
+def test_bitslice_matches_reference():
+    rng = np.random.default_rng(0)
+    keys = rng.integers(0, np.iinfo(np.uint64).max, size=70, dtype=np.uint64)
+    keys = np.concatenate([keys, np.array([int(key, 16) for key, _, _ in des.KNOWN_ANSWERS], dtype=np.uint64)])
+    block = 0x0123456789ABCDEF
+    expected = [des.encrypt_block(block, int(key)) for key in keys]
+    assert [int(value) for value in bitslice.encrypt_many(keys, block)] == expected
@@ -0,0 +1,46 @@
+import pytest
+
+from lab_2.decoder import IncrementalDecoder
+from lab_2.edits import EditLog
+
+TEXT = "Hello, World! " * 100
+
+
+def make_log(**options):
+    log = EditLog(IncrementalDecoder(TEXT), **options)
+    for letter in 'HELOWRD':
+        log.record(dict(log.substitutions, **{letter: letter.lower() if letter != 'O' else 'Q'}))
+        log.text
+    return log
+
+
+def test_cache_is_bounded_by_characters():
+    log = make_log(cache_chars=3 * len(TEXT))
+    assert len(log._texts) == 3
+    assert log._cached_chars == sum(len(text) for text in log._texts.values())
+    for position in range(len(log.edits), -1, -1):
+        log.goto(position)
+        assert log.text == IncrementalDecoder(TEXT, log.substitutions).text
+        assert log._cached_chars <= 3 * len(TEXT)
+
+
+def test_current_checkpoint_is_cached_even_when_over_the_limit():
+    log = make_log(cache_chars=1)
+    assert list(log._texts) == [log.position]
+
+
+def test_round_trip_through_export():
+    log = make_log()
+    log.goto(3)
+    loaded = EditLog.load(log.export(), IncrementalDecoder(TEXT))
+    assert (loaded.position, loaded.substitutions, loaded.text) == (3, log.substitutions, log.text)
+
+
+@pytest.mark.parametrize('edit', ['{"H": "xyz", "e": ""}', '{"H": ""}', '{"HE": "x"}', '{"H": 1}'])
+def test_load_rejects_edits_that_are_not_single_letters(edit):
+    log = make_log()
+    stream = log.export().splitlines()[0] + '\n' + edit + '\n'
+    decoder = IncrementalDecoder(TEXT)
+    with pytest.raises(ValueError):
+        EditLog.load(stream, decoder)
+    assert decoder.substitutions == {}
@@ -0,0 +1,11 @@
+from benchmarks import instrument
+from lab_4 import des
+
+
+def test_wrapped_cache_stays_bypassable():
+    uncached = des.key_schedule.__wrapped__
+    with instrument.enabled():
+        assert des.key_schedule.__wrapped__ is uncached
+        des.key_schedule.cache_clear()
+        assert des.key_schedule(0x0123456789ABCDEF) == uncached(0x0123456789ABCDEF)
+    assert des.key_schedule.__wrapped__ is uncached
@@ -0,0 +1,137 @@
+"""
+Output checks of the optimized hot paths against the implementations they replaced, and
+of streamed results against whole-input results. benchmarks/suite.py only measures speed.
+"""
+import random
+from collections import Counter
+
+import pytest
+
+from benchmarks.corpus import make_corpus
+from benchmarks.suite import substitution_key
+from ciphers.registry import get_cipher
+from ciphers.service import key_schedule_stream
+from lab_1.benchmark import legacy_encrypt_default, legacy_encrypt_with_key
+from lab_1.main import encrypt_default, get_engine
+from lab_2.analysis import analyze
+from lab_2.decoder import IncrementalDecoder
+from lab_3.benchmark import legacy_encrypt_message, legacy_encrypt_pair
+from lab_3.main import create_cipher_matrix, encrypt_message, encrypt_pair, locate
+from lab_4.stream import derive_lines
+
+TEXT = make_corpus(5000)
+MIXED = "Hello, World! Ça va? Straße -- the quick brown fox, 42 times.\n" * 20
+
+
+def legacy_decode(ciphertext, substitution_dict):
+    """lab_2's original decode."""
+    decoded_text = ""
+    for char in ciphertext:
+        if char.upper() in substitution_dict:
+            decoded_char = substitution_dict[char.upper()]
+            decoded_text += decoded_char.lower() if char.islower() else decoded_char.upper()
+        else:
+            decoded_text += char
+    return decoded_text
+
+
+def legacy_frequency_analysis(text):
+    """lab_2's original frequency_analysis."""
+    text = text.upper()
+    counter = Counter(char for char in text if char.isalpha())
+    total = sum(counter.values())
+    return {char: (count / total) * 100 for char, count in counter.items()}
+
+
+def chunked(data, size):
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('shift', [0, 3, 25])
+def test_caesar_matches_legacy(shift):
+    assert encrypt_default(TEXT, shift) == legacy_encrypt_default(TEXT, shift)
+    assert get_engine('CRYPTOGRAPHY', shift).encrypt(TEXT) == legacy_encrypt_with_key(TEXT, 'CRYPTOGRAPHY', shift)
+
+
+def test_caesar_bytes_and_memoryview_match_str():
+    engine = get_engine('CRYPTOGRAPHY', 3)
+    expected = engine.encrypt(TEXT).encode('ascii')
+    data = TEXT.encode('ascii')
+    assert engine.encrypt(data) == expected
+    assert bytes(engine.encrypt(memoryview(data))) == expected
+
+
+def test_playfair_matches_legacy():
+    key = 'PLAYFAIREXAMPLE'
+    text = TEXT.replace('j', '').replace('J', '')
+    assert encrypt_message(text, key) == legacy_encrypt_message(text, key)
+    matrix = create_cipher_matrix(key)
+    positions = locate(matrix)
+    letters = 'ABCDEFGHIKLMNOPQRSTUVWXYZ'
+    pairs = [first + second for first in letters for second in letters if first != second]
+    assert [encrypt_pair(pair, matrix, positions) for pair in pairs] == [legacy_encrypt_pair(pair, matrix)
+                                                                         for pair in pairs]
+
+
+@pytest.mark.parametrize('text', [TEXT, MIXED])
+def test_decoder_matches_legacy(text):
+    substitutions = substitution_key()
+    assert IncrementalDecoder(text, substitutions).text == legacy_decode(text, substitutions)
+
+
+def test_decoder_updates_match_fresh_decode():
+    substitutions = substitution_key()
+    decoder = IncrementalDecoder(MIXED)
+    rng = random.Random(0)
+    for _ in range(20):
+        letters = rng.sample(sorted(substitutions), rng.randint(0, 26))
+        mapping = {letter: substitutions[letter] for letter in letters}
+        decoder.update(mapping)
+        assert decoder.text == legacy_decode(MIXED, mapping)
+
+
+@pytest.mark.parametrize('text', [TEXT, MIXED, 'a', ''])
+def test_analyze_matches_legacy(text):
+    result = analyze(text)
+    if not any(char.isalpha() for char in text):
+        assert result['unigrams'] == {}
+        return
+    assert result['unigrams'] == pytest.approx(legacy_frequency_analysis(text))
+    upper = text.upper()
+    for order in (2, 3):
+        grams = Counter(''.join(gram) for gram in zip(*(upper[i:] for i in range(order)))
+                        if all(char.isalpha() for char in gram))
+        rows = result['bigrams' if order == 2 else 'trigrams']
+        assert all(grams[gram] == count for gram, count, _ in rows)
+        assert [count for _, count, _ in rows] == sorted(grams.values(), reverse=True)[:len(rows)]
+
+
+STREAM_CIPHERS = [
+    ('caesar', {'shift': 3}),
+    ('keyword-caesar', {'shift': 3, 'keyword': 'CRYPTOGRAPHY'}),
+    ('playfair', {'key': 'PLAYFAIREXAMPLE'}),
+    ('substitution', {'key': 'QWERTYUIOPASDFGHJKLZXCVBNM'}),
+    ('vigenere', {'key': 'LEMON'}),
+    ('des', {'key': '8bytekey', 'mode': 'ecb'}),
+    ('des', {'key': '8bytekey', 'mode': 'cbc', 'iv': '0011223344556677'}),
+    ('des', {'key': '8bytekey', 'mode': 'ctr', 'iv': '0011223344556677'}),
+]
+
+
+@pytest.mark.parametrize('name, params', STREAM_CIPHERS)
+@pytest.mark.parametrize('size', [1, 7, 1000])
+def test_stream_matches_whole_input(name, params, size):
+    cipher = get_cipher(name, **params)
+    data = MIXED.encode('utf-8')
+    encrypted = cipher.encrypt(data)
+    assert b''.join(cipher.encrypt_stream(chunked(data, size))) == encrypted
+    assert b''.join(cipher.decrypt_stream(chunked(encrypted, size))) == cipher.decrypt(encrypted)
+
+
+@pytest.mark.parametrize('size', [1, 10, 1000])
+def test_key_schedule_stream_matches_whole_input(size):
+    keys = ''.join(TEXT[start:start + 8] + '\n' for start in range(0, 800, 8)) + 'short\nlastkey!'
+    expected = ''.join(derive_lines(keys.splitlines()))
+    streamed = b''.join(key_schedule_stream(chunked(keys.encode('latin-1'), size))).decode('latin-1')
+    assert [line for line in streamed.splitlines() if not line.startswith('line ')] == expected.splitlines()
+    assert 'line 101: ' in streamed